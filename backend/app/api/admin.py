@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session, selectinload
 
 from app.api.books import delete_book
 from app.middleware.admin_check import require_admin_mode
-from app.models.database import Book, get_db
+from app.models.database import Book, Chapter, get_db
 from app.schemas.schemas import (
     AdminDeleteFailure,
     AdminDeleteRequest,
@@ -20,6 +20,7 @@ from app.schemas.schemas import (
     BackupResponse,
     BookResponse,
 )
+from app.services.chapter_store import chapter_store
 
 logger = logging.getLogger(__name__)
 router = APIRouter(
@@ -62,8 +63,16 @@ def _load_book_with_relations(book_id: str, db: Session) -> Optional[Book]:
     )
 
 
-def _serialize_book_bundle(book: Book) -> dict:
-    """将书籍、章节、词汇序列化为JSON友好格式"""
+def _chapter_backup_html(db: Session, chapter: Chapter) -> str:
+    """读取章节正文用于备份；正文在章节存储中却读不到时抛出异常，避免备份不完整后删除唯一副本"""
+    html = chapter_store.chapter_html(db, chapter)
+    if not html and chapter.content_hash:
+        raise ValueError(f"第 {chapter.chapter_number} 章正文缺失（{chapter.content_hash}）")
+    return html
+
+
+def _serialize_book_bundle(book: Book, db: Session) -> dict:
+    """将书籍、章节、词汇序列化为JSON友好格式（章节正文从章节存储读取）"""
     return {
         "book": {
             "id": book.id,
@@ -85,7 +94,7 @@ def _serialize_book_bundle(book: Book) -> dict:
                 "book_id": chapter.book_id,
                 "chapter_number": chapter.chapter_number,
                 "title": chapter.title,
-                "content": chapter.content,
+                "content": _chapter_backup_html(db, chapter),
                 "word_count": chapter.word_count,
             }
             for chapter in sorted(book.chapters, key=lambda c: c.chapter_number)
@@ -116,7 +125,7 @@ def _backup_single_book(book_id: str, db: Session) -> Tuple[Optional[BackupItem]
         safe_id = _sanitize_book_id(book_id)
         file_name = f"book_{safe_id}_{timestamp}.json"
         absolute_path = os.path.join(_BACKUP_DIR, file_name)
-        payload = _serialize_book_bundle(book)
+        payload = _serialize_book_bundle(book, db)
         with open(absolute_path, "w", encoding="utf-8") as fp:
             json.dump(payload, fp, ensure_ascii=False, indent=2)
 
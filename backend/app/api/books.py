@@ -1,22 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, BackgroundTasks
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, BackgroundTasks
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+import base64
+import gzip
+import json
 import os
-import tempfile
-import shutil
 import logging
 
+from app.config import import_job_config
+from app.middleware.compression import parse_accept_encoding
 from app.models.database import get_db, Book, Chapter, BookVocabulary
 from app.schemas.schemas import (
     BookResponse,
     BookDetailResponse,
     ChapterResponse,
+    ChapterSummary,
     VocabularyResponse,
     BookDuplicateCheck,
     BookDuplicateResponse,
     BookDuplicateInfo,
+    SearchResponse,
+    ImportJobResponse,
 )
+from app.services import search_index
+from app.services.chapter_store import chapter_store, iter_decompressed
+from app.services.db_executor import run_blocking
+from app.services.import_jobs import import_jobs
+from app.services.upload_receiver import UploadRejected, receive_epub
+from app.services.read_strategy import read_latency_stats, read_with_strategy
+from app.services.response_cache import book_key, response_cache
 from app.utils.oss_helper import oss_helper
 from app.utils.supabase_client import supabase_client
 
@@ -31,11 +47,69 @@ LEVEL_OPTIONS = [
 ]
 
 
+# 书籍列表可投影的字段与分页上限
+BOOK_FIELDS = list(BookResponse.model_fields)
+MAX_PAGE_SIZE = 200
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """解析 fields= 参数，返回需要的字段列表（None表示全部字段）"""
+    if not fields:
+        return None
+    requested = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in BOOK_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"未知字段: {', '.join(unknown)}")
+    return requested or None
+
+
+def _field_value(item: Any, name: str) -> Any:
+    """兼容Supabase返回的dict与SQLite返回的ORM对象/行"""
+    return item.get(name) if isinstance(item, dict) else getattr(item, name)
+
+
+def _encode_cursor(created_at: Any, book_id: str) -> str:
+    """分页游标：最后一条记录的 (created_at, id)，base64编码"""
+    value = created_at.isoformat() if isinstance(created_at, datetime) else str(created_at)
+    raw = json.dumps([value, book_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, book_id = json.loads(raw)
+        return str(created_at), str(book_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+
+def _parse_cursor_time(value: str) -> datetime:
+    """游标时间转换为SQLite中存储的UTC naive时间"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 def _normalize_text(value: Optional[str]) -> str:
     """统一处理字符串比较：去除首尾空格并转为小写"""
     return (value or "").strip().lower()
 
 
+def _query_chapter_summaries(db: Session, book_id: str) -> List[ChapterSummary]:
+    """从SQLite查询章节目录（只读取目录所需的列，不加载正文HTML）"""
+    rows = db.query(
+        Chapter.id, Chapter.chapter_number, Chapter.title, Chapter.word_count
+    ).filter(
+        Chapter.book_id == book_id
+    ).order_by(Chapter.chapter_number).all()
+    return [ChapterSummary.model_validate(row) for row in rows]
+
+
 def _build_duplicate_info(book_source) -> BookDuplicateInfo:
     """将Supabase或SQLite返回的书籍对象转换为响应结构"""
     if isinstance(book_source, Book):
@@ -55,120 +129,274 @@ def _build_duplicate_info(book_source) -> BookDuplicateInfo:
 
 @router.get("", response_model=List[BookResponse])
 async def get_books(
+    response: Response,
     level: Optional[str] = Query(None, description="按难度等级筛选"),
     search: Optional[str] = Query(None, description="搜索书名"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="每页数量，不传则返回全部"),
+    cursor: Optional[str] = Query(None, description="下一页游标（上一页响应头 X-Next-Cursor）"),
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如 id,title,cover"),
+    include_total: bool = Query(False, description="在响应头 X-Total-Count 中返回总数"),
     db: Session = Depends(get_db)
 ):
-    """获取书籍列表（优先使用Supabase，备选SQLite）"""
-    # 优先使用Supabase
-    if supabase_client.enabled:
-        try:
-            books_data = supabase_client.list_books(level=level, search=search)
-            logger.info(f"✅ 从Supabase获取书籍列表: {len(books_data)} 本")
-            return books_data
-        except Exception as e:
-            logger.error(f"⚠️ Supabase查询失败，回退到SQLite: {e}")
+    """获取书籍列表（数据源顺序由 BOOKS_READ_STRATEGY 决定）
 
-    # 回退到SQLite
-    query = db.query(Book)
+    按 created_at,id 倒序排列；传入limit时分页，还有下一页则通过响应头 X-Next-Cursor 返回游标
+    """
+    projection = _parse_fields(fields)
+    # 投影时仍需读取分页键
+    columns = list(dict.fromkeys(projection + ["created_at", "id"])) if projection else None
+    after = _decode_cursor(cursor) if cursor else None
+    fetch_limit = limit + 1 if limit else None  # 多取一条判断是否还有下一页
+
+    def from_supabase():
+        books_data = supabase_client.list_books(
+            level=level,
+            search=search,
+            columns=",".join(columns) if columns else "*",
+            limit=fetch_limit,
+            after=after,
+        )
+        total = supabase_client.count_books(level=level, search=search) if include_total else None
+        logger.info(f"✅ 从Supabase获取书籍列表: {len(books_data)} 本")
+        return books_data, total
+
+    def from_sqlite(db: Session):
+        query = db.query(*[getattr(Book, c) for c in columns]) if columns else db.query(Book)
+        total = None
+
+        if level:
+            query = query.filter(Book.level == level)
+        if search:
+            query = query.filter(Book.title.ilike(f"%{search}%"))
+        if include_total:
+            total = query.count()
+        if after:
+            created_at = _parse_cursor_time(after[0])
+            query = query.filter(or_(
+                Book.created_at < created_at,
+                and_(Book.created_at == created_at, Book.id < after[1]),
+            ))
+
+        query = query.order_by(Book.created_at.desc(), Book.id.desc())
+        if fetch_limit:
+            query = query.limit(fetch_limit)
+        books_data = query.all()
+        logger.info(f"从SQLite获取书籍列表: {len(books_data)} 本")
+        return books_data, total
+
+    books_data, total = await read_with_strategy(from_supabase, from_sqlite, db, is_usable=lambda r: bool(r[0]))
+
+    headers = {}
+    if limit and len(books_data) > limit:
+        books_data = books_data[:limit]
+        last = books_data[-1]
+        headers["X-Next-Cursor"] = _encode_cursor(_field_value(last, "created_at"), _field_value(last, "id"))
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+
+    if projection:
+        items = [{name: _field_value(item, name) for name in projection} for item in books_data]
+        return JSONResponse(jsonable_encoder(items), headers=headers)
+
+    response.headers.update(headers)
+    return books_data
+
+
+@router.get("/stats/read-latency")
+async def get_read_latency():
+    """各数据源（Supabase / SQLite）的读取延迟直方图，用于选择 BOOKS_READ_STRATEGY"""
+    return read_latency_stats()
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search_books(
+    q: str = Query(..., min_length=1, max_length=200, description="检索词，每个词按前缀匹配"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    chapters: bool = Query(True, description="是否同时检索章节正文"),
+):
+    """全文检索书名、作者、系列与章节正文（FTS5，bm25排序，返回高亮片段）"""
+    results = await run_blocking(search_index.search, q, limit, limit if chapters else 0)
+    return SearchResponse(query=q, **results)
 
-    if level:
-        query = query.filter(Book.level == level)
-    if search:
-        query = query.filter(Book.title.ilike(f"%{search}%"))
 
-    books = query.order_by(Book.created_at.desc()).all()
-    logger.info(f"从SQLite获取书籍列表: {len(books)} 本")
-    return books
+@router.get("/{book_id}", response_model=BookDetailResponse)
+async def get_book(book_id: str, request: Request, db: Session = Depends(get_db)):
+    """获取书籍详情（经响应缓存，支持ETag）"""
+    key = book_key(book_id, "detail")
+    entry = await run_blocking(response_cache.get, key)
+    if entry is None:
+        entry = response_cache.put(key, BookDetailResponse.model_validate(await _load_book(book_id, db)))
+    return response_cache.respond(request, entry)
+
+
+async def _load_book(book_id: str, db: Session):
+    """读取书籍详情（数据源顺序由 BOOKS_READ_STRATEGY 决定）"""
+    def from_supabase():
+        book_data = supabase_client.get_book(book_id)
+        if book_data:
+            logger.info(f"✅ 从Supabase获取书籍详情: {book_data.get('title')}")
+        return book_data
+
+    def from_sqlite(db: Session):
+        book = db.query(Book).filter(Book.id == book_id).first()
+        if not book:
+            raise HTTPException(status_code=404, detail="Book not found")
+        logger.info(f"从SQLite获取书籍详情: {book.title}")
+        return BookDetailResponse(
+            **BookResponse.model_validate(book).model_dump(),
+            chapters=_query_chapter_summaries(db, book_id),
+        )
 
+    return await read_with_strategy(from_supabase, from_sqlite, db)
 
-@router.get("/{book_id}", response_model=BookDetailResponse)
-async def get_book(book_id: str, db: Session = Depends(get_db)):
-    """获取书籍详情（优先使用Supabase，备选SQLite）"""
-    # 优先使用Supabase
-    if supabase_client.enabled:
-        try:
-            book_data = supabase_client.get_book(book_id)
-            if book_data:
-                logger.info(f"✅ 从Supabase获取书籍详情: {book_data.get('title')}")
-                return book_data
-        except Exception as e:
-            logger.error(f"⚠️ Supabase查询失败，回退到SQLite: {e}")
 
-    # 回退到SQLite
-    book = db.query(Book).filter(Book.id == book_id).first()
-    if not book:
-        raise HTTPException(status_code=404, detail="Book not found")
-    logger.info(f"从SQLite获取书籍详情: {book.title}")
-    return book
+@router.get("/{book_id}/chapters", response_model=List[ChapterSummary])
+async def get_book_chapters(book_id: str, request: Request, db: Session = Depends(get_db)):
+    """获取书籍章节目录（不含正文，正文通过 /chapters/{n} 获取；经响应缓存）"""
+    key = book_key(book_id, "chapters")
+    entry = await run_blocking(response_cache.get, key)
+    if entry is None:
+        chapters = [ChapterSummary.model_validate(item) for item in await _load_chapter_summaries(book_id, db)]
+        # 空列表可能是书籍不存在或查询失败，不缓存
+        entry = response_cache.put(key, chapters, cacheable=bool(chapters))
+    return response_cache.respond(request, entry)
 
 
-@router.get("/{book_id}/chapters", response_model=List[ChapterResponse])
-async def get_book_chapters(book_id: str, db: Session = Depends(get_db)):
-    """获取书籍章节列表（优先使用Supabase，备选SQLite）"""
-    # 优先使用Supabase
-    if supabase_client.enabled:
-        try:
-            chapters_data = supabase_client.get_chapters(book_id)
-            logger.info(f"✅ 从Supabase获取章节列表: {len(chapters_data)} 章")
-            return chapters_data
-        except Exception as e:
-            logger.error(f"⚠️ Supabase查询失败，回退到SQLite: {e}")
+async def _load_chapter_summaries(book_id: str, db: Session):
+    """读取章节目录（数据源顺序由 BOOKS_READ_STRATEGY 决定）"""
+    def from_supabase():
+        chapters_data = supabase_client.get_chapters(book_id)
+        logger.info(f"✅ 从Supabase获取章节列表: {len(chapters_data)} 章")
+        return chapters_data
 
-    # 回退到SQLite
-    chapters = db.query(Chapter).filter(
-        Chapter.book_id == book_id
-    ).order_by(Chapter.chapter_number).all()
-    logger.info(f"从SQLite获取章节列表: {len(chapters)} 章")
-    return chapters
+    def from_sqlite(db: Session):
+        chapters = _query_chapter_summaries(db, book_id)
+        logger.info(f"从SQLite获取章节列表: {len(chapters)} 章")
+        return chapters
+
+    return await read_with_strategy(from_supabase, from_sqlite, db)
 
 
 @router.get("/{book_id}/chapters/{chapter_number}", response_model=ChapterResponse)
-async def get_chapter(book_id: str, chapter_number: int, db: Session = Depends(get_db)):
-    """获取指定章节内容（优先使用Supabase，备选SQLite）"""
-    # 优先使用Supabase
-    if supabase_client.enabled:
-        try:
-            chapter_data = supabase_client.get_chapter(book_id, chapter_number)
-            if chapter_data:
-                logger.info(f"✅ 从Supabase获取章节: {chapter_data.get('title', f'Chapter {chapter_number}')}")
-                return chapter_data
-        except Exception as e:
-            logger.error(f"⚠️ Supabase查询失败，回退到SQLite: {e}")
+async def get_chapter(book_id: str, chapter_number: int, request: Request, db: Session = Depends(get_db)):
+    """获取指定章节内容（章节导入后不再变化，经响应缓存）"""
+    key = book_key(book_id, "chapter", chapter_number)
+    entry = await run_blocking(response_cache.get, key)
+    if entry is None:
+        entry = response_cache.put(key, ChapterResponse.model_validate(await _load_chapter(book_id, chapter_number, db)))
+    return response_cache.respond(request, entry)
+
+
+async def _load_chapter(book_id: str, chapter_number: int, db: Session):
+    """读取指定章节（数据源顺序由 BOOKS_READ_STRATEGY 决定）"""
+    def from_supabase():
+        chapter_data = supabase_client.get_chapter(book_id, chapter_number)
+        if chapter_data:
+            logger.info(f"✅ 从Supabase获取章节: {chapter_data.get('title', f'Chapter {chapter_number}')}")
+        return chapter_data
+
+    def from_sqlite(db: Session):
+        chapter = db.query(Chapter).filter(
+            Chapter.book_id == book_id,
+            Chapter.chapter_number == chapter_number
+        ).first()
+        if not chapter:
+            raise HTTPException(status_code=404, detail="Chapter not found")
+        logger.info(f"从SQLite获取章节: {chapter.title}")
+        return ChapterResponse(
+            id=chapter.id,
+            chapter_number=chapter.chapter_number,
+            title=chapter.title,
+            content=chapter_store.chapter_html(db, chapter),
+            word_count=chapter.word_count or 0,
+        )
+
+    return await read_with_strategy(from_supabase, from_sqlite, db)
 
-    # 回退到SQLite
-    chapter = db.query(Chapter).filter(
+
+@router.get("/{book_id}/chapters/{chapter_number}/content", response_class=HTMLResponse)
+async def get_chapter_content(book_id: str, chapter_number: int, request: Request, db: Session = Depends(get_db)):
+    """获取章节正文HTML
+
+    正文在章节存储中时从SQLite blob流式读取：客户端支持gzip则原样返回压缩数据，否则边读边解压；
+    旧数据依次使用 content_gzip / content 列；本地没有该章节时按读取策略获取
+    """
+    headers = {"Cache-Control": f"public, max-age={response_cache.max_age}"}
+    accepts_gzip = parse_accept_encoding(request.headers.get("accept-encoding", "")).get("gzip", 0) > 0
+    row, blob = await run_blocking(_query_chapter_content, db, book_id, chapter_number)
+
+    if blob is not None:
+        rowid, compressed_size = blob
+        if accepts_gzip:
+            return StreamingResponse(
+                chapter_store.iter_gzip(rowid),
+                media_type="text/html; charset=utf-8",
+                headers={**headers, "Content-Encoding": "gzip", "Vary": "Accept-Encoding",
+                         "Content-Length": str(compressed_size)},
+            )
+        return StreamingResponse(
+            iter_decompressed(chapter_store.iter_gzip(rowid)),
+            media_type="text/html; charset=utf-8",
+            headers=headers,
+        )
+
+    if row is not None and row.content_gzip:
+        if accepts_gzip:
+            return Response(
+                content=row.content_gzip,
+                media_type="text/html; charset=utf-8",
+                headers={**headers, "Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            )
+        return HTMLResponse(gzip.decompress(row.content_gzip).decode("utf-8"), headers=headers)
+
+    if row is not None:
+        return HTMLResponse(row.content or "", headers=headers)
+
+    chapter = await _load_chapter(book_id, chapter_number, db)
+    return HTMLResponse(_field_value(chapter, "content") or "", headers=headers)
+
+
+def _query_chapter_content(db: Session, book_id: str, chapter_number: int):
+    """只读取章节正文相关的列；正文在章节存储中时同时返回其 (rowid, 压缩字节数)"""
+    row = db.query(Chapter.content, Chapter.content_gzip, Chapter.content_hash).filter(
         Chapter.book_id == book_id,
         Chapter.chapter_number == chapter_number
     ).first()
-    if not chapter:
-        raise HTTPException(status_code=404, detail="Chapter not found")
-    logger.info(f"从SQLite获取章节: {chapter.title}")
-    return chapter
+    blob = chapter_store.locate(db, row.content_hash) if row is not None and row.content_hash else None
+    return row, blob
 
 
 @router.get("/{book_id}/vocabulary", response_model=List[VocabularyResponse])
 async def get_book_vocabulary(
     book_id: str,
+    request: Request,
     limit: int = Query(50, description="返回词汇数量限制"),
     db: Session = Depends(get_db)
 ):
-    """获取书籍高频词汇（优先使用Supabase，备选SQLite）"""
-    # 优先使用Supabase
-    if supabase_client.enabled:
-        try:
-            vocab_data = supabase_client.get_book_vocabulary(book_id, limit=limit)
-            logger.info(f"✅ 从Supabase获取词汇: {len(vocab_data)} 个")
-            return vocab_data
-        except Exception as e:
-            logger.error(f"⚠️ Supabase查询失败，回退到SQLite: {e}")
+    """获取书籍高频词汇（经响应缓存）"""
+    key = book_key(book_id, "vocabulary", limit)
+    entry = await run_blocking(response_cache.get, key)
+    if entry is None:
+        vocabulary = [VocabularyResponse.model_validate(item) for item in await _load_vocabulary(book_id, limit, db)]
+        entry = response_cache.put(key, vocabulary, cacheable=bool(vocabulary))
+    return response_cache.respond(request, entry)
+
+
+async def _load_vocabulary(book_id: str, limit: int, db: Session):
+    """读取书籍高频词汇（数据源顺序由 BOOKS_READ_STRATEGY 决定）"""
+    def from_supabase():
+        vocab_data = supabase_client.get_book_vocabulary(book_id, limit=limit)
+        logger.info(f"✅ 从Supabase获取词汇: {len(vocab_data)} 个")
+        return vocab_data
 
-    # 回退到SQLite
-    vocabulary = db.query(BookVocabulary).filter(
-        BookVocabulary.book_id == book_id
-    ).order_by(BookVocabulary.frequency.desc()).limit(limit).all()
-    logger.info(f"从SQLite获取词汇: {len(vocabulary)} 个")
-    return vocabulary
+    def from_sqlite(db: Session):
+        vocabulary = db.query(BookVocabulary).filter(
+            BookVocabulary.book_id == book_id
+        ).order_by(BookVocabulary.frequency.desc()).limit(limit).all()
+        logger.info(f"从SQLite获取词汇: {len(vocabulary)} 个")
+        return vocabulary
+
+    return await read_with_strategy(from_supabase, from_sqlite, db)
 
 
 @router.get("/levels/options")
@@ -185,6 +413,11 @@ async def check_duplicate_book(payload: BookDuplicateCheck, db: Session = Depend
     - 优先访问 Supabase，失败时自动回退 SQLite
     - 命中则返回最早创建的书籍信息（id/title/author/cover）
     """
+    return await run_blocking(_check_duplicate, payload, db)
+
+
+def _check_duplicate(payload: BookDuplicateCheck, db: Session) -> BookDuplicateResponse:
+    """重复检测的阻塞部分（Supabase与SQLite查询），在数据库线程池中执行"""
     normalized_title = _normalize_text(payload.title)
     if not normalized_title:
         raise HTTPException(status_code=400, detail="标题不能为空")
@@ -229,113 +462,126 @@ async def check_duplicate_book(payload: BookDuplicateCheck, db: Session = Depend
     return BookDuplicateResponse(exists=False, book=None)
 
 
-@router.post("/upload")
-async def upload_book(
-    file: UploadFile = File(..., description="EPUB文件"),
-    level: str = Form(None, description="难度等级（可选，保留以兼容）"),
-    lexile: str = Form(None, description="蓝思值（如：530L、BR200L）"),
-    series: str = Form(None, description="系列名（如：Magic Tree House）"),
-    category: str = Form(None, description="分类（fiction或non-fiction）"),
-    db: Session = Depends(get_db)
-):
+# 上传接口自行流式解析请求体，表单结构通过 openapi_extra 写入文档
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary", "description": "EPUB文件"},
+                        "level": {"type": "string", "description": "难度等级（可选，保留以兼容）"},
+                        "lexile": {"type": "string", "description": "蓝思值（如：530L、BR200L）"},
+                        "series": {"type": "string", "description": "系列名（如：Magic Tree House）"},
+                        "category": {"type": "string", "enum": ["fiction", "non-fiction"], "description": "分类"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+@router.post("/upload", status_code=202, response_model=ImportJobResponse, openapi_extra=UPLOAD_REQUEST_BODY)
+async def upload_book(request: Request, response: Response):
     """
     上传EPUB书籍（自动同步到Supabase和SQLite）
 
-    - **file**: EPUB格式的电子书文件
+    文件边接收边写入磁盘后立即返回导入任务（202），解析与写库在后台执行，
+    通过 GET /imports/{job_id} 查询进度，完成后 book 字段为书籍摘要。
+    同一文件正在导入时返回该任务（200），已导入且书籍仍存在时返回409。
+
+    - **file**: EPUB格式的电子书文件（超过 IMPORT_MAX_UPLOAD_MB 返回413，非ZIP内容返回415）
     - **lexile**: 蓝思值（推荐填写）
     - **series**: 系列名（可选）
     - **category**: 分类 - fiction或non-fiction（可选）
     - **level**: 难度等级（可选，保留以兼容旧版本）
     """
-    # 验证文件类型
-    if not file.filename.lower().endswith('.epub'):
-        raise HTTPException(status_code=400, detail="只支持EPUB格式的文件")
+    try:
+        upload = await receive_epub(request, import_jobs.jobs_dir, import_job_config.max_upload_bytes)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    # 验证难度等级（如果提供）
-    if level and level not in LEVEL_OPTIONS:
-        raise HTTPException(status_code=400, detail=f"无效的难度等级，可选值：{', '.join(LEVEL_OPTIONS)}")
+    try:
+        level = upload.fields.get("level") or None
+        lexile = upload.fields.get("lexile") or None
+        series = upload.fields.get("series") or None
+        category = upload.fields.get("category") or None
+
+        # 验证难度等级（如果提供）
+        if level and level not in LEVEL_OPTIONS:
+            raise HTTPException(status_code=400, detail=f"无效的难度等级，可选值：{', '.join(LEVEL_OPTIONS)}")
+
+        # 验证分类（如果提供）
+        if category and category not in ['fiction', 'non-fiction']:
+            raise HTTPException(status_code=400, detail="分类必须是 'fiction' 或 'non-fiction'")
+
+        # 相同文件（SHA-256）正在导入或已导入
+        duplicate = await run_blocking(import_jobs.find_duplicate, upload.sha256)
+        if duplicate:
+            upload.discard()
+            if duplicate["status"] == "completed":
+                title = (duplicate["book"] or {}).get("title", duplicate["filename"])
+                raise HTTPException(status_code=409, detail=f"该文件已导入：《{title}》")
+            logger.info(f"📥 相同文件正在导入，返回已有任务: {duplicate['id']}")
+            response.status_code = 200
+            return duplicate
+
+        options = {
+            "level": level or "未分级",  # 提供默认值
+            "lexile": lexile,
+            "series": series,
+            "category": category,
+        }
+        job = await run_blocking(import_jobs.create, upload, options)
+    except HTTPException:
+        upload.discard()
+        raise
+    except Exception as e:
+        upload.discard()
+        raise HTTPException(status_code=500, detail=f"保存上传文件失败：{str(e)}")
 
-    # 验证分类（如果提供）
-    if category and category not in ['fiction', 'non-fiction']:
-        raise HTTPException(status_code=400, detail="分类必须是 'fiction' 或 'non-fiction'")
+    import_jobs.submit(job["id"])
+    logger.info(f"📥 已创建导入任务: {job['id']} ({upload.filename}, {upload.size / 1024 / 1024:.1f}MB)")
+    return job
 
-    # 保存上传的文件到临时目录
-    temp_dir = tempfile.mkdtemp()
-    temp_path = os.path.join(temp_dir, file.filename)
 
-    try:
-        # 写入临时文件
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-
-        # 导入书籍（import_book.py会自动同步到Supabase）
-        from scripts.import_book import import_epub
-        book_id = import_epub(
-            temp_path,
-            level=level or "未分级",  # 提供默认值
-            lexile=lexile,
-            series=series,
-            category=category
-        )
+@router.get("/imports/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(job_id: str):
+    """查询书籍导入任务的状态与各阶段进度"""
+    job = await run_blocking(import_jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="导入任务不存在")
+    return job
 
-        # 优先从Supabase获取书籍信息
-        book_info = None
-        if supabase_client.enabled:
-            try:
-                book_data = supabase_client.get_book(book_id)
-                if book_data:
-                    # 获取章节数量
-                    chapters = supabase_client.get_chapters(book_id)
-                    book_info = {
-                        "id": book_data['id'],
-                        "title": book_data['title'],
-                        "author": book_data.get('author'),
-                        "level": book_data.get('level'),
-                        "lexile": book_data.get('lexile'),
-                        "series": book_data.get('series'),
-                        "category": book_data.get('category'),
-                        "word_count": book_data.get('word_count'),
-                        "chapter_count": len(chapters)
-                    }
-                    logger.info(f"✅ 从Supabase获取上传书籍信息: {book_data['title']}")
-            except Exception as e:
-                logger.warning(f"⚠️ Supabase获取书籍信息失败，使用SQLite: {e}")
-
-        # 如果Supabase失败，从SQLite获取
-        if not book_info:
-            book = db.query(Book).filter(Book.id == book_id).first()
-            book_info = {
-                "id": book.id,
-                "title": book.title,
-                "author": book.author,
-                "level": book.level,
-                "lexile": book.lexile,
-                "series": book.series,
-                "category": book.category,
-                "word_count": book.word_count,
-                "chapter_count": len(book.chapters)
-            }
-            logger.info(f"从SQLite获取上传书籍信息: {book.title}")
 
-        return {
-            "success": True,
-            "message": "书籍上传成功",
-            "book": book_info
-        }
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"导入书籍失败：{str(e)}")
+@router.post("/imports/{job_id}/cancel", response_model=ImportJobResponse)
+async def cancel_import_job(job_id: str):
+    """
+    取消书籍导入任务
 
-    finally:
-        # 清理临时文件
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
+    排队中的任务立即取消；执行中的任务在下一步开始前中止并清理已上传的图片。
+    写入数据库后（Supabase同步阶段）无法取消，需删除书籍
+    """
+    job = await run_blocking(import_jobs.cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="导入任务不存在")
+    if job["status"] in ("completed", "failed"):
+        raise HTTPException(status_code=409, detail=f"导入任务已结束（{job['status']}），无法取消")
+    return job
 
 
 @router.delete("/{book_id}")
 async def delete_book(book_id: str, db: Session = Depends(get_db)):
     """删除书籍（同时从Supabase和SQLite删除）"""
+    return await run_blocking(_delete_book, book_id, db)
+
+
+def _delete_book(book_id: str, db: Session) -> dict:
+    """删除书籍的阻塞部分（Supabase、SQLite、图片存储），在数据库线程池中执行"""
     # 先从SQLite检查书籍是否存在
     book = db.query(Book).filter(Book.id == book_id).first()
     if not book:
@@ -351,8 +597,9 @@ async def delete_book(book_id: str, db: Session = Depends(get_db)):
                 logger.warning(f"⚠️ Supabase删除失败（继续删除SQLite）: {e}")
 
         # 删除SQLite中的相关数据
-        db.query(Chapter).filter(Chapter.book_id == book_id).delete()
+        chapter_store.delete_chapters(db, book_id)
         db.query(BookVocabulary).filter(BookVocabulary.book_id == book_id).delete()
+        search_index.remove_book(db.connection(), book_id)
 
         # 删除OSS图片
         if oss_helper.enabled:
@@ -366,6 +613,7 @@ async def delete_book(book_id: str, db: Session = Depends(get_db)):
         # 删除书籍记录
         db.delete(book)
         db.commit()
+        response_cache.invalidate_book(book_id)
 
         logger.info(f"✅ 书籍删除成功: {book_id}")
         return {"success": True, "message": "书籍删除成功"}
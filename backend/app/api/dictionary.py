@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 import asyncio
 import httpx
 import os
@@ -6,45 +7,76 @@ import hashlib
 import time
 import uuid
 import json
+import logging
+import random
 import re
-from datetime import datetime, timedelta
-from typing import Optional, Dict
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import wordnet
-from functools import lru_cache
-
-from app.schemas.schemas import DictionaryResponse
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache, wraps
+
+from app.config import dictionary_http_config
+from app.schemas.schemas import DictionaryBatchRequest, DictionaryResponse
+from app.services.circuit_breaker import OPEN, CircuitBreaker
+from app.services.db_executor import run_blocking
+from app.services.dictionary_cache import dictionary_cache, negative_cache
+from app.services.http_client import get_http_client
+from app.services.lemma_table import lemma_table
+from app.services.nltk_loader import get_lemmatizer, loaded_lemmatizer
+from app.services.offline_dictionary import offline_dictionary
+from app.services.single_flight import SingleFlight
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+if dictionary_http_config.log_level:
+    logger.setLevel(dictionary_http_config.log_level.upper())
 
 # ==================== 有道词典API配置 ====================
 # 申请地址：https://ai.youdao.com/
 YOUDAO_APP_KEY = os.getenv("YOUDAO_APP_KEY", "")
 YOUDAO_APP_SECRET = os.getenv("YOUDAO_APP_SECRET", "")
-YOUDAO_DICT_API = "https://openapi.youdao.com/api"
+YOUDAO_DICT_API = os.getenv("YOUDAO_DICT_API", "https://openapi.youdao.com/api")
 
-# ==================== 缓存配置 ====================
-# 词典查询结果缓存（内存缓存，服务重启后清空）
-_dictionary_cache: Dict[str, tuple[dict, float]] = {}
-CACHE_EXPIRE_HOURS = 24  # 缓存24小时
+# ==================== Free Dictionary API配置 ====================
+FREE_DICTIONARY_API = os.getenv("FREE_DICTIONARY_API", "https://api.dictionaryapi.dev/api/v2/entries/en")
 
-# 初始化词形还原器
-lemmatizer = WordNetLemmatizer()
 PUNCTUATION_MARKS = set(",.;!?，。！？；：、“”\"'()")
 EXPLAIN_SPLIT_PATTERN = re.compile(r'[；;，、]+')
 
+# 并发查询同一单词时只向上游发起一次请求
+dictionary_flight = SingleFlight()
+
+# 上游熔断器：连续失败后快速失败，避免故障期间每次查询都等到超时
+free_dictionary_breaker = CircuitBreaker(
+    "free_dictionary",
+    failure_threshold=dictionary_http_config.breaker_failure_threshold,
+    reset_timeout=dictionary_http_config.breaker_reset_seconds,
+)
+youdao_breaker = CircuitBreaker(
+    "youdao",
+    failure_threshold=dictionary_http_config.breaker_failure_threshold,
+    reset_timeout=dictionary_http_config.breaker_reset_seconds,
+)
+
+# 后台刷新过期缓存的任务（保留引用，避免被垃圾回收）
+_revalidation_tasks = set()
+
+# 上游查询结果统计：确认未收录 / 上游暂不可用（后者不写入否定缓存）
+upstream_stats = {"not_found": 0, "transient_failures": 0}
+
+# ==================== 批量查询配置 ====================
+BATCH_MAX_WORDS = int(os.getenv("DICT_BATCH_MAX_WORDS", "500"))  # 单次批量查询最多单词数
+BATCH_CONCURRENCY = int(os.getenv("DICT_BATCH_CONCURRENCY", "8"))  # 批量查询时上游并发数
+
 
 # ==================== 缓存辅助函数 ====================
+# 词典结果缓存由 app.services.dictionary_cache 提供（内存LRU + SQLite持久层）
+def normalize_query(word: str) -> str:
+    """归一化查询词：去除首尾空白、合并连续空白并转小写，用作缓存和请求合并的key"""
+    return " ".join(word.split()).lower()
+
+
 def get_from_cache(word: str) -> Optional[dict]:
     """从缓存中获取词典结果"""
-    word_lower = word.lower()
-    if word_lower in _dictionary_cache:
-        result, expire_time = _dictionary_cache[word_lower]
-        if datetime.now().timestamp() < expire_time:
-            return result
-        else:
-            del _dictionary_cache[word_lower]
-    return None
+    return dictionary_cache.get(normalize_query(word))
 
 
 def is_phrase_or_sentence(text: str) -> bool:
@@ -59,9 +91,7 @@ def is_phrase_or_sentence(text: str) -> bool:
 
 def save_to_cache(word: str, result: dict):
     """保存词典结果到缓存"""
-    word_lower = word.lower()
-    expire_time = (datetime.now() + timedelta(hours=CACHE_EXPIRE_HOURS)).timestamp()
-    _dictionary_cache[word_lower] = (result, expire_time)
+    dictionary_cache.set(normalize_query(word), result)
 
 
 # ==================== 词形还原 ====================
@@ -132,23 +162,16 @@ IRREGULAR_VERBS = {
 }
 
 
-@lru_cache(maxsize=1000)
-def lemmatize_word(word: str) -> str:
-    """词形还原：将词形变化还原为原形
+# WordNet词性标记：动词/名词/形容词/副词（与 nltk.corpus.wordnet.VERB 等一致，避免导入语料模块）
+WORDNET_POS = ("v", "n", "a", "r")
 
-    例如：running → run, went → go, children → child
-    """
-    word_lower = word.lower()
-
-    # 1. 首先检查不规则动词映射
-    if word_lower in IRREGULAR_VERBS:
-        return IRREGULAR_VERBS[word_lower]
 
-    # 2. 使用WordNet进行还原
-    pos_list = [wordnet.VERB, wordnet.NOUN, wordnet.ADJ, wordnet.ADV]
+def wordnet_lemmatize(word_lower: str) -> str:
+    """使用WordNet按动词/名词/形容词/副词依次还原，取最短结果（首次调用时加载NLTK）"""
+    lemmatizer = get_lemmatizer()
     results = set()
 
-    for pos in pos_list:
+    for pos in WORDNET_POS:
         lemma = lemmatizer.lemmatize(word_lower, pos=pos)
         if lemma != word_lower:
             results.add(lemma)
@@ -161,7 +184,87 @@ def lemmatize_word(word: str) -> str:
     return word_lower
 
 
+@lru_cache(maxsize=10000)
+def _cached_wordnet_lemmatize(word_lower: str) -> str:
+    """词形还原表未收录的单词才会走到这里"""
+    return wordnet_lemmatize(word_lower)
+
+
+def lemmatize_word(word: str) -> str:
+    """词形还原：将词形变化还原为原形
+
+    例如：running → run, went → go, children → child
+    """
+    word_lower = word.lower()
+
+    # 1. 首先检查不规则动词映射
+    if word_lower in IRREGULAR_VERBS:
+        return IRREGULAR_VERBS[word_lower]
+
+    # 2. 预计算的词形还原表（覆盖书库中出现过的所有单词）
+    lemma = lemma_table.get(word_lower)
+    if lemma is not None:
+        return lemma
+
+    # 3. 使用WordNet进行还原
+    # 语料由启动时的后台任务加载；未就绪（加载中或加载失败）时退回原词，不在事件循环中等待加载
+    if loaded_lemmatizer() is None:
+        return word_lower
+    try:
+        return _cached_wordnet_lemmatize(word_lower)
+    except LookupError:
+        return word_lower
+
+
 # ==================== 有道词典API ====================
+class UpstreamError(Exception):
+    """上游词典暂时不可用（超时、网络错误、5xx、限流等），结果不应写入否定缓存"""
+
+
+def guarded_by(breaker: CircuitBreaker):
+    """上游查询装饰器：熔断打开时直接抛出UpstreamError，并根据查询结果更新熔断状态"""
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(client: httpx.AsyncClient, word: str) -> Optional[dict]:
+            if not breaker.allow_request():
+                raise UpstreamError(f"{breaker.name} circuit open")
+            try:
+                result = await fn(client, word)
+            except asyncio.CancelledError:
+                # 客户端断开或等待方被取消，与上游是否健康无关
+                breaker.release()
+                raise
+            except (UpstreamError, TimeoutError):
+                breaker.record_failure()
+                raise
+            breaker.record_success()
+            return result
+        return wrapper
+    return decorator
+
+
+class LazyJSON:
+    """日志参数：仅在日志真正输出时才序列化JSON"""
+
+    __slots__ = ("data", "indent")
+
+    def __init__(self, data, indent: Optional[int] = None):
+        self.data = data
+        self.indent = indent
+
+    def __str__(self) -> str:
+        try:
+            return json.dumps(self.data, ensure_ascii=False, indent=self.indent)
+        except (TypeError, ValueError) as e:
+            return f"<unserializable: {e}>"
+
+
+def should_log_payload() -> bool:
+    """按 DICT_PAYLOAD_LOG_SAMPLE_RATE 抽样输出上游完整响应（需同时开启DEBUG级别）"""
+    rate = dictionary_http_config.payload_log_sample_rate
+    return rate > 0 and logger.isEnabledFor(logging.DEBUG) and (rate >= 1 or random.random() < rate)
+
+
 def truncate(q: str) -> str:
     """截断文本（有道API签名要求）
 
@@ -174,22 +277,28 @@ def truncate(q: str) -> str:
     return q if size <= 20 else q[0:10] + str(size) + q[size - 10:size]
 
 
+@guarded_by(free_dictionary_breaker)
 async def query_free_dictionary(client: httpx.AsyncClient, word: str) -> Optional[dict]:
     """查询 Free Dictionary API（英文词典，免费）"""
     start_time = time.time()
     try:
-        url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word.lower()}"
-        response = await client.get(url, timeout=2.0)
+        url = f"{FREE_DICTIONARY_API}/{word.lower()}"
+        response = await client.get(url, timeout=dictionary_http_config.free_dictionary_timeout)
 
-        if response.status_code != 200:
+        if response.status_code == 404:
             elapsed = (time.time() - start_time) * 1000
-            print(f"❌ Free Dictionary HTTP错误 {response.status_code}: {word} ({elapsed:.0f}ms)")
+            logger.debug(f"ℹ️ Free Dictionary未收录: {word} ({elapsed:.0f}ms)")
             return None
 
+        if response.status_code != 200:
+            elapsed = (time.time() - start_time) * 1000
+            logger.warning(f"❌ Free Dictionary HTTP错误 {response.status_code}: {word} ({elapsed:.0f}ms)")
+            raise UpstreamError(f"Free Dictionary HTTP {response.status_code}")
+
         data = response.json()
         if not data or not isinstance(data, list) or len(data) == 0:
             elapsed = (time.time() - start_time) * 1000
-            print(f"ℹ️ Free Dictionary无结果: {word} ({elapsed:.0f}ms)")
+            logger.debug(f"ℹ️ Free Dictionary无结果: {word} ({elapsed:.0f}ms)")
             return None
 
         entry = data[0]
@@ -221,27 +330,30 @@ async def query_free_dictionary(client: httpx.AsyncClient, word: str) -> Optiona
 
         if not meanings:
             elapsed = (time.time() - start_time) * 1000
-            print(f"ℹ️ Free Dictionary无释义: {word} ({elapsed:.0f}ms)")
+            logger.debug(f"ℹ️ Free Dictionary无释义: {word} ({elapsed:.0f}ms)")
             return None
 
         elapsed = (time.time() - start_time) * 1000
-        print(f"✅ Free Dictionary返回 {len(meanings)} 个词性释义: {word} ({elapsed:.0f}ms)")
+        logger.debug(f"✅ Free Dictionary返回 {len(meanings)} 个词性释义: {word} ({elapsed:.0f}ms)")
         return {
             "word": entry.get('word', word),
             "phonetic": phonetic,
             "meanings": meanings,
         }
 
+    except UpstreamError:
+        raise
     except httpx.TimeoutException:
         elapsed = (time.time() - start_time) * 1000
-        print(f"⏱️ Free Dictionary超时: {word} ({elapsed:.0f}ms)")
-        return None
+        logger.warning(f"⏱️ Free Dictionary超时: {word} ({elapsed:.0f}ms)")
+        raise UpstreamError("Free Dictionary timeout")
     except Exception as e:
         elapsed = (time.time() - start_time) * 1000
-        print(f"Free Dictionary异常: {e} ({elapsed:.0f}ms)")
-        return None
+        logger.warning(f"Free Dictionary异常: {e} ({elapsed:.0f}ms)")
+        raise UpstreamError(f"Free Dictionary error: {e}")
 
 
+@guarded_by(youdao_breaker)
 async def query_youdao_translate(client: httpx.AsyncClient, word: str) -> Optional[dict]:
     """查询有道翻译API（用于短语和句子的中文翻译）
 
@@ -261,7 +373,7 @@ async def query_youdao_translate(client: httpx.AsyncClient, word: str) -> Option
     if not YOUDAO_APP_KEY or not YOUDAO_APP_SECRET or \
        YOUDAO_APP_KEY == "your_app_key_here" or \
        YOUDAO_APP_SECRET == "your_app_secret_here":
-        print(f"⚠️  有道API未配置，跳过翻译")
+        logger.debug("⚠️  有道API未配置，跳过翻译")
         return None
 
     start_time = time.time()
@@ -287,27 +399,23 @@ async def query_youdao_translate(client: httpx.AsyncClient, word: str) -> Option
             'curtime': curtime,
         }
 
-        response = await client.get(YOUDAO_DICT_API, params=params, timeout=3.0)
+        response = await client.get(YOUDAO_DICT_API, params=params, timeout=dictionary_http_config.youdao_timeout)
 
         if response.status_code != 200:
             elapsed = (time.time() - start_time) * 1000
-            print(f"❌ 有道API HTTP错误: {response.status_code} ({elapsed:.0f}ms)")
-            return None
+            logger.warning(f"❌ 有道API HTTP错误: {response.status_code} ({elapsed:.0f}ms)")
+            raise UpstreamError(f"Youdao HTTP {response.status_code}")
 
         data = response.json()
-        try:
-            print("=" * 50)
-            print(f"📥 有道API完整响应({word}):")
-            print(json.dumps(data, ensure_ascii=False, indent=2))
-            print("=" * 50)
-        except Exception as log_error:
-            print(f"⚠️ 有道API响应日志写入失败: {log_error}")
+        log_payload = should_log_payload()
+        if log_payload:
+            logger.debug("📥 有道API完整响应(%s):\n%s", word, LazyJSON(data, indent=2))
 
         # 检查错误码
         error_code = data.get('errorCode')
         if error_code != '0':
             elapsed = (time.time() - start_time) * 1000
-            print(f"❌ 有道API错误码: {error_code} ({elapsed:.0f}ms)")
+            logger.warning(f"❌ 有道API错误码: {error_code} ({elapsed:.0f}ms)")
             # 常见错误码说明
             error_messages = {
                 '101': '缺少必填的参数',
@@ -322,15 +430,17 @@ async def query_youdao_translate(client: httpx.AsyncClient, word: str) -> Option
                 '411': '访问频率受限'
             }
             if error_code in error_messages:
-                print(f"   {error_messages[error_code]}")
-            return None
+                logger.warning(f"   {error_messages[error_code]}")
+            # 错误码多为配置、额度或限流问题，与单词本身无关
+            raise UpstreamError(f"Youdao errorCode {error_code}")
 
         # 解析有道词典响应
         basic = data.get('basic', {})
         translation = data.get('translation', [])
-        print(f"📑 basic字段: {json.dumps(basic, ensure_ascii=False) if basic else '{}'}")
-        print(f"🌐 web字段数量: {len(data.get('web', []) or [])}")
-        print(f"🔁 translation字段: {json.dumps(translation, ensure_ascii=False)}")
+        if log_payload:
+            logger.debug("📑 basic字段: %s", LazyJSON(basic or {}))
+            logger.debug("🌐 web字段数量: %d", len(data.get('web', []) or []))
+            logger.debug("🔁 translation字段: %s", LazyJSON(translation))
 
         if not basic and not translation:
             return None
@@ -460,28 +570,28 @@ async def query_youdao_translate(client: httpx.AsyncClient, word: str) -> Option
             "meanings": meanings,
         }
 
-        try:
-            print(
-                f"📊 有道API统计({word}): explains={len(explains)} "
-                f"translation={len(translation)} web={len(web_entries)} "
-                f"wfs={len(wfs)} sentence={len(sentence_entries) + len(sentence_entries_alt) + len(example_entries)} meanings={len(meanings)}"
+        if log_payload:
+            logger.debug(
+                "📊 有道API统计(%s): explains=%d translation=%d web=%d wfs=%d sentence=%d meanings=%d",
+                word, len(explains), len(translation), len(web_entries), len(wfs),
+                len(sentence_entries) + len(sentence_entries_alt) + len(example_entries), len(meanings)
             )
-            print(f"📚 有道解析释义({word}): {json.dumps(meanings, ensure_ascii=False)}")
-        except Exception as log_error:
-            print(f"⚠️ 有道解析日志写入失败: {log_error}")
+            logger.debug("📚 有道解析释义(%s): %s", word, LazyJSON(meanings))
         elapsed = (time.time() - start_time) * 1000
-        print(f"✅ 有道API返回 {len(meanings)} 条释义: {word} ({elapsed:.0f}ms)")
+        logger.debug(f"✅ 有道API返回 {len(meanings)} 条释义: {word} ({elapsed:.0f}ms)")
 
         return result
 
+    except UpstreamError:
+        raise
     except httpx.TimeoutException:
         elapsed = (time.time() - start_time) * 1000
-        print(f"有道API超时: {word} ({elapsed:.0f}ms)")
-        return None
+        logger.warning(f"有道API超时: {word} ({elapsed:.0f}ms)")
+        raise UpstreamError("Youdao timeout")
     except Exception as e:
         elapsed = (time.time() - start_time) * 1000
-        print(f"有道API异常: {e} ({elapsed:.0f}ms)")
-        return None
+        logger.warning(f"有道API异常: {e} ({elapsed:.0f}ms)")
+        raise UpstreamError(f"Youdao error: {e}")
 
 
 def parse_dictionary_entry(entry: dict, original_word: str, lemma: str = None) -> DictionaryResponse:
@@ -496,9 +606,36 @@ def parse_dictionary_entry(entry: dict, original_word: str, lemma: str = None) -
     )
 
 
-@router.get("/{word}", response_model=DictionaryResponse)
-async def lookup_word(word: str):
-    """查询单词释义（同时查询中英文，支持词形还原）
+@router.get("/stats/summary")
+async def get_dictionary_stats():
+    """词典服务运行统计（缓存命中、淘汰等），供监控使用"""
+    return {
+        "cache": dictionary_cache.stats(),
+        "negative_cache": {**negative_cache.stats(), **upstream_stats},
+        "coalescing": dictionary_flight.stats(),
+        "offline": offline_dictionary.stats(),
+        "lemma_table": lemma_table.stats(),
+        "upstreams": {
+            breaker.name: breaker.stats() for breaker in (free_dictionary_breaker, youdao_breaker)
+        },
+    }
+
+
+def _not_found_exception(word: str) -> HTTPException:
+    """单词未找到（404）"""
+    return HTTPException(
+        status_code=404,
+        detail={
+            "error": "Word not found",
+            "message": f"未找到 '{word}' 的释义",
+            "word": word,
+            "hint": "英文词典和中文翻译都未找到结果"
+        }
+    )
+
+
+async def _lookup_upstream(word: str) -> dict:
+    """向上游词典查询并合并结果（同一查询的并发请求经single-flight合并后只执行一次）
 
     查询策略：
     1. 查询英文释义（Free Dictionary API）
@@ -506,123 +643,291 @@ async def lookup_word(word: str):
     3. 同时查询中文翻译（有道API）
     4. 合并所有结果，前端控制显示哪种语言
     """
-    import time
     start_time = time.time()
     query_type = "phrase" if is_phrase_or_sentence(word) else "word"
-    print(f"🔍 查询请求: {word} (类型: {query_type})")
-
-    # 0. 先检查缓存
-    cache_check_start = time.time()
-    cached_result = get_from_cache(word)
-    cache_elapsed = (time.time() - cache_check_start) * 1000
-    print(f"⏱️ 缓存检查耗时: {cache_elapsed:.0f}ms (命中: {'是' if cached_result else '否'})")
-    if cached_result:
-        total_elapsed = (time.time() - start_time) * 1000
-        print(f"✅ 缓存命中: {word} (总耗时 {total_elapsed:.0f}ms)")
-        return DictionaryResponse(**cached_result)
 
-    async with httpx.AsyncClient() as client:
-        try:
-            lemma = None
-            english_entry = None
-            chinese_entry = None
+    # 近期确认查不到的词（拼写错误、人名、OCR乱码等）直接返回404
+    if negative_cache.get(normalize_query(word)):
+        logger.debug(f"🚫 否定缓存命中: {word}")
+        raise _not_found_exception(word)
 
-            if query_type == "phrase":
-                phrase_start = time.time()
+    client = get_http_client()
+    try:
+        lemma = None
+        english_entry = None
+        chinese_entry = None
+        upstream_failed = False
+
+        if query_type == "phrase":
+            phrase_start = time.time()
+            try:
                 chinese_entry = await query_youdao_translate(client, word)
-                phrase_elapsed = (time.time() - phrase_start) * 1000
-                print(f"⚡ 查询路线: 短语/句子 → 有道 ({phrase_elapsed:.0f}ms)")
-                if not chinese_entry:
-                    print("⚠️ 短语翻译为空，尝试英文词典回退")
+            except UpstreamError:
+                upstream_failed = True
+            phrase_elapsed = (time.time() - phrase_start) * 1000
+            logger.debug(f"⚡ 查询路线: 短语/句子 → 有道 ({phrase_elapsed:.0f}ms)")
+            if not chinese_entry:
+                logger.debug("⚠️ 短语翻译为空，尝试英文词典回退")
+                try:
                     english_entry = await query_free_dictionary(client, word)
-            else:
-                api_start = time.time()
-                english_result, chinese_result = await asyncio.gather(
-                    query_free_dictionary(client, word),
-                    query_youdao_translate(client, word),
-                    return_exceptions=True
-                )
-                elapsed = (time.time() - api_start) * 1000
-                print(f"⚡ 查询路线: 单词 → 并发(英文+中文) ({elapsed:.0f}ms)")
-
-                english_entry = None if isinstance(english_result, Exception) else english_result
-                chinese_entry = None if isinstance(chinese_result, Exception) else chinese_result
-
-                if isinstance(english_result, Exception):
-                    print(f"❌ 英文释义查询异常: {english_result}")
-                if isinstance(chinese_result, Exception):
-                    print(f"❌ 中文翻译查询异常: {chinese_result}")
-
-                # 词形还原重试仅针对英文释义
-                if not english_entry:
-                    lemma_candidate = lemmatize_word(word)
-                    if lemma_candidate != word.lower():
-                        lemma = lemma_candidate
-                        print(f"🔄 词形还原: {word} → {lemma}")
-                        retry_start = time.time()
+                except UpstreamError:
+                    upstream_failed = True
+        else:
+            api_start = time.time()
+            english_result, chinese_result = await asyncio.gather(
+                query_free_dictionary(client, word),
+                query_youdao_translate(client, word),
+                return_exceptions=True
+            )
+            elapsed = (time.time() - api_start) * 1000
+            logger.debug(f"⚡ 查询路线: 单词 → 并发(英文+中文) ({elapsed:.0f}ms)")
+
+            english_entry = None if isinstance(english_result, Exception) else english_result
+            chinese_entry = None if isinstance(chinese_result, Exception) else chinese_result
+
+            if isinstance(english_result, Exception):
+                upstream_failed = True
+                logger.warning(f"❌ 英文释义查询异常: {english_result}")
+            if isinstance(chinese_result, Exception):
+                upstream_failed = True
+                logger.warning(f"❌ 中文翻译查询异常: {chinese_result}")
+
+            # 词形还原重试仅针对英文释义
+            if not english_entry:
+                lemma_candidate = lemmatize_word(word)
+                if lemma_candidate != word.lower():
+                    lemma = lemma_candidate
+                    logger.debug(f"🔄 词形还原: {word} → {lemma}")
+                    retry_start = time.time()
+                    retry_result = None
+                    try:
                         retry_result = await query_free_dictionary(client, lemma)
-                        retry_elapsed = (time.time() - retry_start) * 1000
-                        print(f"↩️  词形还原英文查询耗时: {retry_elapsed:.0f}ms")
-                        english_entry = retry_result
-
-            # 4. 合并结果
-            if not english_entry and not chinese_entry:
-                # 两者都失败
-                elapsed = (time.time() - start_time) * 1000
-                print(f"❌ 未找到: {word} ({elapsed:.0f}ms)")
+                    except UpstreamError:
+                        upstream_failed = True
+                    retry_elapsed = (time.time() - retry_start) * 1000
+                    logger.debug(f"↩️  词形还原英文查询耗时: {retry_elapsed:.0f}ms")
+                    english_entry = retry_result
+
+        # 4. 合并结果
+        if not english_entry and not chinese_entry:
+            elapsed = (time.time() - start_time) * 1000
+            if upstream_failed:
+                # 上游暂时不可用：不写入否定缓存，稍后重试可能成功
+                upstream_stats["transient_failures"] += 1
+                logger.warning(f"❌ 上游暂不可用: {word} ({elapsed:.0f}ms)")
                 raise HTTPException(
-                    status_code=404,
+                    status_code=503,
                     detail={
-                        "error": "Word not found",
-                        "message": f"未找到 '{word}' 的释义",
+                        "error": "Dictionary upstream unavailable",
+                        "message": "词典服务暂时不可用，请稍后重试",
                         "word": word,
-                        "hint": "英文词典和中文翻译都未找到结果"
                     }
                 )
 
-            # 合并英文和中文的 meanings
-            combined_meanings = []
-            phonetic = ""
-
-            if english_entry:
-                combined_meanings.extend(english_entry.get("meanings", []))
-                phonetic = english_entry.get("phonetic", "")
-                print(f"✅ 英文释义: {len(english_entry.get('meanings', []))} 条")
-
-            if chinese_entry:
-                combined_meanings.extend(chinese_entry.get("meanings", []))
-                # 如果英文没有音标，使用中文的
-                if not phonetic:
-                    phonetic = chinese_entry.get("phonetic", "")
-                print(f"✅ 中文翻译: {len(chinese_entry.get('meanings', []))} 条")
-
-            # 构造响应
-            result = DictionaryResponse(
-                word=word,
-                phonetic=phonetic,
-                meanings=combined_meanings,
-                searched_word=word if lemma and lemma != word.lower() else None,
-                lemma=lemma if lemma and lemma != word.lower() else None
-            )
+            # 两个上游都明确查不到，写入否定缓存
+            upstream_stats["not_found"] += 1
+            negative_cache.set(normalize_query(word), {"word": word})
+            logger.info(f"❌ 未找到: {word} ({elapsed:.0f}ms)")
+            raise _not_found_exception(word)
+
+        # 合并英文和中文的 meanings
+        combined_meanings = []
+        phonetic = ""
+
+        if english_entry:
+            combined_meanings.extend(english_entry.get("meanings", []))
+            phonetic = english_entry.get("phonetic", "")
+            logger.debug(f"✅ 英文释义: {len(english_entry.get('meanings', []))} 条")
+
+        if chinese_entry:
+            combined_meanings.extend(chinese_entry.get("meanings", []))
+            # 如果英文没有音标，使用中文的
+            if not phonetic:
+                phonetic = chinese_entry.get("phonetic", "")
+            logger.debug(f"✅ 中文翻译: {len(chinese_entry.get('meanings', []))} 条")
+
+        # 构造响应
+        result = DictionaryResponse(
+            word=word,
+            phonetic=phonetic,
+            meanings=combined_meanings,
+            searched_word=word if lemma and lemma != word.lower() else None,
+            lemma=lemma if lemma and lemma != word.lower() else None
+        )
+
+        # 缓存结果
+        result_data = result.model_dump()
+        save_to_cache(word, result_data)
 
-            # 缓存结果
-            save_to_cache(word, result.model_dump())
+        elapsed = (time.time() - start_time) * 1000
+        logger.info(f"✅ 查询成功: {word} (总耗时 {elapsed:.0f}ms)")
+        return result_data
 
-            elapsed = (time.time() - start_time) * 1000
-            print(f"✅ 查询成功: {word} (总耗时 {elapsed:.0f}ms)")
-            return result
+    except HTTPException:
+        total_elapsed = (time.time() - start_time) * 1000
+        logger.debug(f"❌ 查询失败(HTTP): {word} ({total_elapsed:.0f}ms)")
+        raise
+    except Exception as e:
+        elapsed = (time.time() - start_time) * 1000
+        logger.error(f"❌ 查询错误: {e} ({elapsed:.0f}ms)")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "Internal server error",
+                "message": f"查询失败: {str(e)}"
+            }
+        )
 
-        except HTTPException:
-            total_elapsed = (time.time() - start_time) * 1000
-            print(f"❌ 查询失败(HTTP): {word} ({total_elapsed:.0f}ms)")
-            raise
-        except Exception as e:
-            elapsed = (time.time() - start_time) * 1000
-            print(f"❌ 查询错误: {e} ({elapsed:.0f}ms)")
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "error": "Internal server error",
-                    "message": f"查询失败: {str(e)}"
-                }
-            )
+
+def _schedule_revalidation(word: str) -> None:
+    """后台向上游刷新过期缓存（与前台查询共享single-flight），上游全部熔断时跳过"""
+    if free_dictionary_breaker.state == OPEN and youdao_breaker.state == OPEN:
+        return
+
+    async def revalidate():
+        try:
+            await dictionary_flight.do(normalize_query(word), lambda: _lookup_upstream(word))
+        except HTTPException as e:
+            logger.warning(f"⚠️ 后台刷新失败({e.status_code}): {word}")
+
+    task = asyncio.get_running_loop().create_task(revalidate())
+    _revalidation_tasks.add(task)
+    task.add_done_callback(_revalidation_tasks.discard)
+
+
+def _lookup_local(word: str) -> Tuple[Optional[dict], Optional[str]]:
+    """查询本地数据源（缓存 → 离线词典 → 过期缓存），返回 (结果, 来源)
+
+    会读取缓存的SQLite持久层，需通过 run_blocking 调用；来源为 stale 时由调用方安排后台刷新
+    """
+    cached_result = get_from_cache(word)
+    if cached_result:
+        return cached_result, "cache"
+    if not is_phrase_or_sentence(word):
+        offline_entry = offline_dictionary.lookup(normalize_query(word))
+        if offline_entry:
+            return offline_entry, "offline"
+    stale_result = dictionary_cache.get_stale(normalize_query(word))
+    if stale_result:
+        return stale_result, "stale"
+    return None, None
+
+
+def _lookup_local_batch(words: List[str]) -> List[Tuple[str, str, Optional[dict], Optional[str], str]]:
+    """批量查询本地数据源（原词未命中时再查词根），返回 (单词, 词根, 结果, 来源, 命中的查询词) 列表"""
+    results = []
+    for word in words:
+        lemma = lemmatize_word(word)
+        hit_word = word
+        entry, source = _lookup_local(word)
+        if not entry and lemma != word:
+            hit_word = lemma
+            entry, source = _lookup_local(lemma)
+        results.append((word, lemma, entry, source, hit_word))
+    return results
+
+
+def _batch_line(query: str, lemma: Optional[str], status: str, source: Optional[str] = None,
+                result: Optional[dict] = None, detail: Optional[str] = None) -> str:
+    """构造批量查询的一行NDJSON"""
+    return json.dumps({
+        "query": query,
+        "lemma": lemma if lemma and lemma != query else None,
+        "status": status,
+        "source": source,
+        "result": result,
+        "detail": detail,
+    }, ensure_ascii=False) + "\n"
+
+
+@router.post("/batch")
+async def lookup_batch(payload: DictionaryBatchRequest):
+    """批量查询单词释义（用于预取整章词汇），以NDJSON流式返回
+
+    - 输入单词先归一化、去重，短语/句子不参与批量查询
+    - 缓存/离线词典命中的结果立即返回
+    - 未命中的单词按词根合并后以有限并发向上游查询，完成一个返回一个
+    """
+    words: List[str] = []
+    seen = set()
+    for raw in payload.words:
+        key = normalize_query(raw)
+        if not key or key in seen or is_phrase_or_sentence(key):
+            continue
+        seen.add(key)
+        words.append(key)
+
+    if len(words) > BATCH_MAX_WORDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"单次最多查询 {BATCH_MAX_WORDS} 个单词，当前 {len(words)} 个"
+        )
+
+    async def generate():
+        # 1. 本地命中立即返回，未命中的按词根分组
+        misses: Dict[str, List[str]] = {}
+        for word, lemma, entry, source, hit_word in await run_blocking(_lookup_local_batch, words):
+            if source == "stale":
+                _schedule_revalidation(hit_word)
+            if entry:
+                yield _batch_line(word, lemma, "ok", source, entry)
+            else:
+                misses.setdefault(lemma, []).append(word)
+
+        if not misses:
+            return
+
+        # 2. 未命中词根以有限并发向上游查询（与单词查询共享single-flight）
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def fetch(lemma: str, group: List[str]) -> List[str]:
+            async with semaphore:
+                try:
+                    entry = await dictionary_flight.do(lemma, lambda: _lookup_upstream(lemma))
+                except HTTPException as e:
+                    status = "not_found" if e.status_code == 404 else "error"
+                    detail = e.detail.get("message") if isinstance(e.detail, dict) else str(e.detail)
+                    return [_batch_line(word, lemma, status, detail=detail) for word in group]
+
+            lines = []
+            for word in group:
+                word_entry = entry
+                if word != lemma:
+                    # 以原词缓存一份，之后点击该词可直接命中
+                    word_entry = {**entry, "word": word, "searched_word": word, "lemma": lemma}
+                    save_to_cache(word, word_entry)
+                lines.append(_batch_line(word, lemma, "ok", "upstream", word_entry))
+            return lines
+
+        tasks = [fetch(lemma, group) for lemma, group in misses.items()]
+        for finished in asyncio.as_completed(tasks):
+            for line in await finished:
+                yield line
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.get("/{word}", response_model=DictionaryResponse)
+async def lookup_word(word: str):
+    """查询单词释义（同时查询中英文，支持词形还原）
+
+    1. 先检查缓存
+    2. 单词查询离线词典（本地文件，无需网络）
+    3. 过期缓存直接返回，后台刷新（上游故障或熔断时同样秒回）
+    4. 仍未命中时，相同单词/短语的并发请求共享同一次上游查询
+    """
+    start_time = time.time()
+    query_type = "phrase" if is_phrase_or_sentence(word) else "word"
+    logger.debug(f"🔍 查询请求: {word} (类型: {query_type})")
+
+    # 0. 先检查本地数据源（缓存、离线词典）
+    local_result, source = await run_blocking(_lookup_local, word)
+    if source == "stale":
+        _schedule_revalidation(word)
+    if local_result:
+        total_elapsed = (time.time() - start_time) * 1000
+        logger.debug(f"✅ 本地命中({source}): {word} (总耗时 {total_elapsed:.2f}ms)")
+        return DictionaryResponse(**local_result)
+
+    result = await dictionary_flight.do(normalize_query(word), lambda: _lookup_upstream(word))
+    return DictionaryResponse(**result)
@@ -52,3 +52,202 @@ class OSSConfig:
 
 # 全局配置实例
 oss_config = OSSConfig()
+
+
+class DictionaryCacheConfig:
+    """词典查询缓存配置（内存LRU + SQLite持久层）"""
+
+    def __init__(self):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        default_db_path = os.path.join(backend_dir, "data", "dictionary_cache.db")
+
+        self.max_entries: int = int(os.getenv("DICT_CACHE_MAX_ENTRIES", "5000"))
+        self.max_bytes: int = int(os.getenv("DICT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        self.ttl_hours: float = float(os.getenv("DICT_CACHE_TTL_HOURS", "24"))
+        self.persist: bool = os.getenv("DICT_CACHE_PERSIST", "true").lower() == "true"
+        self.db_path: str = os.getenv("DICT_CACHE_DB_PATH", default_db_path)
+        self.warm_entries: int = int(os.getenv("DICT_CACHE_WARM_ENTRIES", "2000"))
+        # 磁盘写入由后台线程批量提交，此为攒批间隔（秒）
+        self.flush_interval: float = float(os.getenv("DICT_CACHE_FLUSH_INTERVAL", "0.2"))
+        # 过期后仍可返回旧结果（并在后台刷新）的时长
+        self.stale_hours: float = float(os.getenv("DICT_CACHE_STALE_HOURS", "168"))
+        # 否定缓存（上游确认查不到的词），过期时间较短
+        self.negative_ttl_minutes: float = float(os.getenv("DICT_NEGATIVE_TTL_MINUTES", "30"))
+        self.negative_max_entries: int = int(os.getenv("DICT_NEGATIVE_MAX_ENTRIES", "10000"))
+
+
+dictionary_cache_config = DictionaryCacheConfig()
+
+
+class ResponseCacheConfig:
+    """书籍/章节/词汇GET接口的响应缓存配置（内存LRU，可选SQLite持久层）"""
+
+    def __init__(self):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        default_db_path = os.path.join(backend_dir, "data", "response_cache.db")
+
+        self.enabled: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+        self.max_entries: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+        self.max_bytes: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.ttl_hours: float = float(os.getenv("RESPONSE_CACHE_TTL_HOURS", "24"))
+        self.persist: bool = os.getenv("RESPONSE_CACHE_PERSIST", "false").lower() == "true"
+        self.db_path: str = os.getenv("RESPONSE_CACHE_DB_PATH", default_db_path)
+        # 浏览器/CDN缓存时长（秒），过期后通过ETag协商
+        self.max_age: int = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "300"))
+
+
+response_cache_config = ResponseCacheConfig()
+
+
+class BooksReadConfig:
+    """书籍读取接口的数据源策略
+
+    - supabase_first：先查Supabase，失败或无数据时回退SQLite（默认，兼容旧行为）
+    - local_first：先查本地SQLite，本地无数据时再查Supabase
+    - race：同时查询两者，返回先成功的结果
+    """
+
+    STRATEGIES = ("supabase_first", "local_first", "race")
+
+    def __init__(self):
+        strategy = os.getenv("BOOKS_READ_STRATEGY", "supabase_first").strip().lower()
+        self.strategy: str = strategy if strategy in self.STRATEGIES else "supabase_first"
+
+
+books_read_config = BooksReadConfig()
+
+
+class DatabaseExecutorConfig:
+    """阻塞式数据访问（supabase-py、SQLAlchemy）使用的线程池配置"""
+
+    def __init__(self):
+        # 线程数，0表示直接在事件循环中执行（仅用于对比测试）
+        self.threadpool_size: int = int(os.getenv("DB_THREADPOOL_SIZE", "10"))
+
+
+db_executor_config = DatabaseExecutorConfig()
+
+
+class SQLiteConfig:
+    """本地SQLite连接参数（每个新连接建立时通过PRAGMA设置）
+
+    - WAL模式下导入书籍（写）不会阻塞章节读取；synchronous=NORMAL 在WAL下仍可保证崩溃一致性
+    - cache_size 为负数时单位为KiB（-65536 即64MB/连接）
+    """
+
+    def __init__(self):
+        self.journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL").strip().upper()
+        self.synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").strip().upper()
+        self.mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+        self.cache_size: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+        self.busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+        # SQLAlchemy连接池，应不小于 DB_THREADPOOL_SIZE，否则线程会排队等待连接
+        self.pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+
+sqlite_config = SQLiteConfig()
+
+
+class CompressionConfig:
+    """HTTP响应压缩配置"""
+
+    def __init__(self):
+        self.enabled: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+        # 小于该字节数的响应不压缩
+        self.minimum_size: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+        self.gzip_level: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+        self.brotli_quality: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+
+compression_config = CompressionConfig()
+
+
+class ChapterStoreConfig:
+    """章节正文存储配置
+
+    开启时章节HTML以gzip压缩后按内容哈希（SHA-256）存入 chapter_blobs 表，
+    chapters 表只保存哈希；相同内容只存一份，/content 接口可直接流式返回压缩数据
+    """
+
+    def __init__(self):
+        self.enabled: bool = os.getenv("CHAPTER_STORE_ENABLED", "true").lower() == "true"
+        self.gzip_level: int = int(os.getenv("CHAPTER_STORE_GZIP_LEVEL", "9"))
+        # 流式读取时每次从SQLite blob读取的字节数
+        self.chunk_size: int = int(os.getenv("CHAPTER_STORE_CHUNK_SIZE", str(64 * 1024)))
+
+
+chapter_store_config = ChapterStoreConfig()
+
+
+class ImportJobConfig:
+    """书籍导入配置（异步导入任务、图片上传、章节解析）"""
+
+    def __init__(self):
+        # 同时执行的导入任务数（解析EPUB与上传图片较耗CPU/带宽，不宜过大）
+        self.workers: int = int(os.getenv("IMPORT_WORKERS", "2"))
+        # 任务进度写入数据库的最小间隔（秒），阶段切换时立即写入
+        self.progress_interval: float = float(os.getenv("IMPORT_PROGRESS_INTERVAL", "0.5"))
+        # 导入时并发上传图片的线程数，以及云端上传失败后的重试次数与首次退避（秒，之后每次翻倍）
+        self.image_workers: int = int(os.getenv("IMPORT_IMAGE_WORKERS", "8"))
+        self.image_retries: int = int(os.getenv("IMPORT_IMAGE_RETRIES", "2"))
+        self.image_retry_backoff: float = float(os.getenv("IMPORT_IMAGE_RETRY_BACKOFF", "0.5"))
+        # 章节HTML解析器：html.parser（默认）/ lxml（需安装，显式开启）
+        self.html_parser: str = os.getenv("IMPORT_HTML_PARSER", "html.parser")
+        # 上传文件大小上限（MB），超过时返回413
+        self.max_upload_bytes: int = int(float(os.getenv("IMPORT_MAX_UPLOAD_MB", "200")) * 1024 * 1024)
+
+
+import_job_config = ImportJobConfig()
+
+
+class DictionaryHTTPConfig:
+    """上游词典API（Free Dictionary / 有道）的HTTP连接池配置"""
+
+    def __init__(self):
+        self.max_connections: int = int(os.getenv("DICT_HTTP_MAX_CONNECTIONS", "100"))
+        self.max_keepalive_connections: int = int(os.getenv("DICT_HTTP_MAX_KEEPALIVE", "20"))
+        self.keepalive_expiry: float = float(os.getenv("DICT_HTTP_KEEPALIVE_EXPIRY", "30"))
+        self.http2: bool = os.getenv("DICT_HTTP2", "true").lower() == "true"
+        self.connect_timeout: float = float(os.getenv("DICT_HTTP_CONNECT_TIMEOUT", "2.0"))
+        # 各上游的整体超时（秒）
+        self.free_dictionary_timeout: float = float(os.getenv("FREE_DICT_TIMEOUT", "2.0"))
+        self.youdao_timeout: float = float(os.getenv("YOUDAO_TIMEOUT", "3.0"))
+        # 熔断：连续失败N次后快速失败，冷却期后半开探测
+        self.breaker_failure_threshold: int = int(os.getenv("DICT_BREAKER_FAILURE_THRESHOLD", "5"))
+        self.breaker_reset_seconds: float = float(os.getenv("DICT_BREAKER_RESET_SECONDS", "30"))
+        # 词典模块日志级别（留空则沿用全局LOG_LEVEL）与上游完整响应的抽样输出比例（0关闭，1全部）
+        self.log_level: str = os.getenv("DICT_LOG_LEVEL", "")
+        self.payload_log_sample_rate: float = float(os.getenv("DICT_PAYLOAD_LOG_SAMPLE_RATE", "0"))
+
+
+dictionary_http_config = DictionaryHTTPConfig()
+
+
+class OfflineDictionaryConfig:
+    """离线词典配置（内存映射的本地词典文件，由 scripts/build_offline_dictionary.py 生成）"""
+
+    def __init__(self):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        default_path = os.path.join(backend_dir, "data", "offline_dictionary.bin")
+
+        self.enabled: bool = os.getenv("OFFLINE_DICT_ENABLED", "true").lower() == "true"
+        self.path: str = os.getenv("OFFLINE_DICT_PATH", default_path)
+
+
+offline_dictionary_config = OfflineDictionaryConfig()
+
+
+class LemmaTableConfig:
+    """预计算词形还原表配置（由 scripts/build_lemma_table.py 生成）"""
+
+    def __init__(self):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        default_path = os.path.join(backend_dir, "data", "lemma_table.tsv.gz")
+
+        self.enabled: bool = os.getenv("LEMMA_TABLE_ENABLED", "true").lower() == "true"
+        self.path: str = os.getenv("LEMMA_TABLE_PATH", default_path)
+
+
+lemma_table_config = LemmaTableConfig()
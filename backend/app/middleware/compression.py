@@ -0,0 +1,181 @@
+"""
+响应压缩中间件
+- 超过阈值的文本类响应（HTML/JSON/NDJSON等）按客户端 Accept-Encoding 压缩
+- 安装了 brotli 时优先使用 Brotli，否则使用 gzip
+- 已设置 Content-Encoding 的响应（如预压缩的章节HTML）原样透传
+- 流式响应逐块压缩并立即刷出，不影响NDJSON的边查边返回
+"""
+import gzip
+import io
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli为可选依赖
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def parse_accept_encoding(value: str) -> dict:
+    """解析 Accept-Encoding，返回 {编码: q值}"""
+    encodings = {}
+    for part in value.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[token] = q
+    return encodings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """按客户端支持情况选择压缩算法（br优先于gzip）"""
+    accepted = parse_accept_encoding(accept_encoding)
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._buffer = io.BytesIO()
+        self._file = gzip.GzipFile(mode="wb", fileobj=self._buffer, compresslevel=level)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def compress(self, data: bytes) -> bytes:
+        self._file.write(data)
+        self._file.flush()
+        return self._drain()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        self._file.write(data)
+        self._file.close()
+        return self._drain()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """按阈值压缩文本类响应（gzip / 可选Brotli）"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 5) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding)
+        await self.app(scope, receive, responder.wrap(send))
+
+    def create_encoder(self, encoding: str):
+        if encoding == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _CompressionResponder:
+    """单个请求的压缩状态：首个body消息决定是否压缩"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.initial_message: Message = {}
+        self.started = False
+        self.encoder = None
+
+    def wrap(self, send: Send) -> Send:
+        async def send_compressed(message: Message) -> None:
+            await self._send(message, send)
+        return send_compressed
+
+    def _should_compress(self, headers: Headers, body: bytes, more_body: bool) -> bool:
+        if "content-encoding" in headers:
+            return False
+        if not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+            return False
+        # 流式响应无法预知总大小，一律压缩
+        return more_body or len(body) >= self.middleware.minimum_size
+
+    async def _send(self, message: Message, send: Send) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # 等到第一个body再决定是否修改响应头
+            self.initial_message = message
+            return
+        if message_type != "http.response.body":
+            await send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            headers = Headers(raw=self.initial_message["headers"])
+            if not self._should_compress(headers, body, more_body):
+                await send(self.initial_message)
+                await send(message)
+                return
+
+            self.encoder = self.middleware.create_encoder(self.encoding)
+            mutable = MutableHeaders(raw=self.initial_message["headers"])
+            mutable["Content-Encoding"] = self.encoding
+            mutable.add_vary_header("Accept-Encoding")
+            if more_body:
+                del mutable["Content-Length"]
+                message["body"] = self.encoder.compress(body)
+            else:
+                message["body"] = self.encoder.finish(body)
+                mutable["Content-Length"] = str(len(message["body"]))
+            await send(self.initial_message)
+            await send(message)
+            return
+
+        if self.encoder is None:
+            await send(message)
+            return
+        message["body"] = self.encoder.compress(body) if more_body else self.encoder.finish(body)
+        await send(message)
@@ -1,9 +1,14 @@
-from sqlalchemy import create_engine, Column, String, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import (
+    create_engine, event, func, Column, String, Integer, Text, DateTime, ForeignKey, LargeBinary, Index, UniqueConstraint,
+    Boolean, JSON
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 import os
 
+from app.config import SQLiteConfig, sqlite_config
+
 # 数据库路径 - 使用绝对路径确保一致性
 _current_file = os.path.abspath(__file__)
 _backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(_current_file)))
@@ -14,7 +19,33 @@ print(f"Database path: {DB_PATH}")  # 调试信息
 
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+def create_sqlite_engine(url: str, config: SQLiteConfig = sqlite_config):
+    """创建SQLite引擎，并在每个新连接上设置WAL等PRAGMA"""
+    sqlite_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": config.busy_timeout_ms / 1000},
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.pool_timeout,
+    )
+
+    @event.listens_for(sqlite_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA journal_mode={config.journal_mode}")
+            cursor.execute(f"PRAGMA synchronous={config.synchronous}")
+            cursor.execute(f"PRAGMA mmap_size={config.mmap_size}")
+            cursor.execute(f"PRAGMA cache_size={config.cache_size}")
+            cursor.execute(f"PRAGMA busy_timeout={config.busy_timeout_ms}")
+        finally:
+            cursor.close()
+
+    return sqlite_engine
+
+
+engine = create_sqlite_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -35,6 +66,14 @@ class Book(Base):
     epub_path = Column(String)  # EPUB 文件路径
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # 书籍列表按 (created_at, id) 倒序做keyset分页
+        Index("ix_books_created_at_id", "created_at", "id"),
+        Index("ix_books_level_created_at_id", "level", "created_at", "id"),
+        # 重复检测按 lower(trim(title)) 精确比对
+        Index("ix_books_title_normalized", func.lower(func.trim(title))),
+    )
+
     # 关联
     chapters = relationship("Chapter", back_populates="book", cascade="all, delete-orphan")
     vocabulary = relationship("BookVocabulary", back_populates="book", cascade="all, delete-orphan")
@@ -47,12 +86,31 @@ class Chapter(Base):
     book_id = Column(String, ForeignKey("books.id"), nullable=False)
     chapter_number = Column(Integer, nullable=False)
     title = Column(String)
-    content = Column(Text)  # HTML 内容
+    content = Column(Text)  # HTML 内容（旧数据；正文存储开启后为空）
+    content_gzip = Column(LargeBinary)  # 旧版导入时预压缩的HTML（gzip），可为空
+    content_hash = Column(String)  # 正文在 chapter_blobs 中的SHA-256
     word_count = Column(Integer, default=0)  # 章节单词数
 
+    __table_args__ = (
+        # 唯一索引同时覆盖按book_id查目录（按章节号排序）和按章节号取单章
+        UniqueConstraint("book_id", "chapter_number", name="uq_chapters_book_id_chapter_number"),
+        # 删除书籍后判断正文是否仍被其他章节引用
+        Index("ix_chapters_content_hash", "content_hash"),
+    )
+
     book = relationship("Book", back_populates="chapters")
 
 
+class ChapterBlob(Base):
+    """按内容寻址的章节正文（gzip），多个章节可引用同一条"""
+    __tablename__ = "chapter_blobs"
+
+    hash = Column(String, primary_key=True)  # 原始HTML（UTF-8）的SHA-256
+    data = Column(LargeBinary, nullable=False)  # gzip压缩后的HTML
+    size = Column(Integer, nullable=False)  # 原始字节数
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class BookVocabulary(Base):
     __tablename__ = "book_vocabulary"
 
@@ -63,9 +121,42 @@ class BookVocabulary(Base):
     phonetic = Column(String)
     definition = Column(Text)
 
+    __table_args__ = (
+        # 按书籍取高频词：book_id过滤 + frequency倒序，无需排序
+        Index("ix_book_vocabulary_book_id_frequency", "book_id", "frequency"),
+    )
+
     book = relationship("Book", back_populates="vocabulary")
 
 
+class ImportJob(Base):
+    """书籍导入任务（上传后排队，由后台线程池执行）"""
+    __tablename__ = "import_jobs"
+
+    id = Column(String, primary_key=True)
+    status = Column(String, nullable=False, default="queued")  # queued/running/completed/failed/cancelled
+    stage = Column(String)  # 当前阶段：images/chapters/vocabulary/saving/supabase
+    progress = Column(JSON)  # 各阶段进度：{阶段: {"done": n, "total": m}}
+    filename = Column(String)  # 上传时的文件名
+    file_path = Column(String)  # 待导入的EPUB（data/imports/ 下，任务结束后删除）
+    file_sha256 = Column(String)  # 上传文件的SHA-256，用于识别重复上传
+    options = Column(JSON)  # import_epub 的参数（level、lexile、series、category）
+    book_id = Column(String)  # 导入成功后的书籍ID
+    result = Column(JSON)  # 导入成功后的书籍摘要
+    error = Column(Text)
+    cancel_requested = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # 启动时恢复未完成的任务
+        Index("ix_import_jobs_status_created_at", "status", "created_at"),
+        # 按文件哈希查找相同的上传
+        Index("ix_import_jobs_file_sha256", "file_sha256"),
+    )
+
+
 def create_tables():
     Base.metadata.create_all(bind=engine)
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 
@@ -39,6 +39,17 @@ class ChapterResponse(BaseModel):
         from_attributes = True
 
 
+class ChapterSummary(BaseModel):
+    """章节目录项（不含正文HTML，用于书籍详情与章节列表）"""
+    id: str
+    chapter_number: int
+    title: Optional[str] = None
+    word_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+
 class VocabularyResponse(BaseModel):
     id: str
     word: str
@@ -51,7 +62,63 @@ class VocabularyResponse(BaseModel):
 
 
 class BookDetailResponse(BookResponse):
-    chapters: List[ChapterResponse] = []
+    chapters: List[ChapterSummary] = []
+
+
+class SearchBookHit(BaseModel):
+    """全文检索命中的书籍（*_highlight 中匹配词以<mark>标出）"""
+    book_id: str
+    title: str
+    author: Optional[str] = None
+    series: Optional[str] = None
+    cover: Optional[str] = None
+    rank: float
+    title_highlight: Optional[str] = None
+    author_highlight: Optional[str] = None
+    series_highlight: Optional[str] = None
+
+
+class SearchChapterHit(BaseModel):
+    """全文检索命中的章节（snippet 为带<mark>高亮的正文片段）"""
+    book_id: str
+    book_title: str
+    chapter_number: int
+    title: Optional[str] = None
+    rank: float
+    snippet: Optional[str] = None
+
+
+class SearchResponse(BaseModel):
+    """全文检索返回结构，结果按相关度排序"""
+    query: str
+    books: List[SearchBookHit] = []
+    chapters: List[SearchChapterHit] = []
+
+
+class ImportStageProgress(BaseModel):
+    """导入阶段进度（total 为空表示尚未开始）"""
+    done: int = 0
+    total: Optional[int] = None
+
+
+class ImportJobResponse(BaseModel):
+    """书籍导入任务状态
+
+    status: queued / running / completed / failed / cancelled
+    stage: images / chapters / vocabulary / saving / supabase
+    """
+    id: str
+    status: str
+    stage: Optional[str] = None
+    progress: Dict[str, ImportStageProgress] = {}
+    filename: Optional[str] = None
+    book_id: Optional[str] = None
+    book: Optional[Dict[str, Any]] = None  # 导入完成后的书籍摘要
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
 
 class DictionaryResponse(BaseModel):
@@ -63,6 +130,11 @@ class DictionaryResponse(BaseModel):
     lemma: Optional[str] = None  # 还原后的词根
 
 
+class DictionaryBatchRequest(BaseModel):
+    """批量查词请求体（如整章单词或书籍高频词汇）"""
+    words: List[str]
+
+
 class BookDuplicateCheck(BaseModel):
     """书籍重复检测请求体"""
     title: str
@@ -0,0 +1,182 @@
+"""
+章节正文存储
+- 章节HTML以gzip压缩后按SHA-256存入 chapter_blobs 表，chapters 只保存 content_hash
+- 相同内容（如重复导入的同一本书）只存一份；删除章节后回收不再被引用的正文
+- /content 接口通过SQLite增量blob读取流式返回压缩数据，无需整段载入内存
+- 兼容旧数据：content_hash 为空的章节仍从 content / content_gzip 列读取
+"""
+import gzip
+import hashlib
+import logging
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import chapter_store_config
+from app.models.database import engine, Chapter, ChapterBlob
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(html: str) -> str:
+    """正文的内容地址：UTF-8编码后的SHA-256"""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def iter_decompressed(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """逐块解压gzip数据"""
+    decompressor = zlib.decompressobj(wbits=31)
+    for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+class ChapterStore:
+    """按内容寻址的章节正文存储（SQLite chapter_blobs 表）"""
+
+    def __init__(self, enabled: bool = True, gzip_level: int = 9, chunk_size: int = 64 * 1024):
+        self.enabled = enabled
+        self.gzip_level = gzip_level
+        self.chunk_size = chunk_size
+
+    # ==================== 写入 ====================
+
+    def put(self, db: Session, html: str) -> str:
+        """写入正文并返回哈希；内容已存在时不重复写入"""
+        blob_hash = content_hash(html)
+        raw = html.encode("utf-8")
+        db.execute(
+            sqlite_insert(ChapterBlob)
+            .values(hash=blob_hash, data=gzip.compress(raw, compresslevel=self.gzip_level), size=len(raw))
+            .on_conflict_do_nothing(index_elements=["hash"])
+        )
+        return blob_hash
+
+    def content_fields(self, db: Session, html: Optional[str]) -> Dict[str, Any]:
+        """新建 Chapter 时的正文字段：开启存储时写入blob并返回哈希，否则仍写入 content 列"""
+        if not html or not self.enabled:
+            return {"content": html}
+        return {"content": None, "content_hash": self.put(db, html)}
+
+    def set_chapter_html(self, db: Session, chapter: Chapter, html: str) -> None:
+        """替换已有章节的正文，并回收旧正文"""
+        old_hash = chapter.content_hash
+        for name, value in self.content_fields(db, html).items():
+            setattr(chapter, name, value)
+        if not self.enabled:
+            chapter.content_hash = None
+        chapter.content_gzip = None
+        db.flush()
+        if old_hash and old_hash != chapter.content_hash:
+            self.release(db, [old_hash])
+
+    # ==================== 读取 ====================
+
+    def get_gzip(self, db: Session, blob_hash: str) -> Optional[bytes]:
+        return db.query(ChapterBlob.data).filter(ChapterBlob.hash == blob_hash).scalar()
+
+    def chapter_html(self, db: Session, chapter: Any) -> str:
+        """读取章节HTML（chapter 可为 Chapter 或包含同名列的查询行）"""
+        blob_hash = getattr(chapter, "content_hash", None)
+        if blob_hash:
+            data = self.get_gzip(db, blob_hash)
+            if data is not None:
+                return gzip.decompress(data).decode("utf-8")
+            logger.warning(f"⚠️ 章节正文缺失: {blob_hash}")
+        if getattr(chapter, "content", None):
+            return chapter.content
+        if getattr(chapter, "content_gzip", None):
+            return gzip.decompress(chapter.content_gzip).decode("utf-8")
+        return ""
+
+    def find_chapters(self, db: Session, needle: str) -> List[Chapter]:
+        """正文包含指定字符串的章节（旧数据用SQL过滤，章节存储中的正文逐条解压检查）"""
+        chapters = db.query(Chapter).filter(
+            Chapter.content_hash.is_(None), Chapter.content.contains(needle)
+        ).all()
+        encoded = needle.encode("utf-8")
+        hashes = [
+            blob_hash for blob_hash, data in db.query(ChapterBlob.hash, ChapterBlob.data).yield_per(200)
+            if encoded in gzip.decompress(data)
+        ]
+        if hashes:
+            chapters += db.query(Chapter).filter(Chapter.content_hash.in_(hashes)).all()
+        return chapters
+
+    def locate(self, db: Session, blob_hash: str) -> Optional[Tuple[int, int]]:
+        """返回正文的 (rowid, 压缩后字节数)，用于流式读取"""
+        row = db.execute(
+            text("SELECT rowid, length(data) FROM chapter_blobs WHERE hash = :hash"), {"hash": blob_hash}
+        ).first()
+        return (row[0], row[1]) if row else None
+
+    def iter_gzip(self, rowid: int) -> Iterator[bytes]:
+        """按rowid增量读取压缩正文；连接在生成器结束时归还"""
+        conn = engine.raw_connection()
+        try:
+            with conn.driver_connection.blobopen("chapter_blobs", "data", rowid, readonly=True) as blob:
+                while True:
+                    chunk = blob.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            conn.close()
+
+    # ==================== 回收 ====================
+
+    def release(self, db: Session, hashes: Iterable[str]) -> int:
+        """删除不再被任何章节引用的正文，返回删除条数（需在删除章节之后、同一事务内调用）"""
+        hashes = sorted({h for h in hashes if h})
+        if not hashes:
+            return 0
+        referenced = select(Chapter.content_hash).where(Chapter.content_hash.in_(hashes))
+        removed = db.query(ChapterBlob).filter(
+            ChapterBlob.hash.in_(hashes), ChapterBlob.hash.notin_(referenced)
+        ).delete(synchronize_session=False)
+        if removed:
+            logger.info(f"已回收 {removed} 条章节正文")
+        return removed
+
+    def delete_chapters(self, db: Session, book_id: str) -> int:
+        """删除书籍的全部章节并回收其正文，返回删除的章节数"""
+        hashes = [h for (h,) in db.query(Chapter.content_hash).filter(
+            Chapter.book_id == book_id, Chapter.content_hash.isnot(None)
+        )]
+        deleted = db.query(Chapter).filter(Chapter.book_id == book_id).delete(synchronize_session=False)
+        self.release(db, hashes)
+        return deleted
+
+    def collect_garbage(self, db: Session) -> int:
+        """回收全部未被引用的正文（迁移或异常中断后使用）"""
+        referenced = select(Chapter.content_hash).where(Chapter.content_hash.isnot(None))
+        return db.query(ChapterBlob).filter(
+            ChapterBlob.hash.notin_(referenced)
+        ).delete(synchronize_session=False)
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        blobs, raw_bytes, stored_bytes = db.query(
+            func.count(ChapterBlob.hash), func.sum(ChapterBlob.size), func.sum(func.length(ChapterBlob.data))
+        ).one()
+        references = db.query(func.count(Chapter.id)).filter(Chapter.content_hash.isnot(None)).scalar()
+        return {
+            "blobs": blobs,
+            "references": references,
+            "raw_bytes": raw_bytes or 0,
+            "stored_bytes": stored_bytes or 0,
+        }
+
+
+# 全局实例
+chapter_store = ChapterStore(
+    enabled=chapter_store_config.enabled,
+    gzip_level=chapter_store_config.gzip_level,
+    chunk_size=chapter_store_config.chunk_size,
+)
@@ -0,0 +1,87 @@
+"""
+熔断器
+上游连续失败达到阈值后进入打开状态，在冷却期内直接快速失败；
+冷却期结束后进入半开状态，只放行少量探测请求，探测成功则恢复，失败则重新打开
+"""
+import threading
+import time
+from typing import Any, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """单个上游的熔断器"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def _refresh_state(self) -> None:
+        if self._state == OPEN and time.time() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+
+    def allow_request(self) -> bool:
+        """是否放行本次请求；返回False时调用方应直接快速失败"""
+        with self._lock:
+            self._refresh_state()
+            if self._state == OPEN:
+                self._stats["rejected"] += 1
+                return False
+            if self._state == HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    self._stats["rejected"] += 1
+                    return False
+                self._half_open_calls += 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._stats["successes"] += 1
+            self._consecutive_failures = 0
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._stats["failures"] += 1
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._stats["opened"] += 1
+                self._state = OPEN
+                self._opened_at = time.time()
+
+    def release(self) -> None:
+        """放行的请求未得到结果（被取消）：不计成功或失败，只归还半开状态的试探名额"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh_state()
+            return {
+                **self._stats,
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+            }
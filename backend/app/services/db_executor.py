@@ -0,0 +1,71 @@
+"""
+阻塞式数据访问的专用线程池
+supabase-py 与 SQLAlchemy Session 都是同步调用，直接在 async 路由中执行会阻塞事件循环，
+使所有并发请求串行化。数据访问统一通过 run_blocking 派发到有界线程池执行。
+"""
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.config import db_executor_config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_stats: Dict[str, int] = {"submitted": 0, "inline": 0, "active": 0, "max_active": 0}
+
+
+def get_executor() -> Optional[ThreadPoolExecutor]:
+    """懒加载线程池（DB_THREADPOOL_SIZE=0 时返回None）"""
+    global _executor
+    if db_executor_config.threadpool_size <= 0:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=db_executor_config.threadpool_size,
+                    thread_name_prefix="db",
+                )
+    return _executor
+
+
+def _tracked(fn: Callable[[], T]) -> T:
+    with _executor_lock:
+        _stats["active"] += 1
+        _stats["max_active"] = max(_stats["max_active"], _stats["active"])
+    try:
+        return fn()
+    finally:
+        with _executor_lock:
+            _stats["active"] -= 1
+
+
+async def run_blocking(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """在数据库线程池中执行阻塞调用并等待结果"""
+    call = functools.partial(fn, *args, **kwargs)
+    executor = get_executor()
+    if executor is None:
+        _stats["inline"] += 1
+        return call()
+    _stats["submitted"] += 1
+    return await asyncio.get_running_loop().run_in_executor(executor, _tracked, call)
+
+
+def shutdown_executor() -> None:
+    """应用关闭时停止线程池（不等待仍在执行的查询）"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def executor_stats() -> Dict[str, Any]:
+    return {**_stats, "size": db_executor_config.threadpool_size}
@@ -0,0 +1,373 @@
+"""
+词典查询两级缓存
+- 第一级：进程内LRU，按条目数和字节数双重限制
+- 第二级：SQLite持久化（data/dictionary_cache.db），服务重启后可预热
+  写入与删除由后台线程按批提交，调用方（事件循环）只更新内存和待写队列
+- 过期条目在stale窗口内继续保留，供 get_stale 返回旧结果（stale-while-revalidate）
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import dictionary_cache_config
+
+logger = logging.getLogger(__name__)
+
+
+class DictionaryCache:
+    """内存LRU + SQLite持久层的词典缓存"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float, db_path: Optional[str] = None,
+                 stale_seconds: float = 0, flush_interval: float = 0.2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+
+        # key -> (结果, 过期时间戳, 序列化字节数)
+        self._memory: "OrderedDict[str, Tuple[dict, float, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # 尚未写入磁盘的变更：key -> (payload, expire_at)，None 表示删除；以及待删除的key前缀
+        self._pending: "OrderedDict[str, Optional[Tuple[str, float]]]" = OrderedDict()
+        self._pending_prefixes: List[str] = []
+        self._flushing = 0  # 后台线程正在提交的变更数
+        self._writes_cond = threading.Condition(self._lock)
+        self._writer: Optional[threading.Thread] = None
+        self._closing = False
+        self._stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "writes": 0,
+            "evictions": 0,
+            "expired": 0,
+            "disk_errors": 0,
+            "disk_flushes": 0,
+        }
+
+    # ==================== 持久层 ====================
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL：后台线程提交时读取不被阻塞
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _get_conn(self) -> Optional[sqlite3.Connection]:
+        """懒加载SQLite连接（未配置路径时返回None，仅使用内存）"""
+        if not self.db_path:
+            return None
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = self._connect()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS dictionary_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expire_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_dictionary_cache_updated_at "
+                "ON dictionary_cache(updated_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[Tuple[str, float]]:
+        if key in self._pending:
+            return self._pending[key]
+        if any(key.startswith(prefix) for prefix in self._pending_prefixes):
+            return None
+        try:
+            conn = self._get_conn()
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT value, expire_at FROM dictionary_cache WHERE key = ?", (key,)
+            ).fetchone()
+            return (row[0], row[1]) if row else None
+        except sqlite3.Error as e:
+            self._stats["disk_errors"] += 1
+            logger.warning(f"⚠️ 词典缓存读取磁盘失败: {e}")
+            return None
+
+    def _disk_set(self, key: str, payload: str, expire_at: float) -> None:
+        self._enqueue(key, (payload, expire_at))
+
+    def _disk_delete(self, key: str) -> None:
+        self._enqueue(key, None)
+
+    def _enqueue(self, key: str, entry: Optional[Tuple[str, float]]) -> None:
+        """记录待写入磁盘的变更并唤醒后台线程（调用方持有 self._lock）"""
+        if not self.db_path or self._closing:
+            return
+        self._pending.pop(key, None)
+        self._pending[key] = entry
+        self._start_writer()
+        self._writes_cond.notify_all()
+
+    def _start_writer(self) -> None:
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, name="dictionary-cache-writer", daemon=True)
+            self._writer.start()
+
+    def _writer_loop(self) -> None:
+        """后台线程：攒够 flush_interval 内的变更后在一个事务中提交"""
+        conn: Optional[sqlite3.Connection] = None
+        while True:
+            with self._lock:
+                while not (self._pending or self._pending_prefixes or self._closing):
+                    self._writes_cond.wait()
+                if self._closing and not (self._pending or self._pending_prefixes):
+                    break
+            if not self._closing:
+                time.sleep(self.flush_interval)
+
+            with self._lock:
+                batch, self._pending = self._pending, OrderedDict()
+                prefixes, self._pending_prefixes = self._pending_prefixes, []
+                self._flushing = len(batch) + len(prefixes)
+            try:
+                if conn is None:
+                    self._get_conn()  # 确保表已创建
+                    conn = self._connect()
+                self._write_batch(conn, batch, prefixes)
+            except sqlite3.Error as e:
+                with self._lock:
+                    self._stats["disk_errors"] += 1
+                logger.warning(f"⚠️ 词典缓存写入磁盘失败（{len(batch)} 条）: {e}")
+            finally:
+                with self._lock:
+                    self._flushing = 0
+                    self._stats["disk_flushes"] += 1
+                    self._writes_cond.notify_all()
+        if conn is not None:
+            conn.close()
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, batch: "OrderedDict[str, Optional[Tuple[str, float]]]",
+                     prefixes: List[str]) -> None:
+        now = time.time()
+        with conn:
+            # 前缀删除之前写入的key已从待写队列中移除，先删前缀再写入即可保持顺序
+            for prefix in prefixes:
+                escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                conn.execute("DELETE FROM dictionary_cache WHERE key LIKE ? ESCAPE '\\'", (escaped + "%",))
+            deletes = [(key,) for key, entry in batch.items() if entry is None]
+            if deletes:
+                conn.executemany("DELETE FROM dictionary_cache WHERE key = ?", deletes)
+            rows = [(key, entry[0], entry[1], now) for key, entry in batch.items() if entry is not None]
+            if rows:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO dictionary_cache (key, value, expire_at, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows
+                )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待已提交给后台线程的变更全部写入磁盘，返回是否在超时前完成"""
+        with self._lock:
+            if self._writer is None:
+                return True
+            self._writes_cond.notify_all()
+            return self._writes_cond.wait_for(
+                lambda: not (self._pending or self._pending_prefixes or self._flushing), timeout
+            )
+
+    # ==================== 内存层 ====================
+
+    def _memory_put(self, key: str, value: dict, expire_at: float, size: int) -> None:
+        """写入内存LRU并按限制淘汰最久未使用的条目"""
+        self._memory_remove(key)
+        if size > self.max_bytes:
+            # 单条结果超过内存上限时只保留在磁盘
+            return
+        self._memory[key] = (value, expire_at, size)
+        self._memory_bytes += size
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._stats["evictions"] += 1
+
+    def _memory_remove(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry:
+            self._memory_bytes -= entry[2]
+
+    # ==================== 对外接口 ====================
+
+    def _lookup(self, key: str) -> Optional[Tuple[dict, float]]:
+        """查找未超出stale窗口的条目，返回(结果, 过期时间戳)；彻底过期的条目顺带删除"""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry:
+            value, expire_at, _ = entry
+            if now < expire_at + self.stale_seconds:
+                self._memory.move_to_end(key)
+                return value, expire_at
+            self._memory_remove(key)
+            self._stats["expired"] += 1
+
+        disk_entry = self._disk_get(key)
+        if disk_entry:
+            payload, expire_at = disk_entry
+            if now < expire_at + self.stale_seconds:
+                value = json.loads(payload)
+                self._memory_put(key, value, expire_at, len(payload.encode("utf-8")))
+                return value, expire_at
+            self._disk_delete(key)
+            self._stats["expired"] += 1
+        return None
+
+    def get(self, key: str) -> Optional[dict]:
+        """读取未过期的缓存：先查内存，再查磁盘（命中后提升到内存）"""
+        with self._lock:
+            in_memory = key in self._memory
+            found = self._lookup(key)
+            if found and time.time() < found[1]:
+                self._stats["memory_hits" if in_memory else "disk_hits"] += 1
+                return found[0]
+            self._stats["misses"] += 1
+            return None
+
+    def get_stale(self, key: str) -> Optional[dict]:
+        """读取已过期但仍在stale窗口内的缓存，调用方应在后台刷新"""
+        with self._lock:
+            found = self._lookup(key)
+            if found is None:
+                return None
+            self._stats["stale_hits"] += 1
+            return found[0]
+
+    def set(self, key: str, value: dict, ttl_seconds: Optional[float] = None) -> None:
+        """写入缓存（内存与磁盘同时写入）"""
+        payload = json.dumps(value, ensure_ascii=False)
+        expire_at = time.time() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            self._memory_put(key, value, expire_at, len(payload.encode("utf-8")))
+            self._disk_set(key, payload, expire_at)
+            self._stats["writes"] += 1
+
+    def delete(self, key: str) -> None:
+        """删除指定缓存"""
+        with self._lock:
+            self._memory_remove(key)
+            self._disk_delete(key)
+
+    def delete_prefix(self, prefix: str) -> int:
+        """删除指定前缀的全部缓存，返回内存中删除的条目数"""
+        with self._lock:
+            keys = [key for key in self._memory if key.startswith(prefix)]
+            for key in keys:
+                self._memory_remove(key)
+            if self.db_path and not self._closing:
+                for key in [key for key in self._pending if key.startswith(prefix)]:
+                    del self._pending[key]
+                self._pending_prefixes.append(prefix)
+                self._start_writer()
+                self._writes_cond.notify_all()
+            return len(keys)
+
+    def warm_start(self, limit: Optional[int] = None) -> int:
+        """启动时清理过期记录，并将最近写入的条目加载到内存"""
+        limit = self.max_entries if limit is None else min(limit, self.max_entries)
+        if limit <= 0:
+            return 0
+
+        with self._lock:
+            try:
+                conn = self._get_conn()
+                if conn is None:
+                    return 0
+                now = time.time()
+                conn.execute(
+                    "DELETE FROM dictionary_cache WHERE expire_at <= ?", (now - self.stale_seconds,)
+                )
+                conn.commit()
+                rows = conn.execute(
+                    "SELECT key, value, expire_at FROM dictionary_cache "
+                    "ORDER BY updated_at DESC LIMIT ?",
+                    (limit,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                self._stats["disk_errors"] += 1
+                logger.warning(f"⚠️ 词典缓存预热失败: {e}")
+                return 0
+
+            # 倒序写入，使最近写入的条目位于LRU尾部（最后被淘汰）
+            loaded = 0
+            for key, payload, expire_at in reversed(rows):
+                try:
+                    value = json.loads(payload)
+                except ValueError:
+                    continue
+                self._memory_put(key, value, expire_at, len(payload.encode("utf-8")))
+                loaded += 1
+            return loaded
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计信息"""
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            lookups = hits + self._stats["misses"]
+            disk_entries = None
+            try:
+                conn = self._get_conn()
+                if conn is not None:
+                    disk_entries = conn.execute("SELECT COUNT(*) FROM dictionary_cache").fetchone()[0]
+            except sqlite3.Error:
+                self._stats["disk_errors"] += 1
+
+            return {
+                **self._stats,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "stale_seconds": self.stale_seconds,
+                "disk_entries": disk_entries,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        """写入剩余变更后关闭磁盘连接"""
+        with self._lock:
+            self._closing = True
+            self._writes_cond.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+        with self._lock:
+            self._writer = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# 全局实例
+dictionary_cache = DictionaryCache(
+    max_entries=dictionary_cache_config.max_entries,
+    max_bytes=dictionary_cache_config.max_bytes,
+    ttl_seconds=dictionary_cache_config.ttl_hours * 3600,
+    db_path=dictionary_cache_config.db_path if dictionary_cache_config.persist else None,
+    stale_seconds=dictionary_cache_config.stale_hours * 3600,
+    flush_interval=dictionary_cache_config.flush_interval,
+)
+
+# 否定缓存：记录两个上游都确认查不到的词，仅保存在内存中，过期时间较短
+negative_cache = DictionaryCache(
+    max_entries=dictionary_cache_config.negative_max_entries,
+    max_bytes=dictionary_cache_config.negative_max_entries * 256,
+    ttl_seconds=dictionary_cache_config.negative_ttl_minutes * 60,
+)
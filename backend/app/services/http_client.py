@@ -0,0 +1,70 @@
+"""
+上游词典API共享HTTP客户端
+应用启动时创建一个长生命周期的 httpx.AsyncClient，复用连接池，
+避免每次查询都重新进行DNS解析、TCP与TLS握手
+"""
+import logging
+from typing import Optional
+
+import httpx
+
+from app.config import dictionary_http_config
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """HTTP/2依赖h2库（httpx[http2]），未安装时退回HTTP/1.1"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """按配置创建带连接池的异步客户端"""
+    config = dictionary_http_config
+    http2 = config.http2 and _http2_available()
+    if config.http2 and not http2:
+        logger.warning("⚠️ 未安装h2库，词典HTTP客户端使用HTTP/1.1（pip install 'httpx[http2]'）")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            max(config.free_dictionary_timeout, config.youdao_timeout),
+            connect=config.connect_timeout,
+        ),
+    )
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """应用启动时调用，创建共享客户端"""
+    global _client
+    if _client is None:
+        _client = create_http_client()
+        logger.info(f"✅ 词典HTTP客户端已创建 (max_connections={dictionary_http_config.max_connections})")
+    return _client
+
+
+async def close_http_client() -> None:
+    """应用关闭时调用，释放连接池"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """获取共享客户端（未经启动钩子初始化时懒加载，便于脚本直接调用）"""
+    global _client
+    if _client is None:
+        _client = create_http_client()
+    return _client
@@ -0,0 +1,337 @@
+"""
+书籍异步导入任务
+- 上传接口只保存文件并创建任务（持久化在 import_jobs 表），立即返回任务ID；相同文件不重复导入
+- 任务由独立线程池执行 import_epub，不占用请求使用的数据库线程池
+- 按阶段（图片、章节、词汇、写库、Supabase同步）记录进度，供 GET /api/books/imports/{job_id} 查询
+- 写库提交前可取消：已上传的图片由 import_epub 清理，不会留下半本书
+- 服务重启后，未完成的任务重新排队
+"""
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import import_job_config
+from app.models.database import DB_PATH, SessionLocal, Book, Chapter, ImportJob
+from app.services.upload_receiver import ReceivedUpload
+
+logger = logging.getLogger(__name__)
+
+# 导入阶段（与 import_epub 的进度回调一致）
+STAGES = ("images", "chapters", "vocabulary", "saving", "supabase")
+# 写库提交后的阶段不再响应取消
+CANCELLABLE_STAGES = {"images", "chapters", "vocabulary", "saving"}
+ACTIVE_STATUSES = ("queued", "running")
+
+IMPORTS_DIR = os.path.join(os.path.dirname(DB_PATH), "imports")
+
+
+class ImportCancelled(Exception):
+    """导入任务已被取消"""
+
+
+def _empty_progress() -> Dict[str, Dict[str, Optional[int]]]:
+    return {stage: {"done": 0, "total": None} for stage in STAGES}
+
+
+def _job_dict(job: ImportJob) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress or _empty_progress(),
+        "filename": job.filename,
+        "book_id": job.book_id,
+        "book": job.result,
+        "error": job.error,
+        "cancel_requested": bool(job.cancel_requested),
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def book_summary(book_id: str) -> Optional[Dict[str, Any]]:
+    """导入完成后的书籍摘要（与旧版上传接口返回的 book 字段一致）"""
+    db = SessionLocal()
+    try:
+        book = db.query(Book).filter(Book.id == book_id).first()
+        if book is None:
+            return None
+        chapter_count = db.query(func.count(Chapter.id)).filter(Chapter.book_id == book_id).scalar()
+        return {
+            "id": book.id,
+            "title": book.title,
+            "author": book.author,
+            "level": book.level,
+            "lexile": book.lexile,
+            "series": book.series,
+            "category": book.category,
+            "word_count": book.word_count,
+            "chapter_count": chapter_count,
+        }
+    finally:
+        db.close()
+
+
+class ImportJobQueue:
+    """持久化在SQLite中的导入任务队列"""
+
+    def __init__(self, workers: int = 2, progress_interval: float = 0.5, jobs_dir: str = IMPORTS_DIR):
+        self.workers = max(1, workers)
+        self.progress_interval = progress_interval
+        self.jobs_dir = jobs_dir
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._cancelled: Set[str] = set()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="import")
+        return self._executor
+
+    # ==================== 任务管理（阻塞调用，路由中通过 run_blocking 执行） ====================
+
+    def create(self, upload: ReceivedUpload, options: Dict[str, Any]) -> Dict[str, Any]:
+        """将已接收的上传文件移入任务目录并创建排队中的任务（调用方随后 submit）"""
+        job_id = str(uuid.uuid4())
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        # 保留原文件名：EPUB缺少标题元数据时 import_epub 以文件名作为书名
+        file_path = os.path.join(job_dir, upload.filename)
+        try:
+            # 上传文件已写入 jobs_dir 下的临时文件，同一文件系统内移动无需复制
+            os.replace(upload.path, file_path)
+
+            db = SessionLocal()
+            try:
+                job = ImportJob(
+                    id=job_id,
+                    status="queued",
+                    progress=_empty_progress(),
+                    filename=upload.filename,
+                    file_path=file_path,
+                    file_sha256=upload.sha256,
+                    options=options,
+                )
+                db.add(job)
+                db.commit()
+                return _job_dict(job)
+            finally:
+                db.close()
+        except Exception:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+    def find_duplicate(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """相同文件的导入任务：排队/执行中的任务，或书籍仍存在的已完成任务"""
+        db = SessionLocal()
+        try:
+            jobs = (
+                db.query(ImportJob)
+                .filter(ImportJob.file_sha256 == sha256, ImportJob.status.in_(ACTIVE_STATUSES + ("completed",)))
+                .order_by(ImportJob.created_at.desc())
+                .all()
+            )
+            for job in jobs:
+                if job.status in ACTIVE_STATUSES:
+                    return _job_dict(job)
+                if db.query(Book.id).filter(Book.id == job.book_id).first():
+                    return _job_dict(job)
+            return None
+        finally:
+            db.close()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        db = SessionLocal()
+        try:
+            job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            return _job_dict(job) if job else None
+        finally:
+            db.close()
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """取消任务：排队中的直接取消，执行中的在下一个检查点中止（写库提交后不再生效）"""
+        db = SessionLocal()
+        try:
+            # 按状态条件更新，避免与工作线程领取任务（_claim）竞争
+            cancelled = db.query(ImportJob).filter(
+                ImportJob.id == job_id, ImportJob.status == "queued"
+            ).update(
+                {"status": "cancelled", "cancel_requested": True, "finished_at": datetime.utcnow()},
+                synchronize_session=False,
+            )
+            requested = 0
+            if not cancelled:
+                requested = db.query(ImportJob).filter(
+                    ImportJob.id == job_id, ImportJob.status == "running"
+                ).update({"cancel_requested": True}, synchronize_session=False)
+                if requested:
+                    self._cancelled.add(job_id)
+            db.commit()
+
+            job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            if job is None:
+                return None
+            if cancelled:
+                self._remove_file(job.file_path)
+                logger.info(f"🛑 导入任务已取消（排队中）: {job_id}")
+            elif requested:
+                logger.info(f"🛑 请求取消导入任务: {job_id} (阶段: {job.stage})")
+            return _job_dict(job)
+        finally:
+            db.close()
+
+    def submit(self, job_id: str) -> None:
+        self._get_executor().submit(self._run, job_id)
+
+    def recover(self) -> int:
+        """服务启动时重新排队未完成的任务，返回排队数"""
+        db = SessionLocal()
+        try:
+            jobs = (
+                db.query(ImportJob)
+                .filter(ImportJob.status.in_(ACTIVE_STATUSES))
+                .order_by(ImportJob.created_at)
+                .all()
+            )
+            requeued = []
+            for job in jobs:
+                saved = (job.progress or {}).get("saving", {}).get("done")
+                if job.stage == "supabase" or saved:
+                    # 已写入本地数据库，重新导入会产生重复书籍
+                    self._finish(db, job, "failed", error="服务重启时中断，书籍已写入本地数据库但后续步骤未完成")
+                    self._remove_file(job.file_path)
+                elif job.cancel_requested or not job.file_path or not os.path.exists(job.file_path):
+                    self._finish(db, job, "cancelled" if job.cancel_requested else "failed",
+                                 error=None if job.cancel_requested else "上传的文件已丢失")
+                    self._remove_file(job.file_path)
+                else:
+                    job.status = "queued"
+                    job.stage = None
+                    job.progress = _empty_progress()
+                    requeued.append(job.id)
+            db.commit()
+        finally:
+            db.close()
+
+        for job_id in requeued:
+            self.submit(job_id)
+        if requeued:
+            logger.info(f"🔁 重新排队未完成的导入任务: {len(requeued)} 个")
+        return len(requeued)
+
+    def shutdown(self) -> None:
+        """应用关闭时停止线程池；执行中的任务在下次启动时重新排队"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    # ==================== 执行 ====================
+
+    def _claim(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """将排队中的任务标记为执行中（已取消或已被领取时返回None）"""
+        db = SessionLocal()
+        try:
+            claimed = db.query(ImportJob).filter(
+                ImportJob.id == job_id, ImportJob.status == "queued"
+            ).update({"status": "running", "started_at": datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            if not claimed:
+                return None
+            job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+            return {"file_path": job.file_path, "options": job.options or {}}
+        finally:
+            db.close()
+
+    def _progress_callback(self, job_id: str) -> Callable[[str, int, int], None]:
+        progress = _empty_progress()
+        state = {"stage": None, "flushed": 0.0}
+
+        def report(stage: str, done: int, total: int) -> None:
+            # 每步开始前检查取消（done == total 表示阶段结束，或写库已提交）
+            if job_id in self._cancelled and stage in CANCELLABLE_STAGES and done < total:
+                raise ImportCancelled(f"导入任务已取消（阶段: {stage}）")
+
+            progress[stage] = {"done": done, "total": total}
+            now = time.monotonic()
+            if stage != state["stage"] or done >= total or now - state["flushed"] >= self.progress_interval:
+                state["stage"] = stage
+                state["flushed"] = now
+                try:
+                    self._update(job_id, stage=stage, progress={k: dict(v) for k, v in progress.items()})
+                except SQLAlchemyError as e:
+                    # 进度写入失败不影响导入本身
+                    logger.warning(f"⚠️ 导入进度写入失败: {e}")
+
+        return report
+
+    def _run(self, job_id: str) -> None:
+        claimed = self._claim(job_id)
+        if claimed is None:
+            return
+
+        from scripts.import_book import import_epub
+
+        logger.info(f"📥 开始导入任务: {job_id}")
+        status, fields = "failed", {}
+        try:
+            book_id = import_epub(claimed["file_path"], progress=self._progress_callback(job_id), **claimed["options"])
+            status, fields = "completed", {"book_id": book_id, "result": book_summary(book_id)}
+            logger.info(f"✅ 导入任务完成: {job_id} -> {book_id}")
+        except ImportCancelled:
+            status = "cancelled"
+            logger.info(f"🛑 导入任务已取消: {job_id}")
+        except Exception as e:
+            fields = {"error": str(e)}
+            logger.error(f"❌ 导入任务失败: {job_id}: {e}")
+        finally:
+            self._cancelled.discard(job_id)
+            self._remove_file(claimed["file_path"])
+            db = SessionLocal()
+            try:
+                job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+                self._finish(db, job, status, **fields)
+                db.commit()
+            except SQLAlchemyError as e:
+                logger.error(f"❌ 导入任务状态写入失败: {job_id}: {e}")
+            finally:
+                db.close()
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        db = SessionLocal()
+        try:
+            db.query(ImportJob).filter(ImportJob.id == job_id).update(fields, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _finish(db, job: ImportJob, status: str, **fields: Any) -> None:
+        job.status = status
+        job.finished_at = datetime.utcnow()
+        for name, value in fields.items():
+            setattr(job, name, value)
+
+    @staticmethod
+    def _remove_file(file_path: Optional[str]) -> None:
+        if file_path:
+            shutil.rmtree(os.path.dirname(file_path), ignore_errors=True)
+
+
+# 全局实例
+import_jobs = ImportJobQueue(
+    workers=import_job_config.workers,
+    progress_interval=import_job_config.progress_interval,
+)
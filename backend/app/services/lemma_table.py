@@ -0,0 +1,83 @@
+"""
+预计算词形还原表
+构建阶段对书库中出现过的所有单词执行一次词形还原，结果保存为 gzip 压缩的TSV：
+    word<TAB>lemma     （lemma为空表示原形即词根）
+运行时整表加载到内存，查询为一次字典访问；表中没有的单词再回退到WordNet
+"""
+import gzip
+import logging
+import os
+from typing import Dict, List, Mapping, Optional
+
+from app.config import lemma_table_config
+
+logger = logging.getLogger(__name__)
+
+
+def write_lemma_table(path: str, mapping: Mapping[str, str]) -> int:
+    """写入词形还原表（先写临时文件再原子替换），返回条目数"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for word in sorted(mapping):
+            lemma = mapping[word]
+            f.write(f"{word}\t{'' if lemma == word else lemma}\n")
+    os.replace(tmp_path, path)
+    return len(mapping)
+
+
+class LemmaTable:
+    """内存中的词形还原表"""
+
+    def __init__(self, path: str, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self._table: Dict[str, str] = {}
+        self._loaded = False
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def load(self) -> int:
+        """加载词形还原表，文件不存在时为空表"""
+        self._loaded = True
+        if not self.enabled or not os.path.exists(self.path):
+            return 0
+
+        table: Dict[str, str] = {}
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    word, _, lemma = line.rstrip("\n").partition("\t")
+                    if word:
+                        table[word] = lemma or word
+        except (OSError, EOFError) as e:
+            logger.warning(f"⚠️ 词形还原表加载失败: {e}")
+            return 0
+
+        self._table = table
+        logger.info(f"✅ 词形还原表已加载: {len(table)} 个单词")
+        return len(table)
+
+    def get(self, word: str) -> Optional[str]:
+        """查询词根，未收录返回None（调用方回退到WordNet）"""
+        if not self._loaded:
+            self.load()
+        lemma = self._table.get(word)
+        if lemma is None:
+            self._stats["misses"] += 1
+        else:
+            self._stats["hits"] += 1
+        return lemma
+
+    def words(self) -> List[str]:
+        """已收录的全部单词（按字母序）"""
+        return sorted(self._table)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "entries": len(self._table)}
+
+
+# 全局实例
+lemma_table = LemmaTable(lemma_table_config.path, enabled=lemma_table_config.enabled)
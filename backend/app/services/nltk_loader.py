@@ -0,0 +1,74 @@
+"""
+NLTK懒加载
+nltk及WordNet语料导入较慢，且首次部署时可能需要下载语料。
+应用导入阶段不再加载NLTK，而是由启动后的后台预热任务加载；预热完成前，接口的词形还原
+只使用不规则变化表和预计算的词形还原表（脚本直接调用 get_lemmatizer 时同步加载）。
+"""
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 词形还原所需的NLTK语料：(查找路径, 下载包名)
+NLTK_RESOURCES = [
+    ("corpora/wordnet", "wordnet"),
+    ("corpora/omw-1.4", "omw-1.4"),
+    ("taggers/averaged_perceptron_tagger", "averaged_perceptron_tagger"),
+]
+
+_lemmatizer = None
+_lock = threading.Lock()
+_download_attempted = False
+
+
+def ensure_nltk_data() -> None:
+    """检查NLTK语料，缺失时下载（仅首次需要，约5MB；每个进程只尝试下载一次）"""
+    global _download_attempted
+    import nltk
+
+    missing = []
+    for path, package in NLTK_RESOURCES:
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(package)
+
+    if not missing or _download_attempted:
+        return
+    _download_attempted = True
+
+    logger.info(f"⏬ 正在下载NLTK数据: {', '.join(missing)}")
+    for package in missing:
+        nltk.download(package, quiet=True)
+
+
+def get_lemmatizer():
+    """获取WordNet词形还原器，首次调用时加载语料（线程安全）"""
+    global _lemmatizer
+    if _lemmatizer is None:
+        with _lock:
+            if _lemmatizer is None:
+                ensure_nltk_data()
+                from nltk.stem import WordNetLemmatizer
+
+                lemmatizer = WordNetLemmatizer()
+                # WordNet语料在首次lemmatize时才真正加载，这里提前触发
+                lemmatizer.lemmatize("warming", pos="v")
+                _lemmatizer = lemmatizer
+    return _lemmatizer
+
+
+def loaded_lemmatizer():
+    """已加载完成的词形还原器；尚未加载、正在加载或加载失败时返回None（不加锁，可在事件循环中调用）"""
+    return _lemmatizer
+
+
+def warm_up() -> Optional[str]:
+    """预热NLTK（供后台任务调用），失败时返回错误信息"""
+    try:
+        get_lemmatizer()
+        return None
+    except Exception as e:
+        logger.warning(f"⚠️ NLTK预热失败，词形还原将仅使用不规则变化表和预计算表: {e}")
+        return str(e)
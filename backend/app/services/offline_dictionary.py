@@ -0,0 +1,167 @@
+"""
+离线词典引擎
+将常用词的词典结果保存为紧凑的二进制文件，通过mmap懒加载并二分查找，
+查询无需网络，耗时在微秒级
+
+文件格式（小端序）：
+    header:  magic(8s) | 条目数(uint32) | 索引区偏移(uint64)
+    数据区:  每个条目的 zlib 压缩 JSON
+    记录区:  key长度(uint16) | 数据偏移(uint64) | 数据长度(uint32) | key(utf-8)
+    索引区:  按key字节序排列的记录偏移数组(uint64 × 条目数)
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.config import offline_dictionary_config
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ERDICT01"
+HEADER = struct.Struct("<8sIQ")
+RECORD_HEAD = struct.Struct("<HQI")
+POSITION = struct.Struct("<Q")
+
+
+def write_offline_dictionary(path: str, entries: Dict[str, dict]) -> int:
+    """将词典条目写入离线词典文件（先写临时文件再原子替换），返回条目数"""
+    keys = sorted(entries, key=lambda k: k.encode("utf-8"))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))  # 占位，最后回填
+
+        data_refs: Dict[str, Tuple[int, int]] = {}
+        for key in keys:
+            payload = json.dumps(entries[key], ensure_ascii=False, separators=(",", ":"))
+            blob = zlib.compress(payload.encode("utf-8"), 9)
+            data_refs[key] = (f.tell(), len(blob))
+            f.write(blob)
+
+        positions = []
+        for key in keys:
+            key_bytes = key.encode("utf-8")
+            positions.append(f.tell())
+            f.write(RECORD_HEAD.pack(len(key_bytes), *data_refs[key]))
+            f.write(key_bytes)
+
+        index_offset = f.tell()
+        for position in positions:
+            f.write(POSITION.pack(position))
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(keys), index_offset))
+
+    os.replace(tmp_path, path)
+    return len(keys)
+
+
+class OfflineDictionary:
+    """只读离线词典，首次查询时加载"""
+
+    def __init__(self, path: str, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self._mm: Optional[mmap.mmap] = None
+        self._count = 0
+        self._index_offset = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def _ensure_loaded(self) -> bool:
+        """懒加载：文件不存在或格式错误时视为空词典"""
+        if self._loaded:
+            return self._mm is not None
+
+        with self._lock:
+            if self._loaded:
+                return self._mm is not None
+            self._loaded = True
+
+            if not self.enabled or not os.path.exists(self.path) or os.path.getsize(self.path) < HEADER.size:
+                return False
+
+            try:
+                with open(self.path, "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, count, index_offset = HEADER.unpack_from(mm, 0)
+                if magic != MAGIC:
+                    mm.close()
+                    logger.warning(f"⚠️ 离线词典文件格式不正确: {self.path}")
+                    return False
+                self._mm = mm
+                self._count = count
+                self._index_offset = index_offset
+                logger.info(f"✅ 离线词典已加载: {count} 个词条")
+                return True
+            except (OSError, struct.error) as e:
+                logger.warning(f"⚠️ 离线词典加载失败: {e}")
+                return False
+
+    def _record_at(self, i: int) -> Tuple[bytes, int, int]:
+        position = POSITION.unpack_from(self._mm, self._index_offset + i * POSITION.size)[0]
+        key_len, data_offset, data_len = RECORD_HEAD.unpack_from(self._mm, position)
+        key_start = position + RECORD_HEAD.size
+        return self._mm[key_start:key_start + key_len], data_offset, data_len
+
+    def _decode(self, data_offset: int, data_len: int) -> dict:
+        return json.loads(zlib.decompress(self._mm[data_offset:data_offset + data_len]))
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """按归一化后的单词查询，未收录返回None"""
+        if not self._ensure_loaded():
+            return None
+
+        target = key.encode("utf-8")
+        low, high = 0, self._count - 1
+        while low <= high:
+            mid = (low + high) // 2
+            mid_key, data_offset, data_len = self._record_at(mid)
+            if mid_key == target:
+                self._stats["hits"] += 1
+                return self._decode(data_offset, data_len)
+            if mid_key < target:
+                low = mid + 1
+            else:
+                high = mid - 1
+
+        self._stats["misses"] += 1
+        return None
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        """遍历全部词条（构建工具合并已有数据时使用）"""
+        if not self._ensure_loaded():
+            return
+        for i in range(self._count):
+            key, data_offset, data_len = self._record_at(i)
+            yield key.decode("utf-8"), self._decode(data_offset, data_len)
+
+    def reload(self) -> None:
+        """文件重建后重新加载"""
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+            self._mm = None
+            self._count = 0
+            self._loaded = False
+
+    def __len__(self) -> int:
+        return self._count if self._ensure_loaded() else 0
+
+    def stats(self) -> Dict[str, int]:
+        """返回查询统计（未加载时不触发加载）"""
+        return {**self._stats, "entries": self._count, "loaded": self._mm is not None}
+
+
+# 全局实例
+offline_dictionary = OfflineDictionary(
+    offline_dictionary_config.path,
+    enabled=offline_dictionary_config.enabled,
+)
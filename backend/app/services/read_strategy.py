@@ -0,0 +1,181 @@
+"""
+书籍读取的数据源策略与延迟统计
+按 BOOKS_READ_STRATEGY 决定 Supabase 与本地SQLite的查询顺序（或同时查询），
+并按数据源记录延迟直方图，便于按部署环境选择最快的策略
+"""
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import books_read_config
+from app.models.database import SessionLocal
+from app.services.db_executor import run_blocking
+from app.utils.supabase_client import supabase_client
+
+logger = logging.getLogger(__name__)
+
+# 直方图桶上界（毫秒），最后一个桶收录其余全部
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """固定桶的延迟直方图（线程安全）"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._outcomes: Dict[str, int] = {"ok": 0, "empty": 0, "error": 0}
+        self._total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, outcome: str) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, elapsed_ms)] += 1
+            self._outcomes[outcome] += 1
+            self._total_ms += elapsed_ms
+
+    def _percentile(self, counts: List[int], total: int, pct: float) -> Optional[float]:
+        """按桶上界估算百分位（落在最后一个桶时返回None，表示超过最大桶）"""
+        target = total * pct / 100
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else None
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = sum(counts)
+            labels = [f"le_{bound}ms" for bound in self.buckets] + [f"gt_{self.buckets[-1]}ms"]
+            return {
+                "count": total,
+                **self._outcomes,
+                "mean_ms": round(self._total_ms / total, 2) if total else None,
+                "p50_ms": self._percentile(counts, total, 50) if total else None,
+                "p95_ms": self._percentile(counts, total, 95) if total else None,
+                "p99_ms": self._percentile(counts, total, 99) if total else None,
+                "buckets": dict(zip(labels, counts)),
+            }
+
+
+read_latency: Dict[str, LatencyHistogram] = {
+    "supabase": LatencyHistogram(),
+    "sqlite": LatencyHistogram(),
+}
+
+
+def _timed_read(source: str, read: Callable[[], Any], is_usable: Callable[[Any], bool]) -> Any:
+    """执行一次读取并记录延迟；异常原样抛出"""
+    start = time.perf_counter()
+    try:
+        result = read()
+    except Exception:
+        read_latency[source].record((time.perf_counter() - start) * 1000, "error")
+        raise
+    outcome = "ok" if is_usable(result) else "empty"
+    read_latency[source].record((time.perf_counter() - start) * 1000, outcome)
+    return result
+
+
+async def read_with_strategy(
+    supabase_read: Callable[[], Any],
+    local_read: Callable[[Session], Any],
+    db: Session,
+    is_usable: Callable[[Any], bool] = bool,
+) -> Any:
+    """按配置的策略读取数据
+
+    任一数据源返回可用结果即返回；都不可用时以本地SQLite的结果为准
+    （包括其抛出的404等HTTPException）。Supabase异常只记录日志。
+    两个读取函数都是阻塞调用，在数据库线程池中执行；local_read 接收要使用的Session。
+    """
+    if not supabase_client.enabled:
+        return await run_blocking(_timed_read, "sqlite", lambda: local_read(db), is_usable)
+
+    if books_read_config.strategy == "race":
+        return await _race(supabase_read, local_read, is_usable)
+
+    order = [("supabase", supabase_read), ("sqlite", lambda: local_read(db))]
+    if books_read_config.strategy == "local_first":
+        order.reverse()
+
+    local_outcome: Optional[Tuple[Any, Optional[Exception]]] = None
+    for source, read in order:
+        try:
+            result = await run_blocking(_timed_read, source, read, is_usable)
+        except Exception as e:
+            if source == "sqlite":
+                local_outcome = (None, e)
+            else:
+                logger.error(f"⚠️ Supabase查询失败，回退到SQLite: {e}")
+            continue
+        if is_usable(result):
+            return result
+        if source == "sqlite":
+            local_outcome = (result, None)
+
+    return _resolve_local(local_outcome)
+
+
+def _with_own_session(local_read: Callable[[Session], Any]) -> Any:
+    """使用独立的Session执行本地读取
+
+    竞速时先返回的可能是Supabase，本地查询仍在线程池中继续执行；
+    请求的Session在响应后即被关闭且不是线程安全的，不能与之共用
+    """
+    db = SessionLocal()
+    try:
+        return local_read(db)
+    finally:
+        db.close()
+
+
+async def _race(supabase_read: Callable[[], Any], local_read: Callable[[Session], Any],
+                is_usable: Callable[[Any], bool]) -> Any:
+    """同时查询两个数据源，返回先得到的可用结果（另一个查询在后台线程中自然结束）"""
+    reads = (("supabase", supabase_read), ("sqlite", lambda: _with_own_session(local_read)))
+    tasks = {
+        asyncio.ensure_future(run_blocking(_timed_read, source, read, is_usable)): source
+        for source, read in reads
+    }
+    local_outcome: Optional[Tuple[Any, Optional[Exception]]] = None
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            source = tasks[task]
+            error = task.exception()
+            if error is None and is_usable(task.result()):
+                for other in pending:
+                    other.add_done_callback(lambda t: t.cancelled() or t.exception())
+                return task.result()
+            if source == "sqlite":
+                local_outcome = (None if error else task.result(), error)
+            elif error is not None:
+                logger.error(f"⚠️ Supabase查询失败: {error}")
+    return _resolve_local(local_outcome)
+
+
+def _resolve_local(local_outcome: Optional[Tuple[Any, Optional[Exception]]]) -> Any:
+    if local_outcome is None:
+        return None
+    result, error = local_outcome
+    if error is not None:
+        raise error
+    return result
+
+
+def read_latency_stats() -> Dict[str, Any]:
+    """当前策略与各数据源的延迟统计"""
+    return {
+        "strategy": books_read_config.strategy,
+        "supabase_enabled": supabase_client.enabled,
+        "sources": {source: histogram.snapshot() for source, histogram in read_latency.items()},
+    }
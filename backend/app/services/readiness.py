@@ -0,0 +1,47 @@
+"""
+服务就绪状态
+启动时较慢的初始化步骤（如NLTK预热）在后台执行，各步骤在此登记完成情况，
+供 /ready 端点判断服务是否已完成预热
+"""
+import time
+from typing import Any, Dict, Optional
+
+
+class Readiness:
+    """记录各启动组件的预热状态：pending / ready / failed"""
+
+    def __init__(self):
+        self._started_at = time.time()
+        self._components: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, name: str) -> None:
+        self._components[name] = {"status": "pending", "elapsed_ms": None, "error": None}
+
+    def mark_ready(self, name: str) -> None:
+        self._finish(name, "ready", None)
+
+    def mark_failed(self, name: str, error: str) -> None:
+        self._finish(name, "failed", error)
+
+    def _finish(self, name: str, status: str, error: Optional[str]) -> None:
+        self._components[name] = {
+            "status": status,
+            "elapsed_ms": round((time.time() - self._started_at) * 1000),
+            "error": error,
+        }
+
+    @property
+    def ready(self) -> bool:
+        """所有组件都已结束预热（失败的组件以降级模式运行，不阻塞就绪）"""
+        return all(c["status"] != "pending" for c in self._components.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "degraded": any(c["status"] == "failed" for c in self._components.values()),
+            "components": dict(self._components),
+        }
+
+
+# 全局实例
+readiness = Readiness()
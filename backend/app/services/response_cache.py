@@ -0,0 +1,90 @@
+"""
+书籍读取接口的响应缓存
+章节内容在导入后不再变化，GET结果按书籍/章节缓存序列化后的JSON与ETag：
+- 进程内LRU（可选SQLite持久层），复用 DictionaryCache 的两级存储
+- 支持 If-None-Match 返回304，并设置 Cache-Control 供浏览器/CDN复用
+- 删除书籍时按书籍ID前缀失效（导入只会产生新的书籍ID，不会使已有缓存过期）
+"""
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from app.config import response_cache_config
+from app.services.dictionary_cache import DictionaryCache
+
+logger = logging.getLogger(__name__)
+
+
+def book_key(book_id: str, *parts: Any) -> str:
+    """缓存key：book:{id}:{parts...}，同一本书的key共享前缀便于整体失效"""
+    return ":".join(["book", book_id, *(str(part) for part in parts)])
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ResponseCache:
+    """以JSON字符串 + ETag 缓存GET响应"""
+
+    def __init__(self, store: DictionaryCache, max_age: int, enabled: bool = True):
+        self.store = store
+        self.max_age = max_age
+        self.enabled = enabled
+        self._stats: Dict[str, int] = {"not_modified": 0, "invalidations": 0}
+
+    def get(self, key: str) -> Optional[dict]:
+        """返回缓存的 {"body", "etag"}，未命中返回None"""
+        if not self.enabled:
+            return None
+        return self.store.get(key)
+
+    def put(self, key: str, content: Any, cacheable: bool = True) -> dict:
+        """序列化响应内容并写入缓存（未启用或cacheable为False时只序列化）"""
+        body = json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":"))
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+        entry = {"body": body, "etag": etag}
+        if self.enabled and cacheable:
+            self.store.set(key, entry)
+        return entry
+
+    def respond(self, request: Request, entry: dict) -> Response:
+        """根据 If-None-Match 返回304或完整响应"""
+        headers = {
+            "ETag": entry["etag"],
+            "Cache-Control": f"public, max-age={self.max_age}",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            self._stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+    def invalidate_book(self, book_id: str) -> None:
+        """书籍被删除时清除其全部缓存"""
+        self.store.delete_prefix(book_key(book_id, ""))
+        self._stats["invalidations"] += 1
+        logger.info(f"已清除书籍响应缓存: {book_id}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.store.stats(), **self._stats, "enabled": self.enabled}
+
+
+# 全局实例
+response_cache = ResponseCache(
+    DictionaryCache(
+        max_entries=response_cache_config.max_entries,
+        max_bytes=response_cache_config.max_bytes,
+        ttl_seconds=response_cache_config.ttl_hours * 3600,
+        db_path=response_cache_config.db_path if response_cache_config.persist else None,
+    ),
+    max_age=response_cache_config.max_age,
+    enabled=response_cache_config.enabled,
+)
@@ -0,0 +1,134 @@
+"""
+书籍全文检索（SQLite FTS5）
+- books_fts：书名、作者、系列
+- chapters_fts：章节标题与纯文本正文
+由 import_epub 写入、删除书籍时清理；scripts/rebuild_search_index.py 可从现有数据全量重建。
+查询使用bm25排序，每个词都按前缀匹配，并返回高亮片段。
+"""
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.database import engine
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[\w']+", re.UNICODE)
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# bm25 列权重：书名 > 作者 > 系列
+BOOK_WEIGHTS = (10.0, 5.0, 3.0)
+CHAPTER_WEIGHTS = (4.0, 1.0)
+
+_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5("
+    "book_id UNINDEXED, title, author, series, "
+    "tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chapters_fts USING fts5("
+    "book_id UNINDEXED, chapter_number UNINDEXED, title, body, "
+    "tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3')",
+)
+
+_ready = False
+
+
+def ensure_search_index(conn: Optional[Connection] = None) -> bool:
+    """创建FTS5虚拟表（SQLite未编译FTS5时返回False，检索功能不可用）"""
+    global _ready
+    if _ready and conn is None:
+        return True
+    try:
+        if conn is None:
+            with engine.begin() as own_conn:
+                for statement in _SCHEMA:
+                    own_conn.execute(text(statement))
+        else:
+            for statement in _SCHEMA:
+                conn.execute(text(statement))
+        _ready = True
+    except Exception as e:
+        logger.warning(f"⚠️ 全文索引不可用（SQLite未启用FTS5？）: {e}")
+    return _ready
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """将用户输入转换为FTS5查询：每个词加引号（避免语法错误）并按前缀匹配，词之间为AND"""
+    tokens = [token.replace('"', '') for token in TOKEN_PATTERN.findall(query)]
+    tokens = [token for token in tokens if token.strip("'")]
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def index_book(conn: Connection, book_id: str, title: str, author: Optional[str], series: Optional[str],
+               chapters: Iterable[Tuple[int, Optional[str], str]]) -> None:
+    """写入（或覆盖）一本书的索引；chapters 为 (章节号, 标题, 纯文本) 序列"""
+    if not ensure_search_index(conn):
+        return
+    remove_book(conn, book_id)
+    conn.execute(
+        text("INSERT INTO books_fts (book_id, title, author, series) VALUES (:book_id, :title, :author, :series)"),
+        {"book_id": book_id, "title": title or "", "author": author or "", "series": series or ""},
+    )
+    rows = [
+        {"book_id": book_id, "chapter_number": number, "title": chapter_title or "", "body": body or ""}
+        for number, chapter_title, body in chapters
+    ]
+    if rows:
+        conn.execute(
+            text("INSERT INTO chapters_fts (book_id, chapter_number, title, body) "
+                 "VALUES (:book_id, :chapter_number, :title, :body)"),
+            rows,
+        )
+
+
+def remove_book(conn: Connection, book_id: str) -> None:
+    """删除一本书的全部索引"""
+    if not ensure_search_index(conn):
+        return
+    conn.execute(text("DELETE FROM books_fts WHERE book_id = :book_id"), {"book_id": book_id})
+    conn.execute(text("DELETE FROM chapters_fts WHERE book_id = :book_id"), {"book_id": book_id})
+
+
+def search(query: str, limit: int = 20, chapter_limit: int = 20,
+           bind: Optional[Engine] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """检索书籍与章节，结果按bm25相关度排序（rank越小越相关）"""
+    match = build_match_query(query)
+    if match is None or not ensure_search_index():
+        return {"books": [], "chapters": []}
+
+    # 先只按bm25取前N条（不计算高亮），再对这N条逐行回表生成高亮/片段：
+    # 常见词会命中大量文档，若在排序前对全部命中行调用snippet()，耗时约翻倍
+    with (bind or engine).connect() as conn:
+        books = conn.execute(text(
+            "WITH top AS ("
+            f"SELECT rowid AS fts_rowid, bm25(books_fts, 0, {', '.join(map(str, BOOK_WEIGHTS))}) AS rank "
+            "FROM books_fts WHERE books_fts MATCH :match ORDER BY rank LIMIT :limit) "
+            "SELECT f.book_id, b.title, b.author, b.series, b.cover, top.rank, "
+            f"highlight(books_fts, 1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}') AS title_highlight, "
+            f"highlight(books_fts, 2, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}') AS author_highlight, "
+            f"highlight(books_fts, 3, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}') AS series_highlight "
+            "FROM top CROSS JOIN books_fts f ON f.rowid = top.fts_rowid JOIN books b ON b.id = f.book_id "
+            "WHERE books_fts MATCH :match ORDER BY top.rank"
+        ), {"match": match, "limit": limit}).mappings().all()
+
+        chapters = []
+        if chapter_limit > 0:
+            chapters = conn.execute(text(
+                "WITH top AS ("
+                f"SELECT rowid AS fts_rowid, bm25(chapters_fts, 0, 0, {', '.join(map(str, CHAPTER_WEIGHTS))}) AS rank "
+                "FROM chapters_fts WHERE chapters_fts MATCH :match ORDER BY rank LIMIT :limit) "
+                "SELECT f.book_id, b.title AS book_title, f.chapter_number, f.title, top.rank, "
+                f"snippet(chapters_fts, 3, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 16) AS snippet "
+                "FROM top CROSS JOIN chapters_fts f ON f.rowid = top.fts_rowid JOIN books b ON b.id = f.book_id "
+                "WHERE chapters_fts MATCH :match ORDER BY top.rank"
+            ), {"match": match, "limit": chapter_limit}).mappings().all()
+
+    return {
+        "books": [dict(row) for row in books],
+        "chapters": [dict(row) for row in chapters],
+    }
@@ -0,0 +1,46 @@
+"""
+请求合并（single-flight）
+同一key的并发请求只执行一次底层调用，其余请求等待共享结果
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """按key合并并发中的异步调用"""
+
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self._stats: Dict[str, int] = {
+            "executions": 0,  # 实际执行的底层调用次数
+            "coalesced": 0,   # 被合并、直接复用他人结果的请求数
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """执行fn；若相同key的调用正在进行，则等待其结果
+
+        底层调用运行在独立的Task中，发起者断开连接（被取消）不会影响其他等待者。
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.get_running_loop().create_task(self._run(key, fn))
+        # 所有等待者都被取消时，避免出现"exception was never retrieved"警告
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        self._stats["executions"] += 1
+        return await asyncio.shield(task)
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        try:
+            return await fn()
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """返回合并统计"""
+        return {**self._stats, "in_flight": len(self._inflight)}
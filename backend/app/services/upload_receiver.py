@@ -0,0 +1,203 @@
+"""
+EPUB上传的流式接收
+- 直接解析请求体（multipart/form-data），文件分块写入磁盘，不在内存中保留整个文件
+- 边接收边计算SHA-256，用于识别重复上传
+- 超过大小上限立即返回413；文件开头不是ZIP签名（EPUB为ZIP格式）立即返回415，不再读取剩余请求体
+"""
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Dict, List, Optional
+
+from fastapi import Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.services.db_executor import run_blocking
+
+ZIP_MAGIC = b"PK\x03\x04"
+# 普通表单字段（lexile、series等）的大小与数量上限
+MAX_FIELD_BYTES = 4096
+MAX_FIELDS = 20
+# multipart边界与各部分头部的余量，用于按Content-Length提前拒绝
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadRejected(Exception):
+    """上传请求不合法（由路由转换为对应状态码的HTTPException）"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class ReceivedUpload:
+    """已写入磁盘的上传文件及其表单字段"""
+
+    def __init__(self, filename: str, path: str, size: int, sha256: str, fields: Dict[str, str]):
+        self.filename = filename
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.fields = fields
+
+    def discard(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class _EpubPartReceiver:
+    """multipart解析回调：文件字段写入临时文件，其余字段保存在内存中"""
+
+    def __init__(self, dest_dir: str, max_bytes: int, file_field: str, extension: str):
+        self.dest_dir = dest_dir
+        self.max_bytes = max_bytes
+        self.file_field = file_field
+        self.extension = extension
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.path: Optional[str] = None
+        self.size = 0
+        self.hasher = hashlib.sha256()
+        # 每次 parser.write 产生的文件数据，由 receive_epub 在线程池中写入
+        self.pending: List[bytes] = []
+        self._file: Optional[BinaryIO] = None
+        self._head = b""
+        self._sniffed = False
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._part_name: Optional[str] = None
+        self._part_is_file = False
+        self._part_data = bytearray()
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._part_name = None
+        self._part_is_file = False
+        self._part_data = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if b"name" not in options:
+            raise UploadRejected(400, "表单字段缺少名称")
+        self._part_name = options[b"name"].decode("utf-8", errors="replace")
+        if self._part_name != self.file_field:
+            if len(self.fields) >= MAX_FIELDS:
+                raise UploadRejected(400, "表单字段过多")
+            return
+
+        filename = options.get(b"filename", b"").decode("utf-8", errors="replace")
+        if self.filename is not None:
+            raise UploadRejected(400, "一次只能上传一个文件")
+        if not filename.lower().endswith(self.extension):
+            raise UploadRejected(400, "只支持EPUB格式的文件")
+        self.filename = os.path.basename(filename.replace("\\", "/"))
+        self._part_is_file = True
+        fd, self.path = tempfile.mkstemp(suffix=".upload", dir=self.dest_dir)
+        self._file = os.fdopen(fd, "wb")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        if not self._part_is_file:
+            if len(self._part_data) + len(chunk) > MAX_FIELD_BYTES:
+                raise UploadRejected(400, f"表单字段 {self._part_name} 过长")
+            self._part_data.extend(chunk)
+            return
+
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadRejected(413, f"文件超过大小上限（{self.max_bytes // (1024 * 1024)}MB）")
+        if not self._sniffed:
+            self._head += chunk[:len(ZIP_MAGIC)]
+            if len(self._head) >= len(ZIP_MAGIC):
+                if not self._head.startswith(ZIP_MAGIC):
+                    raise UploadRejected(415, "文件内容不是有效的EPUB（ZIP）格式")
+                self._sniffed = True
+        self.pending.append(chunk)
+
+    def on_part_end(self) -> None:
+        if self._part_is_file:
+            if not self._sniffed:
+                raise UploadRejected(415, "文件内容不是有效的EPUB（ZIP）格式")
+        elif self._part_name is not None:
+            self.fields[self._part_name] = self._part_data.decode("utf-8", errors="replace")
+
+    def flush(self) -> None:
+        """写入并哈希累积的文件数据（在线程池中执行）"""
+        data = b"".join(self.pending)
+        self.pending.clear()
+        if data:
+            self.hasher.update(data)
+            self._file.write(data)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def cleanup(self) -> None:
+        self.close()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+async def receive_epub(request: Request, dest_dir: str, max_bytes: int, file_field: str = "file") -> ReceivedUpload:
+    """流式接收上传的EPUB，返回写入 dest_dir 的临时文件；请求不合法时抛出 UploadRejected"""
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadRejected(400, "请求必须为multipart/form-data格式")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD:
+        raise UploadRejected(413, f"文件超过大小上限（{max_bytes // (1024 * 1024)}MB）")
+
+    os.makedirs(dest_dir, exist_ok=True)
+    receiver = _EpubPartReceiver(dest_dir, max_bytes, file_field, ".epub")
+    parser = MultipartParser(params[b"boundary"], receiver.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if receiver.pending:
+                await run_blocking(receiver.flush)
+        parser.finalize()
+        if receiver.filename is None:
+            raise UploadRejected(400, "缺少上传文件")
+        receiver.close()
+    except UploadRejected:
+        receiver.cleanup()
+        raise
+    except Exception as e:
+        receiver.cleanup()
+        raise UploadRejected(400, f"上传请求解析失败：{e}") from e
+
+    return ReceivedUpload(
+        filename=receiver.filename,
+        path=receiver.path,
+        size=receiver.size,
+        sha256=receiver.hasher.hexdigest(),
+        fields=receiver.fields,
+    )
@@ -4,7 +4,7 @@ Supabase客户端封装
 """
 import os
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -13,6 +13,9 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# 章节目录只需要的列（不含正文content，避免打开书籍详情时下载整本书）
+CHAPTER_SUMMARY_COLUMNS = 'id,chapter_number,title,word_count'
+
 
 class SupabaseClient:
     """Supabase客户端单例"""
@@ -91,9 +94,9 @@ class SupabaseClient:
             if not book_data:
                 return None
 
-            # 同步查询章节并附带到返回结果，避免前端目录缺失
+            # 同步查询章节目录并附带到返回结果，避免前端目录缺失
             chapters_result = self.client.table('chapters')\
-                .select('*')\
+                .select(CHAPTER_SUMMARY_COLUMNS)\
                 .eq('book_id', book_id)\
                 .order('chapter_number')\
                 .execute()
@@ -104,25 +107,63 @@ class SupabaseClient:
             logger.error(f"获取书籍失败: {e}")
             return None
 
-    def list_books(self, level: Optional[str] = None, search: Optional[str] = None) -> List[Dict[str, Any]]:
-        """获取书籍列表"""
+    def list_books(
+        self,
+        level: Optional[str] = None,
+        search: Optional[str] = None,
+        columns: str = '*',
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """获取书籍列表（按 created_at,id 倒序）
+
+        Args:
+            columns: 需要返回的列，逗号分隔
+            limit: 返回条数上限，None表示全部
+            after: 分页游标 (created_at, id)，只返回排在其后的书籍
+        """
         if not self.enabled:
             return []
 
         try:
-            query = self.client.table('books').select('*')
+            query = self.client.table('books').select(columns)
 
             if level:
                 query = query.eq('level', level)
             if search:
                 query = query.ilike('title', f'%{search}%')
-
-            result = query.order('created_at', desc=True).execute()
+            if after:
+                created_at, book_id = after
+                query = query.or_(
+                    f'created_at.lt."{created_at}",'
+                    f'and(created_at.eq."{created_at}",id.lt."{book_id}")'
+                )
+
+            query = query.order('created_at', desc=True).order('id', desc=True)
+            if limit is not None:
+                query = query.limit(limit)
+            result = query.execute()
             return result.data
         except Exception as e:
             logger.error(f"获取书籍列表失败: {e}")
             return []
 
+    def count_books(self, level: Optional[str] = None, search: Optional[str] = None) -> Optional[int]:
+        """统计符合条件的书籍总数（只返回计数，不返回数据）"""
+        if not self.enabled:
+            return None
+
+        try:
+            query = self.client.table('books').select('id', count='exact', head=True)
+            if level:
+                query = query.eq('level', level)
+            if search:
+                query = query.ilike('title', f'%{search}%')
+            return query.execute().count
+        except Exception as e:
+            logger.error(f"统计书籍数量失败: {e}")
+            return None
+
     def delete_book(self, book_id: str) -> bool:
         """删除书籍"""
         if not self.enabled:
@@ -164,13 +205,13 @@ class SupabaseClient:
             return False
 
     def get_chapters(self, book_id: str) -> List[Dict[str, Any]]:
-        """获取书籍的所有章节"""
+        """获取书籍的章节目录（不含正文，正文通过 get_chapter 按章获取）"""
         if not self.enabled:
             return []
 
         try:
             result = self.client.table('chapters')\
-                .select('*')\
+                .select(CHAPTER_SUMMARY_COLUMNS)\
                 .eq('book_id', book_id)\
                 .order('chapter_number')\
                 .execute()
@@ -5,7 +5,9 @@
 import sys
 from collections import defaultdict
 
-from app.models.database import SessionLocal, Book, Chapter, BookVocabulary
+from app.models.database import SessionLocal, Book, BookVocabulary
+from app.services import search_index
+from app.services.chapter_store import chapter_store
 from app.utils.oss_helper import oss_helper
 
 def clean_duplicates():
@@ -57,11 +59,14 @@ def clean_duplicates():
                 book_id = book.id
 
                 # 删除章节
-                db.query(Chapter).filter(Chapter.book_id == book_id).delete()
+                chapter_store.delete_chapters(db, book_id)
 
                 # 删除词汇
                 db.query(BookVocabulary).filter(BookVocabulary.book_id == book_id).delete()
 
+                # 删除全文索引
+                search_index.remove_book(db.connection(), book_id)
+
                 # 如果是OSS图片，删除OSS资源
                 if book.cover and book.cover.startswith('https://'):
                     if oss_helper.enabled:
@@ -1,17 +1,35 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+import asyncio
+import logging
 import os
-import nltk
 from dotenv import load_dotenv
 
 # 加载.env文件中的环境变量
 load_dotenv()
 
+# 应用日志（uvicorn只配置自身的logger，应用模块的日志需要在这里接入）
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+
 from app.api import books, dictionary, admin
 from app.models.database import create_tables
+from app.services.search_index import ensure_search_index
 from app.utils.oss_helper import oss_helper
-from app.config import oss_config
+from app.config import oss_config, dictionary_cache_config, compression_config
+from app.middleware.compression import CompressionMiddleware
+from app.services.db_executor import shutdown_executor
+from app.services.dictionary_cache import dictionary_cache
+from app.services.import_jobs import import_jobs
+from app.services.response_cache import response_cache
+from app.services.http_client import start_http_client, close_http_client
+from app.services.lemma_table import lemma_table
+from app.services import nltk_loader
+from app.services.readiness import readiness
 
 app = FastAPI(title="English Reading App API", version="1.0.0")
 
@@ -28,8 +46,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],  # 书籍列表分页信息
 )
 
+# 响应压缩（章节HTML、书籍列表等较大的文本响应）
+if compression_config.enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=compression_config.minimum_size,
+        gzip_level=compression_config.gzip_level,
+        brotli_quality=compression_config.brotli_quality,
+    )
+
 # 静态文件服务（书籍封面等）
 data_path = os.path.join(os.path.dirname(__file__), "data")
 if os.path.exists(data_path):
@@ -40,10 +68,29 @@ app.include_router(books.router, prefix="/api/books", tags=["books"])
 app.include_router(dictionary.router, prefix="/api/dictionary", tags=["dictionary"])
 app.include_router(admin.router, prefix="/api", tags=["admin"])
 
+# 后台任务引用，防止任务被垃圾回收
+_background_tasks: set = set()
+
+
+async def _warm_up_nltk():
+    """后台加载NLTK语料和WordNet词形还原器"""
+    error = await asyncio.to_thread(nltk_loader.warm_up)
+    if error:
+        readiness.mark_failed("nltk", error)
+    else:
+        readiness.mark_ready("nltk")
+        print("✅ NLTK数据已就绪")
+
 @app.on_event("startup")
 async def startup():
     """应用启动时初始化"""
     create_tables()
+    ensure_search_index()
+
+    # 重新排队上次关闭时未完成的导入任务
+    requeued = import_jobs.recover()
+    if requeued:
+        print(f"📥 重新排队导入任务: {requeued} 个")
 
     # 显示OSS配置状态
     print("\n" + "="*50)
@@ -63,23 +110,41 @@ async def startup():
             print("   图片将保存到: backend/data/images/")
     print("="*50 + "\n")
 
-    # 下载 NLTK 数据（词形还原所需）
-    # 这些数据用于将词形变化还原为原形，如 running → run, went → go
-    # 只在首次启动时下载，之后会使用缓存
-    try:
-        nltk.data.find('corpora/wordnet')
-        nltk.data.find('corpora/omw-1.4')
-        nltk.data.find('taggers/averaged_perceptron_tagger')
-        print("✅ NLTK数据已就绪")
-    except LookupError:
-        print("⏬ 正在下载NLTK数据（仅首次需要，约5MB）...")
-        nltk.download('wordnet', quiet=True)
-        nltk.download('omw-1.4', quiet=True)
-        nltk.download('averaged_perceptron_tagger', quiet=True)
-        print("✅ NLTK数据下载完成")
+    # 词典缓存预热：从磁盘加载最近的查询结果，避免部署后集中请求上游
+    warmed = dictionary_cache.warm_start(dictionary_cache_config.warm_entries)
+    print(f"📚 词典缓存预热完成: {warmed} 条")
+
+    # 创建上游词典API共享连接池
+    await start_http_client()
+
+    # 加载预计算的词形还原表
+    lemma_count = lemma_table.load()
+    print(f"🔤 词形还原表: {lemma_count} 个单词")
+
+    # NLTK 数据（词形还原所需）在后台预热，不阻塞服务启动
+    # 首次部署时会下载语料；预热完成前（或预热失败时）词形还原只使用不规则变化表和预计算的词形还原表
+    readiness.register("nltk")
+    task = asyncio.create_task(_warm_up_nltk())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+@app.on_event("shutdown")
+async def shutdown():
+    """应用关闭时释放资源"""
+    await close_http_client()
+    dictionary_cache.close()
+    response_cache.store.close()
+    shutdown_executor()
+    import_jobs.shutdown()
 
 @app.get("/")
 @app.head("/")
 async def root():
     """健康检查端点，支持GET和HEAD请求（用于UptimeRobot等监控服务）"""
     return {"message": "English Reading App API"}
+
+@app.get("/ready")
+async def ready():
+    """就绪检查端点：后台预热（NLTK等）全部结束后返回200，否则返回503"""
+    snapshot = readiness.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
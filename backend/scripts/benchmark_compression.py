@@ -0,0 +1,127 @@
+"""
+章节响应压缩基准测试：对比同一章节在以下方式下的传输字节数与服务端耗时
+- identity：不压缩（客户端不接受压缩）
+- on-the-fly：JSON章节接口，由压缩中间件每次请求时压缩
+- precompressed：/content 接口直接流式返回章节存储中的gzip正文
+
+在本地SQLite中临时写入一本测试书籍，结束后删除
+用法:
+    python benchmark_compression.py --kb 60 --requests 300
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.database import SessionLocal, create_tables, Book, Chapter  # noqa: E402
+from app.services.chapter_store import chapter_store  # noqa: E402
+from app.services.response_cache import response_cache  # noqa: E402
+from app.utils.supabase_client import supabase_client  # noqa: E402
+from main import app  # noqa: E402
+
+VOCABULARY = (
+    "the a and to of he she said was it in his her they you that for on with as at "
+    "Annie Jack tree house ladder rope branches wooden little looked pointed climbed "
+    "wind books window magic dinosaur castle knight ocean forest river moon night"
+).split()
+
+
+def make_html(size_kb: int) -> str:
+    """生成接近真实章节的HTML（随机词序，避免重复段落带来过高的压缩率）"""
+    rng = random.Random(42)
+    paragraphs = []
+    size = 0
+    while size < size_kb * 1024:
+        sentence = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(40, 80)))
+        paragraph = f'<p class="text">{sentence.capitalize()}.</p>\n'
+        paragraphs.append(paragraph)
+        size += len(paragraph)
+    return "".join(paragraphs)
+
+
+def seed_book(size_kb: int) -> str:
+    book_id = f"bench-{uuid.uuid4()}"
+    html = make_html(size_kb)
+    db = SessionLocal()
+    try:
+        db.add(Book(id=book_id, title="Compression Benchmark"))
+        db.add(Chapter(
+            id=str(uuid.uuid4()), book_id=book_id, chapter_number=1, title="Chapter 1",
+            word_count=len(html.split()), **chapter_store.content_fields(db, html),
+        ))
+        db.commit()
+    finally:
+        db.close()
+    return book_id
+
+
+def remove_book(book_id: str):
+    db = SessionLocal()
+    try:
+        chapter_store.delete_chapters(db, book_id)
+        db.query(Book).filter(Book.id == book_id).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+async def measure(client: httpx.AsyncClient, path: str, accept_encoding: str, requests: int):
+    """返回 (传输字节数, 平均耗时ms, p95耗时ms, Content-Encoding)"""
+    latencies = []
+    response = None
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get(path, headers={"Accept-Encoding": accept_encoding})
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    latencies.sort()
+    wire_bytes = int(response.headers.get("content-length", len(response.content)))
+    return (wire_bytes, statistics.mean(latencies), latencies[int(len(latencies) * 0.95) - 1],
+            response.headers.get("content-encoding", "identity"))
+
+
+async def run(book_id: str, requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        chapter = f"/api/books/{book_id}/chapters/1"
+        cases = [
+            ("identity (JSON)", chapter, "identity"),
+            ("on-the-fly gzip (JSON)", chapter, "gzip"),
+            ("identity (/content)", f"{chapter}/content", "identity"),
+            ("precompressed (/content)", f"{chapter}/content", "gzip"),
+        ]
+        return [(name, *await measure(client, path, accept, requests)) for name, path, accept in cases]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark chapter response compression')
+    parser.add_argument('--kb', type=int, default=60, help='Chapter HTML size in KB')
+    parser.add_argument('--requests', type=int, default=300, help='Requests per case')
+    args = parser.parse_args()
+
+    supabase_client._enabled = False  # 只测本地数据
+    response_cache.enabled = False  # 每次请求都读取数据库，只比较压缩方式
+    create_tables()
+    book_id = seed_book(args.kb)
+    try:
+        results = asyncio.run(run(book_id, args.requests))
+    finally:
+        remove_book(book_id)
+
+    print(f"章节HTML: {args.kb}KB  每种方式请求 {args.requests} 次")
+    print(f"{'方式':<28}{'编码':>10}{'传输(KB)':>10}{'mean(ms)':>10}{'p95(ms)':>10}")
+    for name, wire_bytes, mean_ms, p95_ms, encoding in results:
+        print(f"{name:<28}{encoding:>10}{wire_bytes / 1024:>10.1f}{mean_ms:>10.2f}{p95_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+SQLite读写并发基准测试：导入书籍（大事务写入）期间的章节读取延迟
+分别在临时数据库中测试：
+- baseline：原有配置（rollback journal、synchronous=FULL、无mmap）
+- tuned：当前 SQLITE_* 配置（默认WAL + synchronous=NORMAL）
+读线程持续按 (book_id, chapter_number) 读取章节；写入在独立进程中模拟 import_epub 依次写入若干本书
+（与API进程和导入脚本分属不同进程的实际情况一致，也避免GIL干扰读延迟）
+
+用法:
+    python benchmark_db_concurrency.py
+    python benchmark_db_concurrency.py --readers 8 --imports 5 --chapters 200 --kb 20
+"""
+import argparse
+import copy
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import sqlite_config  # noqa: E402
+from app.models.database import Base, Book, Chapter, create_sqlite_engine  # noqa: E402
+
+
+def baseline_config():
+    """未调优前的连接参数（SQLite与pysqlite默认值）"""
+    config = copy.copy(sqlite_config)
+    config.journal_mode = "DELETE"
+    config.synchronous = "FULL"
+    config.mmap_size = 0
+    config.cache_size = -2000
+    return config
+
+
+def make_book(book_id: str, chapters: int, html: str):
+    book = Book(id=book_id, title=f"Book {book_id[:8]}", author="Bench")
+    rows = [
+        Chapter(id=str(uuid.uuid4()), book_id=book_id, chapter_number=number,
+                title=f"Chapter {number}", content=html, word_count=len(html) // 6)
+        for number in range(1, chapters + 1)
+    ]
+    return book, rows
+
+
+def import_books(url: str, config, imports: int, chapters: int, html: str, results) -> None:
+    """写入进程：每本书一个事务，与 import_epub 相同"""
+    engine = create_sqlite_engine(url, config)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    results.put("ready")
+    for _ in range(imports):
+        started = time.perf_counter()
+        session = Session()
+        book, rows = make_book(str(uuid.uuid4()), chapters, html)
+        session.add(book)
+        session.add_all(rows)
+        session.commit()
+        session.close()
+        results.put(time.perf_counter() - started)
+    engine.dispose()
+
+
+def run_case(name: str, config, args, html: str) -> dict:
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_sqlite_engine(url, config)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        Base.metadata.create_all(bind=engine)
+
+        # 读线程读取的书籍
+        session = Session()
+        book, rows = make_book("reader-book", args.chapters, html)
+        session.add(book)
+        session.add_all(rows)
+        session.commit()
+        session.close()
+
+        stop = threading.Event()
+        writing = threading.Event()
+        latencies, errors = [], []
+        lock = threading.Lock()
+
+        def reader(seed: int):
+            rng = random.Random(seed)
+            session = Session()
+            while not stop.is_set():
+                number = rng.randint(1, args.chapters)
+                started = time.perf_counter()
+                try:
+                    session.query(Chapter.content).filter(
+                        Chapter.book_id == "reader-book", Chapter.chapter_number == number
+                    ).first()
+                    elapsed = (time.perf_counter() - started) * 1000
+                    if writing.is_set():
+                        with lock:
+                            latencies.append(elapsed)
+                except OperationalError as e:
+                    with lock:
+                        errors.append(str(e.orig))
+                    session.rollback()
+            session.close()
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.3)
+
+        # 读线程运行中fork可能继承被占用的锁，使用spawn启动写入进程
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        writer = context.Process(
+            target=import_books, args=(url, config, args.imports, args.chapters, html, queue)
+        )
+        writer.start()
+        queue.get()  # 等待写入进程完成导入模块等启动开销
+        writing.set()
+        window_started = time.perf_counter()
+        import_times = [queue.get() for _ in range(args.imports)]
+        writer.join()
+        writing.clear()
+        window = time.perf_counter() - window_started
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    latencies.sort()
+    return {
+        "name": name,
+        "journal": config.journal_mode,
+        "reads": len(latencies),
+        "reads_per_s": len(latencies) / window,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0,
+        "max": latencies[-1] if latencies else 0.0,
+        "errors": len(errors),
+        "import_s": statistics.mean(import_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark chapter reads during a book import')
+    parser.add_argument('--readers', type=int, default=8, help='Concurrent reader threads')
+    parser.add_argument('--imports', type=int, default=5, help='Books written during the run')
+    parser.add_argument('--chapters', type=int, default=200, help='Chapters per book')
+    parser.add_argument('--kb', type=int, default=20, help='Chapter HTML size in KB')
+    parser.add_argument('--dir', default=None, help='Directory for the temporary databases (use the data disk)')
+    args = parser.parse_args()
+
+    html = "<p>" + "tree house magic " * (args.kb * 1024 // 17) + "</p>"
+    results = [
+        run_case("baseline", baseline_config(), args, html),
+        run_case("tuned", sqlite_config, args, html),
+    ]
+
+    print(f"读线程 {args.readers} 个，导入 {args.imports} 本书 × {args.chapters} 章 × {args.kb}KB")
+    print(f"{'配置':<10}{'journal':>9}{'读取/s':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}"
+          f"{'错误':>6}{'导入(s)':>9}")
+    for r in results:
+        print(f"{r['name']:<10}{r['journal']:>9}{r['reads_per_s']:>10.0f}{r['p50']:>10.2f}{r['p99']:>10.2f}"
+              f"{r['max']:>10.1f}{r['errors']:>6}{r['import_s']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+词典HTTP客户端基准测试：对比"每次查询新建客户端"与"共享连接池客户端"的延迟
+在本地启动一个模拟 Free Dictionary 的桩服务器，避免依赖外网
+
+用法:
+    python benchmark_dictionary_client.py --requests 500 --concurrency 20 --delay-ms 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+import httpx
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api import dictionary  # noqa: E402
+from app.services.http_client import create_http_client  # noqa: E402
+
+STUB_BODY = json.dumps([{
+    "word": "frog",
+    "phonetic": "/frɒɡ/",
+    "meanings": [{
+        "partOfSpeech": "noun",
+        "definitions": [{"definition": "A small tailless amphibian.", "example": "The frog jumped."}],
+    }],
+}]).encode("utf-8")
+
+
+async def start_stub_server(delay_ms: float) -> asyncio.AbstractServer:
+    """极简HTTP/1.1桩服务器，支持keep-alive"""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                if not request:
+                    break
+                if delay_ms:
+                    await asyncio.sleep(delay_ms / 1000)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Connection: keep-alive\r\n"
+                    b"Content-Length: " + str(len(STUB_BODY)).encode() + b"\r\n\r\n" + STUB_BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(mode: str, total: int, concurrency: int) -> List[float]:
+    """按指定模式执行查询，返回每次查询耗时（毫秒）"""
+    semaphore = asyncio.Semaphore(concurrency)
+    shared_client = create_http_client() if mode == "shared" else None
+    latencies: List[float] = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            if shared_client is not None:
+                await dictionary.query_free_dictionary(shared_client, f"frog{i}")
+            else:
+                # 旧实现：每次查询创建新客户端
+                async with httpx.AsyncClient() as client:
+                    await dictionary.query_free_dictionary(client, f"frog{i}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    try:
+        await asyncio.gather(*(one(i) for i in range(total)))
+    finally:
+        if shared_client is not None:
+            await shared_client.aclose()
+    return latencies
+
+
+async def main_async(args):
+    server = None
+    if args.target_url:
+        dictionary.FREE_DICTIONARY_API = args.target_url.rstrip("/")
+    else:
+        server = await start_stub_server(args.delay_ms)
+        host, port = server.sockets[0].getsockname()[:2]
+        dictionary.FREE_DICTIONARY_API = f"http://{host}:{port}/api/v2/entries/en"
+
+    results = {}
+    try:
+        for mode in ("per-request", "shared"):
+            results[mode] = await run_mode(mode, args.requests, args.concurrency)
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+    print(f"目标: {dictionary.FREE_DICTIONARY_API}")
+    print(f"请求数: {args.requests}  并发: {args.concurrency}")
+    print(f"{'模式':<14}{'p50(ms)':>10}{'p99(ms)':>10}{'mean(ms)':>10}")
+    for mode, latencies in results.items():
+        print(
+            f"{mode:<14}{percentile(latencies, 50):>10.2f}"
+            f"{percentile(latencies, 99):>10.2f}{statistics.mean(latencies):>10.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dictionary HTTP client pooling')
+    parser.add_argument('--requests', type=int, default=500, help='Total lookups per mode')
+    parser.add_argument('--concurrency', type=int, default=20, help='Concurrent lookups')
+    parser.add_argument('--delay-ms', type=float, default=5.0, help='Stub server response delay')
+    parser.add_argument('--target-url', help='Use a real Free Dictionary compatible endpoint instead of the stub')
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+词典日志开销基准测试：对比"完整输出上游响应"（旧版逐次打印的等价配置）
+与默认生产配置（INFO级别、不抽样）下，每次有道查询消耗的CPU时间
+使用 httpx.MockTransport 返回固定响应，不依赖外网和真实的有道账号
+
+用法:
+    python benchmark_dictionary_logging.py --requests 2000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+import httpx
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api import dictionary  # noqa: E402
+
+# 接近真实有道响应规模的样例（含basic、web、wfs与例句）
+YOUDAO_PAYLOAD = {
+    "errorCode": "0",
+    "query": "run",
+    "translation": ["跑"],
+    "basic": {
+        "phonetic": "rʌn",
+        "us-phonetic": "rʌn",
+        "uk-phonetic": "rʌn",
+        "explains": [
+            "v. 跑，奔跑；运营，经营；运行，运转；竞选；流动；延伸",
+            "n. 跑步；旅程；一段时间；连续演出；趋势；挂丝",
+        ],
+        "wfs": [
+            {"wf": {"name": "第三人称单数", "value": "runs"}},
+            {"wf": {"name": "现在分词", "value": "running"}},
+            {"wf": {"name": "过去式", "value": "ran"}},
+            {"wf": {"name": "过去分词", "value": "run"}},
+        ],
+    },
+    "web": [
+        {"key": f"run {i}", "value": ["运行", "跑", "奔跑", "经营"]} for i in range(10)
+    ],
+    "sentence": [
+        {"sContent": f"He runs every morning, example {i}.", "sCn": f"他每天早上跑步，例句{i}。"}
+        for i in range(20)
+    ],
+}
+
+
+def mock_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=YOUDAO_PAYLOAD)
+
+
+async def run(total: int) -> float:
+    """执行total次有道查询，返回每次查询的平均CPU时间（微秒）"""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(mock_handler))
+    try:
+        start = time.process_time()
+        for _ in range(total):
+            await dictionary.query_youdao_translate(client, "run")
+        return (time.process_time() - start) / total * 1e6
+    finally:
+        await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dictionary logging overhead')
+    parser.add_argument('--requests', type=int, default=2000, help='Lookups per mode')
+    args = parser.parse_args()
+
+    dictionary.YOUDAO_APP_KEY = "benchmark"
+    dictionary.YOUDAO_APP_SECRET = "benchmark"
+
+    # 日志写入/dev/null，只统计格式化与序列化的开销
+    handler = logging.StreamHandler(open(os.devnull, "w", encoding="utf-8"))
+    dictionary.logger.addHandler(handler)
+    dictionary.logger.propagate = False
+
+    modes = [
+        ("verbose (DEBUG, sample=1)", logging.DEBUG, 1.0),
+        ("default (INFO, sample=0)", logging.INFO, 0.0),
+    ]
+    results = {}
+    for name, level, rate in modes:
+        dictionary.logger.setLevel(level)
+        dictionary.dictionary_http_config.payload_log_sample_rate = rate
+        asyncio.run(run(min(100, args.requests)))  # 预热
+        results[name] = asyncio.run(run(args.requests))
+
+    print(f"请求数: {args.requests}")
+    print(f"{'模式':<30}{'CPU/请求(µs)':>14}")
+    for name, cpu_us in results.items():
+        print(f"{name:<30}{cpu_us:>14.1f}")
+    verbose, default = results.values()
+    print(f"每次查询节省CPU: {verbose - default:.1f}µs ({(1 - default / verbose) * 100:.0f}%)")
+
+
+if __name__ == '__main__':
+    main()
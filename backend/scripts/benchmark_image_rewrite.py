@@ -0,0 +1,129 @@
+"""
+章节图片路径替换基准测试：旧版逐项扫描 image_map vs ImageResolver 索引
+生成一本包含 --images 张图片的EPUB（图片分布在多个目录，含不同目录下的同名图片；
+--unpadded 时文件名不补零，出现 1.png / 11.png 这类子串相同的文件名），
+章节位于 text/ 目录下并以 ../images/... 相对路径引用图片；用 ebooklib 读回后分别统计：
+- 替换全部引用的耗时
+- 替换结果正确的引用数（期望URL由生成时的真实路径决定）
+
+用法:
+    python benchmark_image_rewrite.py
+    python benchmark_image_rewrite.py --images 500 --chapters 100 --repeat 3
+    python benchmark_image_rewrite.py --unpadded
+"""
+import argparse
+import os
+import posixpath
+import sys
+import tempfile
+import time
+
+import ebooklib
+from bs4 import BeautifulSoup
+from ebooklib import epub
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.import_book import ImageResolver  # noqa: E402
+
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082"
+)
+
+
+def image_path(index: int, padded: bool = True) -> str:
+    """图片路径：分散到两个目录，每第5张与 images/ 下的某张图片同名"""
+    folder = "images" if index % 5 else "images/extra"
+    number = index // 5 if index % 5 == 0 else index
+    return f"{folder}/page{number:04d}.png" if padded else f"{folder}/{number}.png"
+
+
+def build_epub(path: str, images: int, chapters: int, padded: bool) -> None:
+    book = epub.EpubBook()
+    book.set_identifier("benchmark-image-rewrite")
+    book.set_title("Image Rewrite Benchmark")
+    book.set_language("en")
+    for index in range(images):
+        book.add_item(epub.EpubItem(uid=f"img{index}", file_name=image_path(index, padded),
+                                    media_type="image/png", content=PNG))
+
+    per_chapter = max(1, images // chapters)
+    items = []
+    for number in range(chapters):
+        refs = range(number * per_chapter, min(images, (number + 1) * per_chapter))
+        body = "".join(f'<p>Page {i}</p><img src="../{image_path(i, padded)}" alt=""/>' for i in refs)
+        chapter = epub.EpubHtml(title=f"Chapter {number + 1}", file_name=f"text/ch{number + 1}.xhtml", lang="en")
+        chapter.content = f"<html><body><h1>Chapter {number + 1}</h1>{body}</body></html>"
+        book.add_item(chapter)
+        items.append(chapter)
+    book.toc = items
+    book.spine = items
+    book.add_item(epub.EpubNcx())
+    epub.write_epub(path, book)
+
+
+def legacy_resolve(image_map: dict, src: str):
+    """旧版 import_epub 的匹配方式：逐项做子串/后缀/文件名比较"""
+    for old_path, new_path in image_map.items():
+        if old_path in src or src.endswith(old_path) or os.path.basename(src) == os.path.basename(old_path):
+            return new_path
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark image src rewriting in imported chapters')
+    parser.add_argument('--images', type=int, default=500, help='Images in the generated EPUB')
+    parser.add_argument('--chapters', type=int, default=50, help='Chapters referencing the images')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per strategy (best is reported)')
+    parser.add_argument('--unpadded', action='store_true', help='Use 1.png, 11.png ... instead of page0001.png')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        epub_path = os.path.join(tmp, "bench.epub")
+        build_epub(epub_path, args.images, args.chapters, padded=not args.unpadded)
+        book = epub.read_epub(epub_path)
+
+    # 与 import_epub 相同的登记方式，URL 用图片路径标识以便校验
+    image_map = {}
+    resolver = ImageResolver()
+    for item in book.get_items():
+        if item.get_type() == ebooklib.ITEM_IMAGE:
+            item_name = item.get_name()
+            url = f"/static/images/bench/{item_name}"
+            image_map[item_name] = url
+            image_map[os.path.basename(item_name)] = url
+            if '/' in item_name:
+                image_map['../' + item_name] = url
+                image_map['./' + item_name] = url
+            resolver.add(item_name, url)
+
+    references = []  # (章节文件名, src, 期望URL)
+    for item in book.get_items():
+        if item.get_type() == ebooklib.ITEM_DOCUMENT:
+            soup = BeautifulSoup(item.get_content(), 'html.parser')
+            for img in soup.find_all('img'):
+                src = img.get('src', '')
+                expected = posixpath.normpath(posixpath.join(posixpath.dirname(item.get_name()), src))
+                references.append((item.get_name(), src, f"/static/images/bench/{expected}"))
+
+    strategies = {
+        "legacy": lambda document, src: legacy_resolve(image_map, src),
+        "resolver": lambda document, src: resolver.resolve(src, document),
+    }
+    print(f"{args.images} 张图片，{args.chapters} 个章节，{len(references)} 处图片引用，image_map {len(image_map)} 项")
+    print(f"{'方式':<10}{'耗时(ms)':>10}{'每次引用(µs)':>14}{'正确':>8}{'错误':>8}")
+    for name, resolve in strategies.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            results = [resolve(document, src) for document, src, _ in references]
+            best = min(best, time.perf_counter() - started)
+        correct = sum(1 for result, (_, _, expected) in zip(results, references) if result == expected)
+        print(f"{name:<10}{best * 1000:>10.2f}{best * 1e6 / len(references):>14.2f}{correct:>8}"
+              f"{len(references) - correct:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+导入图片上传基准测试：串行上传 vs 线程池并发上传（store_images）
+使用本地的模拟对象存储代替OSS：每次上传按 --latency-ms（±50%随机抖动）阻塞，
+并按 --failure-rate 随机失败以触发重试；校验返回的URL顺序与输入一致
+
+用法:
+    python benchmark_image_upload.py
+    python benchmark_image_upload.py --images 200 --latency-ms 40 --workers 1 4 8 16
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import import_job_config  # noqa: E402
+from scripts import import_book  # noqa: E402
+from scripts.import_book import store_images  # noqa: E402
+
+
+class FakeObjectStore:
+    """模拟对象存储：固定往返延迟 + 随机失败"""
+
+    def __init__(self, latency_ms: float, failure_rate: float, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.failure_rate = failure_rate
+        self.objects = {}
+        self.attempts = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def upload_image(self, image_data: bytes, object_name: str) -> str:
+        with self._lock:
+            self.attempts += 1
+            jitter = self._rng.uniform(0.5, 1.5)
+            fail = self._rng.random() < self.failure_rate
+        time.sleep(self.latency * jitter)
+        if fail:
+            raise ConnectionError("simulated upload failure")
+        with self._lock:
+            self.objects[object_name] = image_data
+        return f"https://fake-bucket.example.com/{object_name}"
+
+    def save_image_local(self, image_data: bytes, save_path: str) -> str:
+        """重试耗尽后的本地回退"""
+        with open(save_path, "wb") as f:
+            f.write(image_data)
+        return f"/static/{os.path.basename(save_path)}"
+
+
+def run_case(workers: int, images, args) -> dict:
+    store = FakeObjectStore(args.latency_ms, args.failure_rate)
+    import_book.oss_helper = store
+    store.enabled = True
+    with tempfile.TemporaryDirectory() as images_dir:
+        started = time.perf_counter()
+        urls = store_images("bench-book", images_dir, images, workers=workers)
+        elapsed = time.perf_counter() - started
+        local = len(os.listdir(images_dir))
+
+    expected = [f"https://fake-bucket.example.com/bench-book/{name}" for name, _ in images]
+    ordered = all(url == want for url, want in zip(urls, expected) if url.startswith("https://"))
+    return {
+        "workers": workers,
+        "seconds": elapsed,
+        "per_s": len(images) / elapsed,
+        "attempts": store.attempts,
+        "local": local,
+        "ordered": ordered and len(urls) == len(images),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel image uploads against a fake object store')
+    parser.add_argument('--images', type=int, default=200, help='Number of images (a picture book)')
+    parser.add_argument('--kb', type=int, default=100, help='Image size in KB')
+    parser.add_argument('--latency-ms', type=float, default=40, help='Mean upload round-trip latency')
+    parser.add_argument('--failure-rate', type=float, default=0.02, help='Probability that an upload attempt fails')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16], help='Thread counts to compare')
+    args = parser.parse_args()
+
+    # 测试中缩短重试等待，避免退避时间掩盖并发差异
+    import_job_config.image_retry_backoff = 0.01
+    payload = os.urandom(args.kb * 1024)
+    images = [(f"{index:04d}_page{index}.jpg", payload) for index in range(args.images)]
+
+    original = import_book.oss_helper
+    try:
+        results = [run_case(workers, images, args) for workers in args.workers]
+    finally:
+        import_book.oss_helper = original
+
+    print(f"{args.images} 张图片 × {args.kb}KB，模拟延迟 {args.latency_ms:.0f}ms，失败率 {args.failure_rate:.0%}"
+          f"（重试 {import_job_config.image_retries} 次）")
+    print(f"{'线程数':<8}{'耗时(s)':>9}{'张/s':>8}{'上传次数':>10}{'本地回退':>10}{'顺序正确':>10}")
+    baseline = results[0]["seconds"]
+    for r in results:
+        print(f"{r['workers']:<8}{r['seconds']:>9.2f}{r['per_s']:>8.0f}{r['attempts']:>10}{r['local']:>10}"
+              f"{'是' if r['ordered'] else '否':>10}   ×{baseline / r['seconds']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+"""
+导入耗时基准测试：章节HTML处理（图片路径替换、文本/单词提取、章节分类）
+- legacy：旧版流程，每个章节用 html.parser 解析两次（替换图片后 str(soup) 再解析提取文本），并多次遍历标签
+- parse_chapter：当前流程，每个章节只解析一次，分别使用 html.parser 和 lxml（已安装时）
+同时校验各方式得到的文本、单词与章节分类是否与旧版一致
+不指定EPUB时生成一组测试书籍（封面、目录、版权页、带插图的正文章节）；--full 额外统计完整 import_epub 的耗时
+（不同步Supabase，导入后删除书籍）
+
+用法:
+    python benchmark_import.py
+    python benchmark_import.py --books 20 --chapters 40 --repeat 3
+    python benchmark_import.py ../data/epubs/ --full
+"""
+import argparse
+import contextlib
+import glob
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import ebooklib
+from bs4 import BeautifulSoup
+from ebooklib import epub
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import import_book  # noqa: E402
+from scripts.import_book import (  # noqa: E402
+    LXML_AVAILABLE, ChapterPage, ImageResolver, detect_chapter_type, extract_real_chapter_number,
+    extract_words, load_opf_data, parse_chapter,
+)
+
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082"
+)
+SENTENCES = [
+    "Jack and Annie climbed the rope ladder into the tree house.",
+    "“Look at all these books!” said Annie, pointing at the shelves.",
+    "The wind whistled through the branches while the sun went down.",
+    "He opened his notebook and wrote: <em>dinosaurs are real</em>.",
+    "They didn't know how long the magic would last, so they hurried home.",
+]
+
+
+def build_epub(path: str, index: int, chapters: int, paragraphs: int) -> None:
+    """生成一本测试书籍：SVG封面、目录、版权页和带插图的正文章节（位于 text/ 目录）"""
+    book = epub.EpubBook()
+    book.set_identifier(f"benchmark-import-{index}")
+    book.set_title(f"Import Benchmark {index}")
+    book.set_language("en")
+    book.add_author("Benchmark")
+    for number in range(chapters + 1):
+        book.add_item(epub.EpubItem(uid=f"img{number}", file_name=f"images/pic{number:03d}.png",
+                                    media_type="image/png", content=PNG))
+
+    cover = epub.EpubHtml(title="Cover", file_name="text/cover.xhtml", lang="en")
+    cover.content = ('<html><body><svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+                     '<image xlink:href="../images/pic000.png"/></svg></body></html>')
+    toc = epub.EpubHtml(title="Contents", file_name="text/toc.xhtml", lang="en")
+    toc.content = "<html><body><h1>Contents</h1>" + "".join(
+        f'<p><a href="ch{n}.xhtml">Chapter {n}</a></p>' for n in range(1, chapters + 1)) + "</body></html>"
+    rights = epub.EpubHtml(title="Copyright", file_name="text/copyright.xhtml", lang="en")
+    rights.content = ("<html><body><p>Copyright © 2001 Benchmark. All rights reserved. "
+                      "ISBN 978-0-000-00000-0. Printed in the United States of America.</p></body></html>")
+    items = [cover, toc, rights]
+
+    for number in range(1, chapters + 1):
+        body = "".join(
+            f"<p>{' '.join(SENTENCES[(number + p + s) % len(SENTENCES)] for s in range(6))}</p>"
+            + (f'<p class="figure"><img src="../images/pic{number:03d}.png" alt=""/></p>' if p == 1 else "")
+            for p in range(paragraphs)
+        )
+        chapter = epub.EpubHtml(title=f"Chapter {number}", file_name=f"text/ch{number}.xhtml", lang="en")
+        chapter.content = f"<html><body><h2>Chapter {number}</h2><h3>The Tree House</h3>{body}</body></html>"
+        items.append(chapter)
+
+    for item in items:
+        book.add_item(item)
+    book.toc = items[3:]
+    book.spine = items
+    book.add_item(epub.EpubNcx())
+    epub.write_epub(path, book)
+
+
+def load_corpus(path: str) -> list:
+    """读取EPUB，返回 (章节文件名, HTML) 列表及与 import_epub 相同方式构建的图片索引"""
+    _, opf_dir, _ = load_opf_data(path)
+    book = epub.read_epub(path)
+    resolver = ImageResolver(opf_dir)
+    documents = []
+    for item in book.get_items():
+        if item.get_type() == ebooklib.ITEM_IMAGE:
+            resolver.add(item.get_name(), f"/static/images/bench/{os.path.basename(item.get_name())}")
+        elif item.get_type() == ebooklib.ITEM_DOCUMENT:
+            documents.append((item.get_name(), item.get_content().decode('utf-8', errors='ignore')))
+    return documents, resolver
+
+
+def legacy_chapter(content: str, item_name: str, resolver: ImageResolver) -> tuple:
+    """旧版 import_epub 的章节处理：解析、替换图片、序列化后再次解析提取文本，分类时再查找标签"""
+    soup = BeautifulSoup(content, 'html.parser')
+    for img in soup.find_all('img'):
+        new_src = resolver.resolve(img.get('src', ''), item_name)
+        if new_src:
+            img['src'] = new_src
+    for img in soup.find_all('image'):
+        href = img.get('xlink:href', '') or img.get('href', '')
+        new_path = resolver.resolve(href, item_name)
+        if new_path:
+            if img.get('xlink:href'):
+                img['xlink:href'] = new_path
+            if img.get('href'):
+                img['href'] = new_path
+    html = str(soup)
+    text = BeautifulSoup(html, 'html.parser').get_text(separator=' ', strip=True)
+    words = extract_words(text)
+    title_tag = soup.find(['h1', 'h2', 'h3'])
+    page = ChapterPage(html, text, words, bool(soup.find_all('img')),
+                       title_tag.get_text(strip=True) if title_tag else '')
+    return html, text, words, detect_chapter_type(page), extract_real_chapter_number(text)
+
+
+def single_pass_chapter(parser: str):
+    def process(content: str, item_name: str, resolver: ImageResolver) -> tuple:
+        page = parse_chapter(content, item_name, resolver, parser=parser)
+        return page.html, page.text, page.words, detect_chapter_type(page), extract_real_chapter_number(page.text)
+    return process
+
+
+def run_strategy(process, corpus: list, repeat: int) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [process(content, name, resolver)
+                   for documents, resolver in corpus for name, content in documents]
+        best = min(best, time.perf_counter() - started)
+    return best, results
+
+
+def time_full_import(paths: list, parser: str) -> float:
+    """完整导入（不同步Supabase），导入后删除书籍"""
+    from app.api.books import _delete_book
+    from app.models.database import SessionLocal
+    from app.utils.supabase_client import supabase_client
+
+    supabase_client._enabled = False
+    import_book.HTML_PARSER = parser
+    logging.disable(logging.INFO)  # 屏蔽逐张图片的保存日志
+    total = 0.0
+    for path in paths:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # import_epub 会打印导入摘要
+            book_id = import_book.import_epub(path)
+        total += time.perf_counter() - started
+        db = SessionLocal()
+        try:
+            _delete_book(book_id, db)
+        finally:
+            db.close()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark chapter HTML processing during EPUB import')
+    parser.add_argument('epubs', nargs='*', help='EPUB files or directories (default: generate a corpus)')
+    parser.add_argument('--books', type=int, default=10, help='Books in the generated corpus')
+    parser.add_argument('--chapters', type=int, default=30, help='Chapters per generated book')
+    parser.add_argument('--paragraphs', type=int, default=20, help='Paragraphs per generated chapter')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per strategy (best is reported)')
+    parser.add_argument('--full', action='store_true', help='Also time complete import_epub runs (writes the DB)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for target in args.epubs:
+            paths.extend(sorted(glob.glob(os.path.join(target, '*.epub'))) if os.path.isdir(target) else [target])
+        if not paths:
+            for index in range(args.books):
+                path = os.path.join(tmp, f"book{index}.epub")
+                build_epub(path, index, args.chapters, args.paragraphs)
+                paths.append(path)
+
+        corpus = [load_corpus(path) for path in paths]
+        chapters = sum(len(documents) for documents, _ in corpus)
+        size_mb = sum(len(content) for documents, _ in corpus for _, content in documents) / 1024 / 1024
+
+        strategies = {"legacy": legacy_chapter, "html.parser": single_pass_chapter('html.parser')}
+        if LXML_AVAILABLE:
+            strategies["lxml"] = single_pass_chapter('lxml')
+        else:
+            print("lxml未安装，跳过lxml（pip3 install lxml）")
+
+        print(f"{len(paths)} 本书，{chapters} 个章节，HTML共 {size_mb:.1f}MB")
+        print(f"{'方式':<14}{'耗时(s)':>9}{'每章(ms)':>10}{'HTML一致':>10}{'文本/单词/分类一致':>20}")
+        baseline = None
+        for name, process in strategies.items():
+            seconds, results = run_strategy(process, corpus, args.repeat)
+            if baseline is None:
+                baseline = (seconds, results)
+            same_html = sum(1 for a, b in zip(results, baseline[1]) if a[0] == b[0])
+            same_rest = sum(1 for a, b in zip(results, baseline[1]) if a[1:] == b[1:])
+            print(f"{name:<14}{seconds:>9.2f}{seconds * 1000 / chapters:>10.2f}{same_html:>10}{same_rest:>20}"
+                  f"   ×{baseline[0] / seconds:.2f}")
+
+        if args.full:
+            print(f"\n完整导入（import_epub，{len(paths)} 本书）")
+            for name in strategies:
+                if name != "legacy":
+                    print(f"{name:<14}{time_full_import(paths, name):>9.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+词形还原基准测试：对比 WordNet 逐次还原与预计算词形还原表的每秒查询数
+
+用法:
+    python benchmark_lemmatizer.py --rounds 5
+"""
+import argparse
+import os
+import sys
+import time
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.dictionary import wordnet_lemmatize  # noqa: E402
+from app.config import lemma_table_config  # noqa: E402
+from app.services.lemma_table import LemmaTable  # noqa: E402
+
+
+def measure(label: str, fn, words, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for word in words:
+            fn(word)
+    elapsed = time.perf_counter() - start
+    total = len(words) * rounds
+    print(f"{label:<20}{total / elapsed:>14,.0f} lookups/s  ({elapsed * 1000 / total:.4f}ms/次)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lemma table vs WordNet')
+    parser.add_argument('--table', default=lemma_table_config.path, help='Lemma table path')
+    parser.add_argument('--rounds', type=int, default=3, help='Passes over the word set')
+    parser.add_argument('--limit', type=int, default=20000, help='Max words to benchmark')
+    args = parser.parse_args()
+
+    table = LemmaTable(args.table)
+    if not table.load():
+        print(f"词形还原表为空或不存在: {args.table}，请先运行 build_lemma_table.py")
+        sys.exit(1)
+
+    words = table.words()[:args.limit]
+    print(f"单词数: {len(words)}  轮数: {args.rounds}")
+
+    try:
+        measure("WordNet(无缓存)", wordnet_lemmatize, words, args.rounds)
+    except LookupError as e:
+        print(f"WordNet数据不可用，跳过对比: {e}")
+    measure("预计算表", table.get, words, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
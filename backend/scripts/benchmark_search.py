@@ -0,0 +1,133 @@
+"""
+书籍检索基准测试：对比全文索引（FTS5）与原有的 LIKE 扫描
+在临时SQLite数据库中生成合成书库（默认 10,000 本书 / 300,000 个章节），
+分别测量书名/作者检索与章节正文检索的延迟，结束后删除临时数据库
+
+用法:
+    python benchmark_search.py                                   # 默认规模
+    python benchmark_search.py --books 1000 --chapters 10 --words 150
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.database import Base  # noqa: E402
+from app.services import search_index  # noqa: E402
+
+VOCABULARY = (
+    "the a and to of he she said was it in his her they you that for on with as at "
+    "annie jack tree house ladder rope branches wooden little looked pointed climbed "
+    "wind books window magic dinosaur castle knight ocean forest river moon night "
+    "pirate treasure island storm mountain dragon garden secret letter friend school "
+    "teacher village market bridge tower shadow lantern whisper journey winter summer"
+).split()
+RARE_WORDS = ["pterodactyl", "mummy", "samurai", "volcano", "penguin", "tornado", "gladiator", "comet"]
+QUERIES = ["dragon", "magic tree", "pter", "samurai castle", "penguin", "lantern whisper"]
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    picked = [rng.choice(VOCABULARY) for _ in range(words)]
+    if rng.random() < 0.05:
+        picked[rng.randrange(words)] = rng.choice(RARE_WORDS)
+    return " ".join(picked)
+
+
+def seed(engine, books: int, chapters: int, words: int) -> None:
+    """写入合成书籍、章节（HTML与纯文本）并建立全文索引"""
+    rng = random.Random(42)
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        search_index.ensure_search_index(conn)
+        for book_no in range(books):
+            book_id = f"book-{book_no}"
+            title = sentence(rng, 3).title()
+            author = f"{rng.choice(VOCABULARY).title()} {rng.choice(RARE_WORDS + VOCABULARY).title()}"
+            series = rng.choice(["Magic Tree House", "Dragon Masters", "Owl Diaries", ""])
+            conn.execute(
+                text("INSERT INTO books (id, title, author, series, word_count) VALUES (:id, :title, :author, :series, 0)"),
+                {"id": book_id, "title": title, "author": author, "series": series},
+            )
+            chapter_rows = []
+            for number in range(1, chapters + 1):
+                body = sentence(rng, words)
+                chapter_rows.append({
+                    "id": f"{book_id}-{number}", "book_id": book_id, "chapter_number": number,
+                    "title": f"Chapter {number}", "content": f"<p>{body}</p>", "word_count": words,
+                    "body": body,
+                })
+            conn.execute(
+                text("INSERT INTO chapters (id, book_id, chapter_number, title, content, word_count) "
+                     "VALUES (:id, :book_id, :chapter_number, :title, :content, :word_count)"),
+                chapter_rows,
+            )
+            search_index.index_book(
+                conn, book_id, title, author, series,
+                [(row["chapter_number"], row["title"], row["body"]) for row in chapter_rows],
+            )
+            if (book_no + 1) % 1000 == 0:
+                print(f"  已生成 {book_no + 1}/{books} 本")
+    print(f"生成与索引耗时 {time.perf_counter() - started:.1f}s")
+
+
+def like_search(engine, query: str, limit: int):
+    """原有方式：对书名/作者与章节HTML做 LIKE '%词%' 全表扫描"""
+    pattern = f"%{query}%"
+    with engine.connect() as conn:
+        books = conn.execute(
+            text("SELECT id FROM books WHERE title LIKE :p OR author LIKE :p LIMIT :limit"),
+            {"p": pattern, "limit": limit},
+        ).fetchall()
+        chapters = conn.execute(
+            text("SELECT book_id, chapter_number FROM chapters WHERE content LIKE :p LIMIT :limit"),
+            {"p": pattern, "limit": limit},
+        ).fetchall()
+    return len(books), len(chapters)
+
+
+def measure(label: str, fn, rounds: int) -> None:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"  {label:<8} 中位数 {statistics.median(timings):8.2f}ms  p95 {p95:8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FTS5 search against LIKE scans')
+    parser.add_argument('--books', type=int, default=10000, help='Number of synthetic books')
+    parser.add_argument('--chapters', type=int, default=30, help='Chapters per book')
+    parser.add_argument('--words', type=int, default=200, help='Words per chapter')
+    parser.add_argument('--rounds', type=int, default=20, help='Repetitions per query')
+    parser.add_argument('--limit', type=int, default=20, help='Result limit')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        print(f"生成书库: {args.books} 本书 × {args.chapters} 章 × {args.words} 词")
+        seed(engine, args.books, args.chapters, args.words)
+
+        for query in QUERIES:
+            fts = search_index.search(query, args.limit, args.limit, bind=engine)
+            print(f"\n查询 {query!r}: FTS 命中 {len(fts['books'])} 本书 / {len(fts['chapters'])} 章")
+            if fts["chapters"]:
+                print(f"  片段: {fts['chapters'][0]['snippet'][:100]}")
+            measure("fts", lambda: search_index.search(query, args.limit, args.limit, bind=engine), args.rounds)
+            measure("like", lambda: like_search(engine, query, args.limit), args.rounds)
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+章节目录响应体积基准测试：对比"目录附带全部章节正文"（旧版）与"仅返回目录列"的
+响应大小和序列化耗时
+
+默认生成30个章节的模拟书籍；也可以指定真实EPUB文件
+用法:
+    python benchmark_toc_payload.py
+    python benchmark_toc_payload.py --epub ../books/example.epub
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from typing import List
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.schemas.schemas import ChapterResponse, ChapterSummary  # noqa: E402
+
+PARAGRAPH = (
+    "<p>Jack and Annie climbed up the rope ladder into the tree house. "
+    "Books were scattered everywhere, and a warm wind blew through the window.</p>"
+)
+
+
+def synthetic_chapters(count: int, words_per_chapter: int) -> List[dict]:
+    """生成模拟章节（每段约25个单词）"""
+    paragraphs = max(1, words_per_chapter // 25)
+    return [{
+        "id": str(uuid.uuid4()),
+        "chapter_number": i,
+        "title": f"Chapter {i}",
+        "content": f"<h1>Chapter {i}</h1>" + PARAGRAPH * paragraphs,
+        "word_count": paragraphs * 25,
+    } for i in range(1, count + 1)]
+
+
+def epub_chapters(epub_path: str) -> List[dict]:
+    """读取EPUB中的正文文档作为章节"""
+    import ebooklib
+    from ebooklib import epub
+
+    book = epub.read_epub(epub_path)
+    chapters = []
+    for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT):
+        content = item.get_content().decode("utf-8", errors="ignore")
+        chapters.append({
+            "id": str(uuid.uuid4()),
+            "chapter_number": len(chapters) + 1,
+            "title": item.get_name(),
+            "content": content,
+            "word_count": len(content.split()),
+        })
+    return chapters
+
+
+def measure(adapter: TypeAdapter, chapters: List[dict], rounds: int):
+    """返回 (响应字节数, 平均序列化耗时ms)"""
+    body = adapter.dump_json(adapter.validate_python(chapters))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        adapter.dump_json(adapter.validate_python(chapters))
+    return len(body), (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark chapter TOC payload size')
+    parser.add_argument('--epub', help='Use chapters from a real EPUB file')
+    parser.add_argument('--chapters', type=int, default=30, help='Synthetic chapter count')
+    parser.add_argument('--words', type=int, default=2500, help='Synthetic words per chapter')
+    parser.add_argument('--rounds', type=int, default=50, help='Serialization rounds')
+    args = parser.parse_args()
+
+    chapters = epub_chapters(args.epub) if args.epub else synthetic_chapters(args.chapters, args.words)
+
+    full_size, full_ms = measure(TypeAdapter(List[ChapterResponse]), chapters, args.rounds)
+    toc_size, toc_ms = measure(TypeAdapter(List[ChapterSummary]), chapters, args.rounds)
+
+    print(f"章节数: {len(chapters)}")
+    print(f"{'响应':<22}{'大小(KB)':>12}{'序列化(ms)':>14}")
+    print(f"{'含正文 (旧版)':<22}{full_size / 1024:>12.1f}{full_ms:>14.2f}")
+    print(f"{'仅目录 ChapterSummary':<22}{toc_size / 1024:>12.1f}{toc_ms:>14.2f}")
+    print(f"体积缩减: {(1 - toc_size / full_size) * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+上传接口内存基准测试：N 个并发上传时服务进程的峰值内存（RSS）
+分别启动独立的uvicorn进程测试两种接收方式（只接收文件，不执行导入）：
+- baseline：原有实现，UploadFile 接收后 await file.read() 整体读入内存再写入临时文件
+- streaming：当前实现，receive_epub 边解析请求体边写入磁盘并计算SHA-256
+峰值内存读取自 /proc/<pid>/status 的 VmHWM（仅Linux）
+
+用法:
+    python benchmark_upload_memory.py
+    python benchmark_upload_memory.py --uploads 8 --mb 100
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BOUNDARY = "benchmarkboundary7d93a1"
+
+
+def create_app(mode: str, upload_dir: str):
+    """测试用应用：只包含一个上传路由"""
+    from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+
+    from app.config import import_job_config
+    from app.services.upload_receiver import UploadRejected, receive_epub
+
+    app = FastAPI()
+
+    if mode == "baseline":
+        @app.post("/upload")
+        async def upload(file: UploadFile = File(...)):
+            with tempfile.NamedTemporaryFile(dir=upload_dir, delete=True) as buffer:
+                content = await file.read()
+                buffer.write(content)
+            return {"size": len(content)}
+    else:
+        @app.post("/upload")
+        async def upload(request: Request):
+            try:
+                received = await receive_epub(request, upload_dir, import_job_config.max_upload_bytes)
+            except UploadRejected as e:
+                raise HTTPException(status_code=e.status_code, detail=e.detail)
+            received.discard()
+            return {"size": received.size, "sha256": received.sha256}
+
+    return app
+
+
+def serve(mode: str, port: int, upload_dir: str) -> None:
+    import uvicorn
+    uvicorn.run(create_app(mode, upload_dir), host="127.0.0.1", port=port, log_level="warning")
+
+
+def memory_kb(pid: int, field: str) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def multipart_body(size: int, chunk_size: int = 1024 * 1024):
+    """流式生成multipart请求体：ZIP签名开头的伪EPUB"""
+    head = (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="lexile"\r\n\r\n500L\r\n'
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="bench.epub"\r\n'
+        f"Content-Type: application/epub+zip\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{BOUNDARY}--\r\n".encode()
+    block = (b"PK\x03\x04" + os.urandom(chunk_size - 4))
+
+    async def body():
+        yield head
+        sent = 0
+        while sent < size:
+            chunk = block[:min(chunk_size, size - sent)]
+            sent += len(chunk)
+            yield chunk
+        yield tail
+
+    return body, len(head) + size + len(tail)
+
+
+async def upload_all(port: int, uploads: int, size: int) -> list:
+    body, length = multipart_body(size)
+    headers = {
+        "Content-Type": f"multipart/form-data; boundary={BOUNDARY}",
+        "Content-Length": str(length),
+    }
+    async with httpx.AsyncClient(timeout=600) as client:
+        async def one():
+            response = await client.post(f"http://127.0.0.1:{port}/upload", content=body(), headers=headers)
+            response.raise_for_status()
+            return response.json()["size"]
+        return await asyncio.gather(*(one() for _ in range(uploads)))
+
+
+def run_case(mode: str, args) -> dict:
+    upload_dir = tempfile.mkdtemp(dir=args.dir)
+    port = free_port()
+    # 上传文件上限放宽到测试文件大小以上
+    env = {**os.environ, "IMPORT_MAX_UPLOAD_MB": str(args.mb * 2)}
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve", mode, "--port", str(port), "--dir", upload_dir],
+        env=env,
+    )
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        idle_kb = memory_kb(server.pid, "VmRSS")
+        started = time.perf_counter()
+        sizes = asyncio.run(upload_all(port, args.uploads, args.mb * 1024 * 1024))
+        elapsed = time.perf_counter() - started
+        peak_kb = memory_kb(server.pid, "VmHWM")
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+    assert all(size == args.mb * 1024 * 1024 for size in sizes)
+    return {
+        "name": mode,
+        "idle_mb": idle_kb / 1024,
+        "peak_mb": peak_kb / 1024,
+        "growth_mb": (peak_kb - idle_kb) / 1024,
+        "seconds": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark server memory during parallel EPUB uploads')
+    parser.add_argument('--uploads', type=int, default=4, help='Parallel uploads')
+    parser.add_argument('--mb', type=int, default=50, help='Size of each upload in MB')
+    parser.add_argument('--dir', default=None, help='Directory for uploaded files (use the data disk)')
+    parser.add_argument('--serve', choices=['baseline', 'streaming'], help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.dir)
+        return
+
+    results = [run_case("baseline", args), run_case("streaming", args)]
+
+    print(f"并发上传 {args.uploads} 个 × {args.mb}MB")
+    print(f"{'方式':<12}{'空闲(MB)':>10}{'峰值(MB)':>10}{'增长(MB)':>10}{'耗时(s)':>9}")
+    for r in results:
+        print(f"{r['name']:<12}{r['idle_mb']:>10.0f}{r['peak_mb']:>10.0f}{r['growth_mb']:>10.0f}{r['seconds']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
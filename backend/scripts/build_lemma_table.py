@@ -0,0 +1,93 @@
+"""
+词形还原表构建脚本
+扫描已导入书籍的全部章节，对出现过的每个单词预先计算词根（不规则变化表 + WordNet），
+生成 data/lemma_table.tsv.gz，服务启动时加载
+
+用法:
+    python build_lemma_table.py
+    python build_lemma_table.py --wordlist extra_words.txt --output data/lemma_table.tsv.gz
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from typing import Set
+
+from bs4 import BeautifulSoup
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.dictionary import IRREGULAR_VERBS, wordnet_lemmatize  # noqa: E402
+from app.config import lemma_table_config  # noqa: E402
+from app.models.database import Chapter, SessionLocal  # noqa: E402
+from app.services.chapter_store import chapter_store  # noqa: E402
+from app.services.lemma_table import write_lemma_table  # noqa: E402
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+def collect_chapter_tokens() -> Set[str]:
+    """收集SQLite中全部章节出现过的单词（小写）"""
+    tokens: Set[str] = set()
+    db = SessionLocal()
+    try:
+        chapter_count = 0
+        rows = db.query(Chapter.content, Chapter.content_gzip, Chapter.content_hash).yield_per(200)
+        for chapter in rows:
+            # 正文可能在章节存储（content_hash）、content_gzip 或 content 列中
+            content = chapter_store.chapter_html(db, chapter)
+            if not content:
+                continue
+            text = BeautifulSoup(content, 'html.parser').get_text(separator=' ')
+            tokens.update(WORD_PATTERN.findall(text.lower()))
+            chapter_count += 1
+        logger.info(f"扫描章节 {chapter_count} 个，得到 {len(tokens)} 个不同单词")
+    finally:
+        db.close()
+    return tokens
+
+
+def load_wordlist(path: str) -> Set[str]:
+    """读取额外词表，忽略空行和#注释"""
+    words: Set[str] = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip().lower()
+            if line and not line.startswith("#") and WORD_PATTERN.fullmatch(line):
+                words.add(line)
+    return words
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the precomputed lemma table')
+    parser.add_argument('--output', default=lemma_table_config.path, help='Output file path')
+    parser.add_argument('--wordlist', action='append', default=[], help='Extra word list to include')
+    args = parser.parse_args()
+
+    tokens = collect_chapter_tokens()
+    for path in args.wordlist:
+        tokens.update(load_wordlist(path))
+    tokens.update(IRREGULAR_VERBS)
+
+    start = time.perf_counter()
+    mapping = {}
+    for word in tokens:
+        mapping[word] = IRREGULAR_VERBS.get(word) or wordnet_lemmatize(word)
+    elapsed = time.perf_counter() - start
+
+    count = write_lemma_table(args.output, mapping)
+    changed = sum(1 for word, lemma in mapping.items() if word != lemma)
+    size = os.path.getsize(args.output)
+    logger.info(f"WordNet计算耗时 {elapsed:.1f}s")
+    logger.info(f"✅ 词形还原表已生成: {args.output} ({count} 个单词，其中 {changed} 个有变形, {size / 1024:.1f}KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+离线词典构建脚本
+从已缓存的词典结果（data/dictionary_cache.db）和导出的JSONL文件中收集单词释义，
+生成内存映射的离线词典文件（默认 data/offline_dictionary.bin）
+
+用法:
+    python build_offline_dictionary.py                        # 使用内置核心词表
+    python build_offline_dictionary.py --all-cached           # 收录缓存中的全部单词
+    python build_offline_dictionary.py --jsonl export.jsonl   # 额外导入JSONL（每行一个DictionaryResponse）
+    python build_offline_dictionary.py --fetch-missing        # 词表中缓存未命中的单词向上游补查
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import sys
+from typing import Dict, Optional, Set
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import dictionary_cache_config, offline_dictionary_config  # noqa: E402
+from app.services.offline_dictionary import OfflineDictionary, write_offline_dictionary  # noqa: E402
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_WORDLIST = os.path.join(BACKEND_DIR, "app", "resources", "core_words.txt")
+
+
+def normalize_key(word: str) -> str:
+    """与 app.api.dictionary.normalize_query 保持一致"""
+    return " ".join(word.split()).lower()
+
+
+def is_single_word(key: str) -> bool:
+    """离线词典只收录单词（短语/句子仍走有道翻译）"""
+    return bool(key) and key.isalpha()
+
+
+def load_wordlist(path: Optional[str]) -> Optional[Set[str]]:
+    """读取词表，忽略空行和#注释"""
+    if not path:
+        return None
+    words = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                words.add(normalize_key(line))
+    logger.info(f"词表已加载: {len(words)} 个单词 ({path})")
+    return words
+
+
+def load_cached_entries(db_path: str) -> Dict[str, dict]:
+    """读取词典缓存持久层中的全部结果（释义不随缓存TTL失效，过期条目同样收录）"""
+    entries: Dict[str, dict] = {}
+    if not os.path.exists(db_path):
+        logger.warning(f"缓存数据库不存在: {db_path}")
+        return entries
+
+    conn = sqlite3.connect(db_path)
+    try:
+        for key, payload in conn.execute("SELECT key, value FROM dictionary_cache"):
+            try:
+                entries[normalize_key(key)] = json.loads(payload)
+            except ValueError:
+                continue
+    finally:
+        conn.close()
+    logger.info(f"从缓存读取 {len(entries)} 条结果")
+    return entries
+
+
+def load_jsonl_entries(path: str) -> Dict[str, dict]:
+    """读取JSONL导出文件，每行一个词典结果（需包含word与meanings）"""
+    entries: Dict[str, dict] = {}
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning(f"跳过无法解析的行 {path}:{line_no}")
+                continue
+            if entry.get("word") and entry.get("meanings"):
+                entries[normalize_key(entry["word"])] = entry
+    logger.info(f"从 {path} 读取 {len(entries)} 条结果")
+    return entries
+
+
+async def fetch_missing(words: Set[str], concurrency: int) -> Dict[str, dict]:
+    """向上游词典补查缺失单词（结果同时写入词典缓存）"""
+    from fastapi import HTTPException
+    from app.api.dictionary import _lookup_upstream
+
+    semaphore = asyncio.Semaphore(concurrency)
+    fetched: Dict[str, dict] = {}
+
+    async def fetch_one(word: str):
+        async with semaphore:
+            try:
+                fetched[word] = await _lookup_upstream(word)
+            except HTTPException:
+                logger.info(f"上游未找到: {word}")
+
+    await asyncio.gather(*(fetch_one(word) for word in sorted(words)))
+    logger.info(f"上游补查成功 {len(fetched)}/{len(words)} 个单词")
+    return fetched
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the offline dictionary file')
+    parser.add_argument('--output', default=offline_dictionary_config.path, help='Output file path')
+    parser.add_argument('--cache-db', default=dictionary_cache_config.db_path, help='Dictionary cache database')
+    parser.add_argument('--wordlist', default=DEFAULT_WORDLIST, help='Only include words in this list')
+    parser.add_argument('--all-cached', action='store_true', help='Include every cached single word')
+    parser.add_argument('--jsonl', action='append', default=[], help='Extra JSONL export to import')
+    parser.add_argument('--fetch-missing', action='store_true', help='Query upstreams for wordlist words not cached')
+    parser.add_argument('--concurrency', type=int, default=5, help='Upstream concurrency for --fetch-missing')
+    parser.add_argument('--no-merge', action='store_true', help='Do not keep entries from the existing output file')
+    args = parser.parse_args()
+
+    wordlist = load_wordlist(args.wordlist)
+
+    entries: Dict[str, dict] = {}
+    if not args.no_merge:
+        existing = OfflineDictionary(args.output)
+        entries.update(existing.items())
+        logger.info(f"保留已有离线词典 {len(entries)} 条")
+
+    candidates = load_cached_entries(args.cache_db)
+    for path in args.jsonl:
+        candidates.update(load_jsonl_entries(path))
+
+    for key, entry in candidates.items():
+        if not is_single_word(key):
+            continue
+        if args.all_cached or wordlist is None or key in wordlist:
+            entries[key] = entry
+
+    if args.fetch_missing and wordlist:
+        missing = {word for word in wordlist if is_single_word(word) and word not in entries}
+        if missing:
+            entries.update(asyncio.run(fetch_missing(missing, args.concurrency)))
+
+    count = write_offline_dictionary(args.output, entries)
+    size = os.path.getsize(args.output)
+    logger.info(f"✅ 离线词典已生成: {args.output} ({count} 个词条, {size / 1024:.1f}KB)")
+    if wordlist:
+        covered = len(wordlist & set(entries))
+        logger.info(f"词表覆盖率: {covered}/{len(wordlist)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+查询计划回归检查：确认 books.py 中各读接口的SQLite查询都走索引
+在本地SQLite中临时写入一本测试书籍，通过ASGI依次调用各接口，
+记录期间执行的全部SELECT并对其运行 EXPLAIN QUERY PLAN：
+- 对 books / chapters / chapter_blobs / book_vocabulary 的全表扫描（SCAN 表名 且未使用索引）视为失败
+- 未按索引查找、却为 ORDER BY 额外建立临时B树（USE TEMP B-TREE FOR ORDER BY）视为失败
+书名模糊搜索（LIKE '%词%'）无法使用B树索引，列在 EXPECTED_SCANS 中不计失败（全文检索请用 /search）
+结束后删除测试书籍；存在失败时以非0状态码退出，可放在CI或迁移后运行
+
+用法:
+    python check_query_plans.py
+    python check_query_plans.py --verbose   # 打印每条查询的计划
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import uuid
+from datetime import datetime
+from typing import List, Tuple
+
+import httpx
+from sqlalchemy import event
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.database import SessionLocal, create_tables, engine, Book, BookVocabulary, Chapter  # noqa: E402
+from app.services.chapter_store import chapter_store  # noqa: E402
+from app.services.response_cache import response_cache  # noqa: E402
+from app.utils.supabase_client import supabase_client  # noqa: E402
+from main import app  # noqa: E402
+
+TABLES = ("books", "chapters", "chapter_blobs", "book_vocabulary")
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+# 允许的全表扫描：(接口, 表名)
+EXPECTED_SCANS = {("GET /api/books?search=tree", "books")}
+
+
+def seed_book() -> str:
+    book_id = f"plan-check-{uuid.uuid4()}"
+    db = SessionLocal()
+    try:
+        db.add(Book(id=book_id, title="Query Plan Check", author="Nobody", level="三年级",
+                    created_at=datetime.utcnow()))
+        for number in (1, 2):
+            db.add(Chapter(id=str(uuid.uuid4()), book_id=book_id, chapter_number=number,
+                           title=f"Chapter {number}", word_count=2,
+                           **chapter_store.content_fields(db, f"<p>tree house {number}</p>")))
+        db.add(BookVocabulary(id=str(uuid.uuid4()), book_id=book_id, word="tree", frequency=3))
+        db.commit()
+    finally:
+        db.close()
+    return book_id
+
+
+def remove_book(book_id: str):
+    db = SessionLocal()
+    try:
+        chapter_store.delete_chapters(db, book_id)
+        db.query(BookVocabulary).filter(BookVocabulary.book_id == book_id).delete()
+        db.query(Book).filter(Book.id == book_id).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+def route_cases(book_id: str, cursor: str) -> List[Tuple[str, str, dict]]:
+    """(接口名, 方法, 请求参数)"""
+    base = f"/api/books/{book_id}"
+    return [
+        ("GET /api/books", "GET", {"url": "/api/books", "params": {"limit": 20}}),
+        ("GET /api/books?cursor", "GET", {"url": "/api/books", "params": {"limit": 20, "cursor": cursor}}),
+        ("GET /api/books?level", "GET", {"url": "/api/books", "params": {"level": "三年级", "limit": 20}}),
+        ("GET /api/books?search=tree", "GET", {"url": "/api/books", "params": {"search": "tree"}}),
+        ("GET /api/books/{id}", "GET", {"url": base}),
+        ("GET /api/books/{id}/chapters", "GET", {"url": f"{base}/chapters"}),
+        ("GET /api/books/{id}/chapters/{n}", "GET", {"url": f"{base}/chapters/1"}),
+        ("GET /api/books/{id}/chapters/{n}/content", "GET", {"url": f"{base}/chapters/1/content"}),
+        ("GET /api/books/{id}/vocabulary", "GET", {"url": f"{base}/vocabulary", "params": {"limit": 50}}),
+        ("POST /api/books/check-duplicate", "POST",
+         {"url": "/api/books/check-duplicate", "json": {"title": "Query Plan Check", "author": "Nobody"}}),
+    ]
+
+
+def explain(statement: str, parameters) -> List[str]:
+    with engine.connect() as conn:
+        raw = conn.connection.driver_connection
+        return [row[3] for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()]
+
+
+def plan_problems(route: str, plan: List[str]) -> List[str]:
+    problems = []
+    for detail in plan:
+        match = FULL_SCAN.match(detail)
+        if match and match.group(1) in TABLES and (route, match.group(1)) not in EXPECTED_SCANS:
+            problems.append(f"全表扫描: {detail}")
+        # 按索引等值查找后对少量命中行排序可以接受；扫描后再排序则不行
+        if detail == "USE TEMP B-TREE FOR ORDER BY" and not any(d.startswith("SEARCH") for d in plan):
+            problems.append("ORDER BY 未使用索引")
+    return problems
+
+
+async def capture(book_id: str) -> List[Tuple[str, str, object]]:
+    """依次请求各接口，返回 (接口名, SQL, 参数)"""
+    captured: List[Tuple[str, str, object]] = []
+    current = {"route": None}
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if current["route"] and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((current["route"], statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+            first_page = await client.get("/api/books", params={"limit": 1})
+            cursor = first_page.headers.get("x-next-cursor") or ""
+            for route, method, kwargs in route_cases(book_id, cursor):
+                current["route"] = route
+                response = await client.request(method, **kwargs)
+                if response.status_code >= 400:
+                    print(f"⚠️ {route} 返回 {response.status_code}")
+            current["route"] = None
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+    return captured
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Assert that books routes use SQLite indexes')
+    parser.add_argument('--verbose', action='store_true', help='Print every query plan')
+    args = parser.parse_args()
+
+    supabase_client._enabled = False  # 只检查本地SQLite查询
+    response_cache.enabled = False  # 每次请求都执行SQL
+    create_tables()
+    book_id = seed_book()
+    try:
+        captured = asyncio.run(capture(book_id))
+    finally:
+        remove_book(book_id)
+
+    failures = 0
+    checked_routes = set()
+    for route, statement, parameters in captured:
+        if not any(re.search(rf"\b{table}\b", statement) for table in TABLES):
+            continue
+        checked_routes.add(route)
+        plan = explain(statement, parameters)
+        problems = plan_problems(route, plan)
+        if problems or args.verbose:
+            print(f"\n[{route}] {' '.join(statement.split())[:160]}")
+            for detail in plan:
+                print(f"    {detail}")
+        for problem in problems:
+            failures += 1
+            print(f"  ❌ {problem}")
+
+    print(f"\n检查了 {len(checked_routes)} 个接口的 {len(captured)} 条查询")
+    if failures:
+        print(f"❌ {failures} 处查询未使用索引（是否已运行 scripts/migrate_add_indexes.py？）")
+        sys.exit(1)
+    print("✅ 所有查询均使用索引")
+
+
+if __name__ == '__main__':
+    main()
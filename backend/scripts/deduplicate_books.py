@@ -17,7 +17,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sqlalchemy.orm import Session  # noqa: E402
 
-from app.models.database import Book, BookVocabulary, Chapter, SessionLocal  # noqa: E402
+from app.models.database import Book, BookVocabulary, SessionLocal  # noqa: E402
+from app.services import search_index  # noqa: E402
+from app.services.chapter_store import chapter_store  # noqa: E402
 from app.utils.oss_helper import oss_helper  # noqa: E402
 from app.utils.supabase_client import supabase_client  # noqa: E402
 
@@ -106,8 +108,9 @@ def delete_book(session: Session, book: Book) -> Tuple[bool, List[str]]:
         step_logs.append(f"本地图片删除失败: {exc}")
 
     try:
-        session.query(Chapter).filter(Chapter.book_id == book_id).delete(synchronize_session=False)
+        chapter_store.delete_chapters(session, book_id)
         session.query(BookVocabulary).filter(BookVocabulary.book_id == book_id).delete(synchronize_session=False)
+        search_index.remove_book(session.connection(), book_id)
         session.delete(book)
         session.commit()
         step_logs.append("SQLite记录删除完成")
@@ -12,7 +12,8 @@ from pathlib import Path
 backend_dir = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from app.models.database import SessionLocal, Chapter  # noqa: E402
+from app.models.database import SessionLocal  # noqa: E402
+from app.services.chapter_store import chapter_store  # noqa: E402
 from app.utils.supabase_client import supabase_client  # noqa: E402
 
 logging.basicConfig(
@@ -61,7 +62,7 @@ def fix_chapter_image_urls(dry_run: bool = False) -> FixStats:
     session = SessionLocal()
 
     try:
-        chapters = session.query(Chapter).filter(Chapter.content.contains("/static/images/")).all()
+        chapters = chapter_store.find_chapters(session, "/static/images/")
         stats.total_chapters = len(chapters)
 
         if not chapters:
@@ -71,7 +72,7 @@ def fix_chapter_image_urls(dry_run: bool = False) -> FixStats:
         logger.info("📘 找到 %s 个章节仍引用本地图片，准备修复", stats.total_chapters)
 
         for chapter in chapters:
-            content = chapter.content or ""
+            content = chapter_store.chapter_html(session, chapter)
             updated_content, replacements = LOCAL_PREFIX_PATTERN.subn(OSS_PREFIX, content)
 
             if replacements == 0:
@@ -93,7 +94,7 @@ def fix_chapter_image_urls(dry_run: bool = False) -> FixStats:
                 continue
 
             try:
-                chapter.content = updated_content
+                chapter_store.set_chapter_html(session, chapter, updated_content)
                 session.add(chapter)
                 session.commit()
                 stats.chapters_updated += 1
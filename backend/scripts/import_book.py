@@ -4,24 +4,37 @@ EPUB 书籍导入脚本
 """
 import argparse
 import os
+import posixpath
 import re
 import sys
+import time
 import uuid
 import shutil
 import logging
 import zipfile
 from collections import Counter
-from typing import Dict, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote
 
 import ebooklib
 from ebooklib import epub
 from bs4 import BeautifulSoup
 from xml.etree import ElementTree as ET
 
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:  # lxml为可选依赖，未安装时使用标准库解析器
+    LXML_AVAILABLE = False
+
 # 添加项目路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.config import import_job_config
 from app.models.database import SessionLocal, create_tables, Book, Chapter, BookVocabulary
+from app.services import search_index
+from app.services.chapter_store import chapter_store
 from app.utils.oss_helper import oss_helper
 from app.utils.supabase_client import supabase_client
 
@@ -30,9 +43,29 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def resolve_html_parser(name: str) -> str:
+    """
+    IMPORT_HTML_PARSER：html.parser（默认）/ lxml
+
+    lxml需显式开启：两种解析器序列化出的HTML不完全相同（如XML声明），
+    会改变章节正文的content_hash，同一EPUB在不同主机上导入的结果应保持一致
+    """
+    name = (name or 'html.parser').strip().lower()
+    if name not in ('html.parser', 'lxml'):
+        logger.warning(f"⚠️ 不支持的IMPORT_HTML_PARSER: {name}，使用html.parser")
+        return 'html.parser'
+    if name == 'lxml' and not LXML_AVAILABLE:
+        logger.warning("⚠️ lxml未安装，使用html.parser解析章节HTML。请执行: pip3 install lxml")
+        return 'html.parser'
+    return name
+
+
+HTML_PARSER = resolve_html_parser(import_job_config.html_parser)
+
+
 def extract_text_from_html(html_content: str) -> str:
     """从 HTML 中提取纯文本"""
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, HTML_PARSER)
     return soup.get_text(separator=' ', strip=True)
 
 
@@ -44,20 +77,20 @@ def extract_words(text: str) -> list:
     return [w for w in words if len(w) > 2]
 
 
-def detect_chapter_type(soup, text: str) -> tuple[str, str]:
+def detect_chapter_type(page: 'ChapterPage') -> tuple[str, str]:
     """
-    检测章节类型并提取标题
+    检测章节类型并提取标题（使用 parse_chapter 的解析结果，不再遍历HTML）
     返回: (chapter_type, title)
     chapter_type: 'cover', 'toc', 'frontmatter', 'chapter', 'testimonial', 'skip'
     """
+    text = page.text
     # 标准化引号和其他特殊字符
     text_normalized = text.replace(''', "'").replace(''', "'").replace('"', '"').replace('"', '"')
     text_lower = text_normalized.lower()
-    images = soup.find_all('img')
+    images = page.has_images
 
     # 先获取标题标签内容
-    title_tag = soup.find(['h1', 'h2', 'h3'])
-    title_text = title_tag.get_text(strip=True) if title_tag else ''
+    title_text = page.title_text
     title_lower = title_text.lower()
 
     # 检测封面：有图片 + 文字很少 + 标题含"封面/cover"或无标题
@@ -348,6 +381,116 @@ def matches_href(item_name: str, target_href: str, opf_dir: Optional[str]) -> bo
         or normalized_item == resolved_target
         or normalized_item.endswith(normalized_target)
     )
+
+
+class ImageResolver:
+    """
+    章节中的图片引用 -> 新URL 的索引，每本书构建一次，每次查找O(1)
+
+    查找顺序：
+    1. 按引用所在章节文件的目录解析相对路径（支持 ../ 和 ./）后精确匹配图片路径
+    2. 去掉OPF目录前缀后匹配（引用写成EPUB压缩包内的完整路径时）
+    3. 按文件名匹配（同名图片取第一张）
+    """
+
+    def __init__(self, opf_dir: Optional[str] = None):
+        self.opf_prefix = normalize_epub_path(opf_dir).strip('/') + '/' if opf_dir else ''
+        self._by_path: Dict[str, str] = {}
+        self._by_name: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_path)
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return posixpath.normpath(normalize_epub_path(path)).lstrip('/')
+
+    def add(self, item_name: str, url: str) -> None:
+        """登记图片（item_name 为ebooklib中的图片路径，相对OPF目录）"""
+        path = self._normalize(item_name)
+        self._by_path.setdefault(path, url)
+        self._by_name.setdefault(posixpath.basename(path), url)
+
+    def resolve(self, ref: str, document_name: str = '') -> Optional[str]:
+        """解析章节 document_name 中的图片引用，未找到或为外部链接时返回None"""
+        if not ref or ref.startswith(('data:', 'http://', 'https://', '//')):
+            return None
+        ref = normalize_epub_path(unquote(ref.split('#', 1)[0].split('?', 1)[0]))
+        if not ref:
+            return None
+
+        if ref.startswith('/'):
+            path = self._normalize(ref)
+        else:
+            path = self._normalize(posixpath.join(posixpath.dirname(normalize_epub_path(document_name)), ref))
+        url = self._by_path.get(path)
+        if url is None and self.opf_prefix and path.startswith(self.opf_prefix):
+            url = self._by_path.get(path[len(self.opf_prefix):])
+        if url is None:
+            url = self._by_name.get(posixpath.basename(ref))
+        return url
+
+
+CHAPTER_SCAN_TAGS = frozenset(('img', 'image', 'h1', 'h2', 'h3'))
+
+
+class ChapterPage:
+    """章节HTML单次解析的结果：替换图片路径后的HTML、纯文本、单词，以及章节分类所需的信息"""
+
+    def __init__(self, html: str, text: str, words: List[str], has_images: bool, title_text: str):
+        self.html = html
+        self.text = text
+        self.words = words
+        self.has_images = has_images  # 是否包含<img>
+        self.title_text = title_text  # 第一个h1/h2/h3的文字
+
+
+def parse_chapter(content: str, document_name: str = '', image_resolver: Optional[ImageResolver] = None,
+                  parser: Optional[str] = None) -> ChapterPage:
+    """
+    解析一次章节HTML，同时完成图片路径替换、纯文本与单词提取，并收集章节分类信息
+
+    Args:
+        content: 章节HTML
+        document_name: 章节在EPUB中的路径（用于解析图片的相对路径）
+        image_resolver: 图片引用索引，为空时不替换图片路径
+        parser: BeautifulSoup解析器，默认 IMPORT_HTML_PARSER
+    """
+    soup = BeautifulSoup(content, parser or HTML_PARSER)
+    has_images = False
+    title_text = None
+
+    # 一次遍历找出图片与标题标签（文档顺序）；直接遍历节点比按标签名列表 find_all 快得多
+    for tag in soup.descendants:
+        if tag.name not in CHAPTER_SCAN_TAGS:
+            continue
+        if tag.name == 'img':
+            has_images = True
+            new_src = image_resolver.resolve(tag.get('src', ''), document_name) if image_resolver else None
+            if new_src:
+                tag['src'] = new_src
+        elif tag.name == 'image':
+            # SVG 中的 image 标签
+            href = tag.get('xlink:href', '') or tag.get('href', '')
+            new_path = image_resolver.resolve(href, document_name) if image_resolver else None
+            if new_path:
+                if tag.get('xlink:href'):
+                    tag['xlink:href'] = new_path
+                if tag.get('href'):
+                    tag['href'] = new_path
+        elif title_text is None:
+            title_text = tag.get_text(strip=True)
+
+    text = soup.get_text(separator=' ', strip=True)
+    return ChapterPage(
+        html=str(soup),
+        text=text,
+        words=extract_words(text),
+        has_images=has_images,
+        title_text=title_text or '',
+    )
+
+
 def extract_real_chapter_number(text: str) -> int:
     """从文本中提取真正的章节编号"""
     # 匹配 "Chapter X" 或 "第X章" 格式
@@ -362,7 +505,81 @@ def extract_real_chapter_number(text: str) -> int:
     return 0
 
 
-def import_epub(epub_path: str, level: str = None, lexile: str = None, series: str = None, category: str = None) -> str:
+def store_image(book_id: str, images_dir: str, unique_name: str, image_data: bytes) -> str:
+    """保存单张图片并返回URL：云端上传失败时按指数退避重试，仍失败则保存到本地"""
+    if oss_helper.enabled:
+        object_name = f"{book_id}/{unique_name}"
+        retries = import_job_config.image_retries
+        for attempt in range(retries + 1):
+            try:
+                new_url = oss_helper.upload_image(image_data, object_name)
+                logger.info(f"图片已上传到OSS: {object_name}")
+                return new_url
+            except Exception as e:
+                if attempt < retries:
+                    delay = import_job_config.image_retry_backoff * (2 ** attempt)
+                    logger.warning(f"OSS上传失败，{delay:.1f}秒后重试（{attempt + 1}/{retries}）: {e}")
+                    time.sleep(delay)
+                else:
+                    # OSS上传失败，fallback到本地存储
+                    logger.warning(f"OSS上传失败，使用本地存储: {e}")
+
+    os.makedirs(images_dir, exist_ok=True)
+    save_path = os.path.join(images_dir, unique_name)
+    new_url = oss_helper.save_image_local(image_data, save_path)
+    logger.info(f"图片已保存到本地: {save_path}")
+    return new_url
+
+
+def store_images(book_id: str, images_dir: str, images: List[Tuple[str, bytes]],
+                 on_progress: Optional[Callable[[int], None]] = None, workers: Optional[int] = None) -> List[str]:
+    """
+    在线程池中并发保存图片，返回与 images 顺序一致的URL列表
+
+    Args:
+        images: (唯一文件名, 图片数据) 列表
+        on_progress: 每完成一张图片时以已完成数调用；抛出异常时取消未开始的上传，
+            等待进行中的上传结束后再抛出（便于调用方清理已上传的图片）
+        workers: 线程数，默认 IMPORT_IMAGE_WORKERS
+    """
+    urls: List[Optional[str]] = [None] * len(images)
+    if not images:
+        return []
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers or import_job_config.image_workers),
+                              thread_name_prefix="image")
+    futures = {
+        pool.submit(store_image, book_id, images_dir, unique_name, image_data): index
+        for index, (unique_name, image_data) in enumerate(images)
+    }
+    try:
+        for done, future in enumerate(as_completed(futures), 1):
+            urls[futures[future]] = future.result()
+            if on_progress:
+                on_progress(done)
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        raise
+    finally:
+        pool.shutdown(wait=False)
+    return urls
+
+
+def discard_images(book_id: str, images_dir: str) -> None:
+    """清理导入失败（或取消）的书籍已上传的图片"""
+    # 清理OSS图片
+    if oss_helper.enabled:
+        oss_helper.delete_images(book_id)
+
+    # 清理本地图片目录
+    if os.path.exists(images_dir):
+        shutil.rmtree(images_dir)
+
+
+def import_epub(epub_path: str, level: str = None, lexile: str = None, series: str = None, category: str = None,
+                progress: Optional[Callable[[str, int, int], None]] = None) -> str:
     """
     导入 EPUB 文件到数据库
 
@@ -372,6 +589,9 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
         lexile: 蓝思值（如"530L"）
         series: 系列名（如"Magic Tree House"）
         category: 分类（'fiction'或'non-fiction'）
+        progress: 进度回调 (阶段, 已完成, 总数)，阶段依次为
+            images / chapters / vocabulary / saving / supabase；
+            写库提交前回调抛出异常会中止导入并清理已上传的图片
 
     Returns:
         书籍ID
@@ -414,6 +634,16 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
     backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     images_dir = os.path.join(backend_dir, "data", "images", book_id)
 
+    def report(stage: str, done: int, total: int) -> None:
+        """写库前的进度汇报；回调抛出异常时清理已上传的图片"""
+        if progress is None:
+            return
+        try:
+            progress(stage, done, total)
+        except Exception:
+            discard_images(book_id, images_dir)
+            raise
+
     # 解析OPF以辅助封面提取
     opf_root, opf_dir, manifest_items = load_opf_data(epub_path)
     manifest_map = build_manifest_map(manifest_items)
@@ -432,7 +662,7 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
             break
 
     # 提取并保存所有图片，建立映射关系
-    image_map = {}  # 原始路径 -> 新URL
+    image_resolver = ImageResolver(opf_dir)  # 章节中的图片引用 -> 新URL
     cover_path = None
     cover_candidates: list[tuple[int, str, str, str]] = []  # (优先级, url, 文件名, 描述)
 
@@ -440,6 +670,8 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
         cover_candidates.append((priority, url, name, reason))
         logger.info(f"📌 找到封面候选（{reason}）: {name}")
 
+    # 先按原顺序取出所有图片，再并发上传，最后按原顺序建立映射与识别封面
+    pending_images = []  # (item, 原路径, 规范化路径, 文件名, 唯一文件名, 图片数据)
     for item in book.get_items():
         if item.get_type() == ebooklib.ITEM_IMAGE:
             # 获取图片文件名
@@ -449,80 +681,63 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
 
             # 生成唯一文件名避免冲突
             unique_name = f"{uuid.uuid4().hex[:8]}_{file_name}"
-            image_data = item.get_content()
-
-            # 尝试上传到OSS，失败则使用本地存储
-            try:
-                if oss_helper.enabled:
-                    # 上传到OSS
-                    object_name = f"{book_id}/{unique_name}"
-                    new_url = oss_helper.upload_image(image_data, object_name)
-                    logger.info(f"图片已上传到OSS: {object_name}")
-                else:
-                    # 使用本地存储
-                    os.makedirs(images_dir, exist_ok=True)
-                    save_path = os.path.join(images_dir, unique_name)
-                    new_url = oss_helper.save_image_local(image_data, save_path)
-                    logger.info(f"图片已保存到本地: {save_path}")
+            pending_images.append((item, item_name, normalized_name, file_name, unique_name, item.get_content()))
 
-            except Exception as e:
-                # OSS上传失败，fallback到本地存储
-                logger.warning(f"OSS上传失败，使用本地存储: {e}")
-                os.makedirs(images_dir, exist_ok=True)
-                save_path = os.path.join(images_dir, unique_name)
-                new_url = oss_helper.save_image_local(image_data, save_path)
-
-            # 建立映射：各种可能的引用路径 -> 新URL
-            image_map[item_name] = new_url
-            image_map[file_name] = new_url
-            image_map[os.path.basename(item_name)] = new_url
-
-            # 相对路径变体
-            if '/' in item_name:
-                image_map['../' + item_name] = new_url
-                image_map['./' + item_name] = new_url
-
-            # 检查是否为封面图片
-            if cover_path:
+    report('images', 0, len(pending_images))
+    try:
+        image_urls = store_images(
+            book_id, images_dir, [(name, data) for *_, name, data in pending_images],
+            on_progress=(lambda done: progress('images', done, len(pending_images))) if progress else None,
+        )
+    except Exception:
+        discard_images(book_id, images_dir)
+        raise
+
+    for (item, item_name, normalized_name, file_name, _, _), new_url in zip(pending_images, image_urls):
+        # 建立映射：图片路径 -> 新URL（相对路径在替换时按章节目录解析）
+        image_resolver.add(item_name, new_url)
+
+        # 检查是否为封面图片
+        if cover_path:
+            continue
+
+        # 方法1：检查是否匹配metadata中的cover ID
+        if cover_image_id:
+            metadata_match = (
+                item.get_id() == cover_image_id or
+                file_name == cover_image_id or
+                normalized_name == normalize_epub_path(cover_image_id) or
+                normalized_name.endswith(normalize_epub_path(cover_image_id))
+            )
+            if not metadata_match and cover_image_id in manifest_map:
+                metadata_match = matches_href(normalized_name, manifest_map[cover_image_id], opf_dir)
+            if metadata_match:
+                cover_path = new_url
+                logger.info(f"✅ 找到封面图片（metadata）: {file_name}")
                 continue
 
-            # 方法1：检查是否匹配metadata中的cover ID
-            if cover_image_id:
-                metadata_match = (
-                    item.get_id() == cover_image_id or
-                    file_name == cover_image_id or
-                    normalized_name == normalize_epub_path(cover_image_id) or
-                    normalized_name.endswith(normalize_epub_path(cover_image_id))
-                )
-                if not metadata_match and cover_image_id in manifest_map:
-                    metadata_match = matches_href(normalized_name, manifest_map[cover_image_id], opf_dir)
-                if metadata_match:
-                    cover_path = new_url
-                    logger.info(f"✅ 找到封面图片（metadata）: {file_name}")
-                    continue
+        # 方法2：manifest属性properties="cover-image"
+        if manifest_cover_href and matches_href(normalized_name, manifest_cover_href, opf_dir):
+            cover_path = new_url
+            logger.info(f"✅ 找到封面图片（manifest cover-image）: {file_name}")
+            continue
 
-            # 方法2：manifest属性properties="cover-image"
-            if manifest_cover_href and matches_href(normalized_name, manifest_cover_href, opf_dir):
+        # 方法3：guide区域指向的封面
+        if guide_image_paths:
+            if (normalized_name in guide_image_paths or
+                    file_name.lower() in guide_image_basenames):
                 cover_path = new_url
-                logger.info(f"✅ 找到封面图片（manifest cover-image）: {file_name}")
+                logger.info(f"✅ 找到封面图片（guide引用）: {file_name}")
                 continue
 
-            # 方法3：guide区域指向的封面
-            if guide_image_paths:
-                if (normalized_name in guide_image_paths or
-                        file_name.lower() in guide_image_basenames):
-                    cover_path = new_url
-                    logger.info(f"✅ 找到封面图片（guide引用）: {file_name}")
-                    continue
-
-            # 方法4：常见文件名/路径模式
-            if is_cover_filename(file_name):
-                add_cover_candidate(1, new_url, file_name, '文件名匹配')
-                continue
+        # 方法4：常见文件名/路径模式
+        if is_cover_filename(file_name):
+            add_cover_candidate(1, new_url, file_name, '文件名匹配')
+            continue
 
-            # 方法5：单层目录的图片作为次级候选
-            if normalized_name.count('/') <= 1:
-                add_cover_candidate(2, new_url, file_name, '目录浅层图片')
+        # 方法5：单层目录的图片作为次级候选
+        if normalized_name.count('/') <= 1:
+            add_cover_candidate(2, new_url, file_name, '目录浅层图片')
 
     # 如果还没有找到封面，从候选列表中选择优先级最高的
     if not cover_path and cover_candidates:
@@ -532,53 +747,34 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
         logger.info(f"✅ 选择封面（候选: {reason}）: {name}")
 
     # 如果仍然没有封面，使用第一张图片（fallback）
-    if not cover_path and image_map:
-        cover_path = list(image_map.values())[0]
+    if not cover_path and image_urls:
+        cover_path = image_urls[0]
         logger.warning(f"⚠️  使用第一张图片作为封面（fallback）")
 
     # 提取章节内容
     chapters_data = []
+    chapter_texts = {}  # 章节ID -> 纯文本，用于写入全文索引
     all_words = []
 
+    document_total = sum(1 for item in book.get_items() if item.get_type() == ebooklib.ITEM_DOCUMENT)
+    documents_done = 0
     for item in book.get_items():
         if item.get_type() == ebooklib.ITEM_DOCUMENT:
+            report('chapters', documents_done, document_total)
+            documents_done += 1
+
             content = item.get_content().decode('utf-8', errors='ignore')
             item_name = item.get_name()  # 获取文档文件名
 
-            # 替换图片路径
-            soup = BeautifulSoup(content, 'html.parser')
-
-            for img in soup.find_all('img'):
-                src = img.get('src', '')
-                # 尝试多种匹配方式
-                new_src = None
-                for old_path, new_path in image_map.items():
-                    if old_path in src or src.endswith(old_path) or os.path.basename(src) == os.path.basename(old_path):
-                        new_src = new_path
-                        break
-                if new_src:
-                    img['src'] = new_src
-
-            # 也处理 image 标签 (SVG 中可能用到)
-            for img in soup.find_all('image'):
-                href = img.get('xlink:href', '') or img.get('href', '')
-                for old_path, new_path in image_map.items():
-                    if old_path in href or href.endswith(old_path):
-                        if img.get('xlink:href'):
-                            img['xlink:href'] = new_path
-                        if img.get('href'):
-                            img['href'] = new_path
-                        break
-
-            content = str(soup)
-
-            # 提取文本用于分析
-            text = extract_text_from_html(content)
-            words = extract_words(text)
+            # 解析一次：替换图片路径，同时提取文本用于分析
+            page = parse_chapter(content, item_name, image_resolver)
+            content = page.html
+            text = page.text
+            words = page.words
             all_words.extend(words)
 
             # 检测章节类型和标题
-            chapter_type, detected_title = detect_chapter_type(soup, text)
+            chapter_type, detected_title = detect_chapter_type(page)
 
             # 只保留正文章节，跳过所有前置内容
             if chapter_type in ('skip', 'cover', 'toc', 'frontmatter', 'testimonial'):
@@ -617,6 +813,9 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
                 'content': content,
                 'word_count': len(words)
             })
+            chapter_texts[chapters_data[-1]['id']] = text
+
+    report('chapters', document_total, document_total)
 
     # 按章节编号排序
     chapters_data.sort(key=lambda x: x['chapter_number'])
@@ -626,6 +825,7 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
         chapter['chapter_number'] = i + 1
 
     # 统计词频
+    report('vocabulary', 0, 1)
     word_counts = Counter(all_words)
     total_words = len(all_words)
 
@@ -650,10 +850,15 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
 
     high_freq_words = [(word, count) for word, count in word_counts.most_common(200)
                        if count >= 3 and word not in common_words][:100]
+    report('vocabulary', 1, 1)
 
     # 保存到数据库
     db = SessionLocal()
     try:
+        # 最后一个可取消的检查点，此后的回调异常按导入失败处理
+        if progress:
+            progress('saving', 0, 1)
+
         # 创建书籍记录
         db_book = Book(
             id=book_id,
@@ -671,8 +876,10 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
         db.add(db_book)
 
         # 创建章节记录
+        # 正文写入章节存储（按内容哈希去重），chapters 只保存哈希
         for chapter_data in chapters_data:
-            db_chapter = Chapter(**chapter_data)
+            fields = {key: value for key, value in chapter_data.items() if key != 'content'}
+            db_chapter = Chapter(**fields, **chapter_store.content_fields(db, chapter_data['content']))
             db.add(db_chapter)
 
         # 创建词汇记录
@@ -685,12 +892,23 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
             )
             db.add(db_vocab)
 
+        # 写入全文索引（与书籍记录同一事务提交）
+        search_index.index_book(
+            db.connection(), book_id, title, author, series,
+            [(c['chapter_number'], c['title'], chapter_texts[c['id']]) for c in chapters_data],
+        )
+
         db.commit()
+        if progress:
+            # 已提交，回调不应再中止导入
+            progress('saving', 1, 1)
 
         # 同时写入Supabase（如果已配置）
         if supabase_client.enabled:
             try:
                 logger.info("📤 开始同步数据到Supabase...")
+                if progress:
+                    progress('supabase', 0, 3)
 
                 # 1. 插入书籍数据
                 book_data_for_supabase = {
@@ -707,6 +925,8 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
                     'epub_path': epub_path,
                 }
                 supabase_client.insert_book(book_data_for_supabase)
+                if progress:
+                    progress('supabase', 1, 3)
 
                 # 2. 批量插入章节数据
                 chapters_for_supabase = []
@@ -720,6 +940,8 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
                         'word_count': chapter_data['word_count'],
                     })
                 supabase_client.bulk_insert_chapters(chapters_for_supabase)
+                if progress:
+                    progress('supabase', 2, 3)
 
                 # 3. 批量插入词汇数据
                 vocab_for_supabase = []
@@ -731,6 +953,8 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
                         'frequency': freq,
                     })
                 supabase_client.bulk_insert_vocabulary(vocab_for_supabase)
+                if progress:
+                    progress('supabase', 3, 3)
 
                 logger.info("✅ 数据已成功同步到Supabase")
             except Exception as e:
@@ -741,7 +965,7 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
         print(f"   - Chapters: {len(chapters_data)}")
         print(f"   - Total words: {total_words}")
         print(f"   - High-freq vocabulary: {len(high_freq_words)}")
-        print(f"   - Images: {len(image_map) // 3}")  # 除以3因为每张图有多个映射
+        print(f"   - Images: {len(image_urls)}")
         print(f"   - Cover: {cover_path}")
         print(f"   - Book ID: {book_id}")
 
@@ -751,15 +975,7 @@ def import_epub(epub_path: str, level: str = None, lexile: str = None, series: s
         db.rollback()
         # 清理已创建的图片
         logger.error(f"导入书籍失败，清理图片资源: {e}")
-
-        # 清理OSS图片
-        if oss_helper.enabled:
-            oss_helper.delete_images(book_id)
-
-        # 清理本地图片目录
-        if os.path.exists(images_dir):
-            shutil.rmtree(images_dir)
-
+        discard_images(book_id, images_dir)
         raise e
     finally:
         db.close()
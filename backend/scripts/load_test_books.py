@@ -0,0 +1,100 @@
+"""
+书籍读取接口并发压测：对比数据访问在事件循环中直接执行（DB_THREADPOOL_SIZE=0，旧行为）
+与派发到数据库线程池时的吞吐量
+
+用模拟的Supabase客户端（固定网络延迟）代替真实服务，通过ASGI直接调用应用，不占用端口
+用法:
+    python load_test_books.py --requests 400 --concurrency 50 --latency-ms 30 --pool-size 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+import httpx
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import db_executor_config  # noqa: E402
+from app.services import db_executor  # noqa: E402
+from app.services.response_cache import response_cache  # noqa: E402
+from app.utils.supabase_client import supabase_client  # noqa: E402
+from main import app  # noqa: E402
+
+
+def install_fake_supabase(latency_ms: float):
+    """用固定延迟的同步桩替换Supabase章节查询（模拟supabase-py的阻塞网络调用）"""
+
+    def get_chapter(book_id: str, chapter_number: int):
+        time.sleep(latency_ms / 1000)
+        return {
+            "id": f"{book_id}-{chapter_number}",
+            "chapter_number": chapter_number,
+            "title": f"Chapter {chapter_number}",
+            "content": "<p>Once upon a time.</p>",
+            "word_count": 4,
+        }
+
+    supabase_client._enabled = True
+    supabase_client.get_chapter = get_chapter
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run(total: int, concurrency: int):
+    """返回 (吞吐量req/s, 各请求延迟ms)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        async def one(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(f"/api/books/load-test/chapters/{i + 1}")
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+    return total / elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test books read endpoints')
+    parser.add_argument('--requests', type=int, default=400, help='Total requests per mode')
+    parser.add_argument('--concurrency', type=int, default=50, help='Concurrent requests')
+    parser.add_argument('--latency-ms', type=float, default=30.0, help='Simulated Supabase latency')
+    parser.add_argument('--pool-size', type=int, default=db_executor_config.threadpool_size or 10,
+                        help='DB thread pool size for the pooled mode')
+    args = parser.parse_args()
+
+    install_fake_supabase(args.latency_ms)
+    response_cache.enabled = False  # 每次请求都访问数据源
+
+    results = {}
+    for name, size in (("inline (0)", 0), (f"threadpool ({args.pool_size})", args.pool_size)):
+        db_executor.shutdown_executor()
+        db_executor_config.threadpool_size = size
+        results[name] = asyncio.run(run(args.requests, args.concurrency))
+    db_executor.shutdown_executor()
+
+    print(f"请求数: {args.requests}  并发: {args.concurrency}  模拟Supabase延迟: {args.latency_ms}ms")
+    print(f"{'模式':<18}{'吞吐(req/s)':>12}{'p50(ms)':>10}{'p99(ms)':>10}{'mean(ms)':>10}")
+    for name, (throughput, latencies) in results.items():
+        print(
+            f"{name:<18}{throughput:>12.1f}{percentile(latencies, 50):>10.1f}"
+            f"{percentile(latencies, 99):>10.1f}{statistics.mean(latencies):>10.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
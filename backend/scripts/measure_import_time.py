@@ -0,0 +1,78 @@
+"""
+API启动导入耗时测量
+在子进程中执行 `python -X importtime -c "import main"`，统计 main:app 的导入总耗时，
+列出耗时最多的模块，超出预算时以非零状态退出（可用于CI）
+
+用法:
+    python measure_import_time.py --budget-ms 2000 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_once():
+    """返回 (墙钟耗时ms, [(累计us, 自身us, 模块名)])"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        sys.exit(proc.returncode)
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules.append((int(cumulative_us), int(self_us), name.rstrip()))
+        except ValueError:
+            continue
+    return wall_ms, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure import time of main:app')
+    parser.add_argument('--budget-ms', type=float, default=2000, help='Fail when import of main exceeds this')
+    parser.add_argument('--top', type=int, default=15, help='Show the N slowest top-level imports')
+    parser.add_argument('--runs', type=int, default=3, help='Take the best of N runs')
+    args = parser.parse_args()
+
+    best = None
+    for _ in range(args.runs):
+        wall_ms, modules = measure_once()
+        main_us = next((cum for cum, _, name in modules if name.strip() == "main"), 0)
+        if best is None or main_us < best[1]:
+            best = (wall_ms, main_us, modules)
+
+    wall_ms, main_us, modules = best
+    main_ms = main_us / 1000
+    print(f"import main 耗时: {main_ms:.0f}ms (进程总耗时 {wall_ms:.0f}ms, 预算 {args.budget_ms:.0f}ms)")
+
+    # 只展示顶层导入（名称无缩进的第一层依赖）
+    top_level = [m for m in modules if m[2].startswith("  ") and not m[2].startswith("    ")]
+    print(f"\n{'累计(ms)':>10}{'自身(ms)':>10}  模块")
+    for cumulative_us, self_us, name in sorted(top_level or modules, reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>10.1f}{self_us / 1000:>10.1f}  {name.strip()}")
+
+    if "nltk" in {name.strip() for _, _, name in modules}:
+        print("\n⚠️ nltk 在导入阶段被加载，应改为首次词形还原时懒加载")
+
+    if main_ms > args.budget_ms:
+        print(f"\n❌ 超出导入耗时预算 ({main_ms:.0f}ms > {args.budget_ms:.0f}ms)")
+        sys.exit(1)
+    print("\n✅ 导入耗时在预算内")
+
+
+if __name__ == '__main__':
+    main()
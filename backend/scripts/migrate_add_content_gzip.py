@@ -0,0 +1,93 @@
+"""
+数据库迁移脚本：为chapters表添加content_gzip字段，并为已有章节生成预压缩HTML
+使用方法：python migrate_add_content_gzip.py [--skip-backfill]
+"""
+import argparse
+import gzip
+import os
+import sqlite3
+import sys
+import logging
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.database import DB_PATH  # noqa: E402
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+
+
+def migrate_database(backfill: bool = True) -> bool:
+    """添加content_gzip字段并回填"""
+    if not os.path.exists(DB_PATH):
+        logger.error(f"数据库文件不存在: {DB_PATH}")
+        return False
+
+    logger.info(f"连接数据库: {DB_PATH}")
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("PRAGMA table_info(chapters)")
+        columns = [column[1] for column in cursor.fetchall()]
+
+        if 'content_gzip' not in columns:
+            logger.info("添加content_gzip字段...")
+            cursor.execute("ALTER TABLE chapters ADD COLUMN content_gzip BLOB")
+            conn.commit()
+            logger.info("✅ content_gzip字段添加成功")
+        else:
+            logger.info("content_gzip字段已存在，跳过")
+
+        if not backfill:
+            return True
+
+        rows = cursor.execute(
+            "SELECT id FROM chapters WHERE content_gzip IS NULL AND content IS NOT NULL AND content != ''"
+        ).fetchall()
+        chapter_ids = [row[0] for row in rows]
+        logger.info(f"需要回填的章节: {len(chapter_ids)} 个")
+
+        raw_bytes = compressed_bytes = 0
+        for start in range(0, len(chapter_ids), BATCH_SIZE):
+            batch = chapter_ids[start:start + BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            updates = []
+            for chapter_id, content in cursor.execute(
+                f"SELECT id, content FROM chapters WHERE id IN ({placeholders})", batch
+            ).fetchall():
+                data = content.encode('utf-8')
+                blob = gzip.compress(data, compresslevel=9)
+                raw_bytes += len(data)
+                compressed_bytes += len(blob)
+                updates.append((blob, chapter_id))
+            cursor.executemany("UPDATE chapters SET content_gzip = ? WHERE id = ?", updates)
+            conn.commit()
+            logger.info(f"已回填 {min(start + BATCH_SIZE, len(chapter_ids))}/{len(chapter_ids)}")
+
+        if raw_bytes:
+            logger.info(
+                f"✅ 回填完成: 原始 {raw_bytes / 1024:.1f}KB → 压缩 {compressed_bytes / 1024:.1f}KB "
+                f"({compressed_bytes / raw_bytes * 100:.1f}%)"
+            )
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 迁移失败: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Add chapters.content_gzip and backfill it')
+    parser.add_argument('--skip-backfill', action='store_true', help='Only add the column')
+    args = parser.parse_args()
+    success = migrate_database(backfill=not args.skip_backfill)
+    sys.exit(0 if success else 1)
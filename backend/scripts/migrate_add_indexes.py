@@ -0,0 +1,94 @@
+"""
+数据库迁移脚本：为已有数据库补建索引
+- chapters(book_id, chapter_number) 唯一索引（新库由模型中的UniqueConstraint创建，效果相同）
+- book_vocabulary(book_id, frequency)
+- books(created_at, id)、books(level, created_at, id)、books(lower(trim(title)))
+建唯一索引前会检查重复章节号，存在重复时列出并跳过（需先清理数据）
+使用方法：python migrate_add_indexes.py
+"""
+import os
+import sqlite3
+import sys
+import logging
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.database import DB_PATH  # noqa: E402
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+INDEXES = [
+    ("ix_books_created_at_id", "CREATE INDEX IF NOT EXISTS ix_books_created_at_id ON books (created_at, id)"),
+    ("ix_books_level_created_at_id",
+     "CREATE INDEX IF NOT EXISTS ix_books_level_created_at_id ON books (level, created_at, id)"),
+    ("ix_books_title_normalized",
+     "CREATE INDEX IF NOT EXISTS ix_books_title_normalized ON books (lower(trim(title)))"),
+    ("ix_book_vocabulary_book_id_frequency",
+     "CREATE INDEX IF NOT EXISTS ix_book_vocabulary_book_id_frequency ON book_vocabulary (book_id, frequency)"),
+]
+CHAPTER_UNIQUE_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_chapters_book_id_chapter_number ON chapters (book_id, chapter_number)"
+)
+
+
+def has_chapter_unique_index(cursor) -> bool:
+    """是否已有 (book_id, chapter_number) 唯一索引（模型建表时为sqlite_autoindex_*）"""
+    for _, name, unique, *_ in cursor.execute("PRAGMA index_list(chapters)").fetchall():
+        if not unique:
+            continue
+        columns = [row[2] for row in cursor.execute(f"PRAGMA index_info('{name}')").fetchall()]
+        if columns == ['book_id', 'chapter_number']:
+            return True
+    return False
+
+
+def migrate_database() -> bool:
+    """创建缺失的索引并更新查询规划器统计信息"""
+    if not os.path.exists(DB_PATH):
+        logger.error(f"数据库文件不存在: {DB_PATH}")
+        return False
+
+    logger.info(f"连接数据库: {DB_PATH}")
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    try:
+        for name, sql in INDEXES:
+            cursor.execute(sql)
+            logger.info(f"✅ 索引就绪: {name}")
+
+        if has_chapter_unique_index(cursor):
+            logger.info("章节唯一索引已存在，跳过")
+        else:
+            duplicates = cursor.execute(
+                "SELECT book_id, chapter_number, COUNT(*) FROM chapters "
+                "GROUP BY book_id, chapter_number HAVING COUNT(*) > 1"
+            ).fetchall()
+            if duplicates:
+                logger.warning(f"⚠️ 发现 {len(duplicates)} 组重复章节号，未创建唯一索引：")
+                for book_id, chapter_number, count in duplicates[:20]:
+                    logger.warning(f"   书籍 {book_id} 第{chapter_number}章 × {count}")
+            else:
+                cursor.execute(CHAPTER_UNIQUE_INDEX)
+                logger.info("✅ 索引就绪: uq_chapters_book_id_chapter_number")
+
+        cursor.execute("ANALYZE")
+        conn.commit()
+        logger.info("✅ 迁移完成")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ 迁移失败: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    success = migrate_database()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,125 @@
+"""
+数据库迁移脚本：将章节正文移出 chapters 表，存入按内容寻址的 chapter_blobs 表
+- 为chapters表添加content_hash字段及索引（未执行过 migrate_add_content_gzip.py 的数据库同时补上content_gzip字段），
+  创建chapter_blobs表
+- 已有章节的 content / content_gzip 压缩后按SHA-256写入chapter_blobs（相同内容只存一份），原列置空
+- 可选 --vacuum 回收数据库文件空间
+使用方法：python migrate_chapter_blobs.py [--dry-run] [--vacuum]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import logging
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import or_  # noqa: E402
+
+from app.models.database import DB_PATH, SessionLocal, create_tables, Chapter  # noqa: E402
+from app.services.chapter_store import chapter_store  # noqa: E402
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 200
+
+
+def add_schema() -> None:
+    """添加content_hash字段与索引，并创建chapter_blobs表"""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        columns = [column[1] for column in conn.execute("PRAGMA table_info(chapters)").fetchall()]
+        if 'content_gzip' not in columns:
+            # 章节模型与迁移查询都会读取该列
+            logger.info("添加content_gzip字段...")
+            conn.execute("ALTER TABLE chapters ADD COLUMN content_gzip BLOB")
+        if 'content_hash' not in columns:
+            logger.info("添加content_hash字段...")
+            conn.execute("ALTER TABLE chapters ADD COLUMN content_hash VARCHAR")
+        else:
+            logger.info("content_hash字段已存在，跳过")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_chapters_content_hash ON chapters (content_hash)")
+        conn.commit()
+    finally:
+        conn.close()
+    create_tables()
+
+
+def move_contents(dry_run: bool) -> int:
+    """分批将旧章节正文写入章节存储，返回迁移的章节数"""
+    db = SessionLocal()
+    moved = 0
+    try:
+        pending = db.query(Chapter.id).filter(
+            Chapter.content_hash.is_(None),
+            or_(Chapter.content.isnot(None), Chapter.content_gzip.isnot(None)),
+        ).all()
+        chapter_ids = [chapter_id for (chapter_id,) in pending]
+        logger.info(f"需要迁移的章节: {len(chapter_ids)} 个")
+        if dry_run:
+            return len(chapter_ids)
+
+        for start in range(0, len(chapter_ids), BATCH_SIZE):
+            batch = chapter_ids[start:start + BATCH_SIZE]
+            for chapter in db.query(Chapter).filter(Chapter.id.in_(batch)):
+                html = chapter_store.chapter_html(db, chapter)
+                if not html:
+                    continue
+                chapter.content_hash = chapter_store.put(db, html)
+                chapter.content = None
+                chapter.content_gzip = None
+                moved += 1
+            db.commit()
+            logger.info(f"已迁移 {min(start + BATCH_SIZE, len(chapter_ids))}/{len(chapter_ids)}")
+
+        stats = chapter_store.stats(db)
+        if stats["raw_bytes"]:
+            logger.info(
+                f"✅ 章节存储: {stats['references']} 个章节引用 {stats['blobs']} 份正文, "
+                f"原始 {stats['raw_bytes'] / 1024 / 1024:.1f}MB → 压缩 {stats['stored_bytes'] / 1024 / 1024:.1f}MB"
+            )
+        return moved
+    finally:
+        db.close()
+
+
+def vacuum() -> None:
+    size_before = os.path.getsize(DB_PATH)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    size_after = os.path.getsize(DB_PATH)
+    logger.info(f"✅ VACUUM完成: {size_before / 1024 / 1024:.1f}MB → {size_after / 1024 / 1024:.1f}MB")
+
+
+def migrate_database(dry_run: bool = False, run_vacuum: bool = False) -> bool:
+    if not os.path.exists(DB_PATH):
+        logger.error(f"数据库文件不存在: {DB_PATH}")
+        return False
+
+    logger.info(f"连接数据库: {DB_PATH}")
+    try:
+        add_schema()
+        moved = move_contents(dry_run)
+        if not dry_run:
+            logger.info(f"✅ 迁移完成: {moved} 个章节")
+            if run_vacuum:
+                vacuum()
+        return True
+    except Exception as e:
+        logger.error(f"❌ 迁移失败: {e}")
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Move chapter HTML into the content-addressed chapter_blobs table')
+    parser.add_argument('--dry-run', action='store_true', help='Only count chapters to migrate')
+    parser.add_argument('--vacuum', action='store_true', help='VACUUM the database afterwards to reclaim space')
+    args = parser.parse_args()
+    success = migrate_database(dry_run=args.dry_run, run_vacuum=args.vacuum)
+    sys.exit(0 if success else 1)
@@ -12,7 +12,8 @@ from pathlib import Path
 backend_dir = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from app.models.database import SessionLocal, Book, Chapter
+from app.models.database import SessionLocal, Book
+from app.services.chapter_store import chapter_store
 from app.utils.oss_helper import oss_helper
 from app.utils.supabase_client import supabase_client
 
@@ -98,7 +99,7 @@ def migrate_chapter_images(db, dry_run: bool = False):
         logger.error("❌ 阿里云OSS未启用，无法执行章节内容迁移")
         return
 
-    chapters = db.query(Chapter).filter(Chapter.content.contains('/static/images/')).all()
+    chapters = chapter_store.find_chapters(db, '/static/images/')
     if not chapters:
         logger.info("✅ 没有章节引用本地图片，无需迁移")
         return
@@ -112,7 +113,7 @@ def migrate_chapter_images(db, dry_run: bool = False):
 
     for chapter in chapters:
         try:
-            content = chapter.content or ""
+            content = chapter_store.chapter_html(db, chapter)
             image_paths = IMAGE_TAG_PATTERN.findall(content)
             unique_images = list(dict.fromkeys(image_paths))
 
@@ -166,7 +167,7 @@ def migrate_chapter_images(db, dry_run: bool = False):
             for src, dest in replacements:
                 updated_content = updated_content.replace(src, dest)
 
-            chapter.content = updated_content
+            chapter_store.set_chapter_html(db, chapter, updated_content)
             db.commit()
             success_chapters += 1
             uploaded_images += len(replacements)
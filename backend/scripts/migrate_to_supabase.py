@@ -12,6 +12,7 @@ from typing import Dict, List, Any
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.models.database import SessionLocal, Book, Chapter, BookVocabulary
+from app.services.chapter_store import chapter_store
 from app.utils.supabase_client import supabase_client
 
 # 配置日志
@@ -127,7 +128,7 @@ def migrate_chapters(db_session, book_success_map: Dict[str, bool], stats: Migra
                 'book_id': chapter.book_id,
                 'chapter_number': chapter.chapter_number,
                 'title': chapter.title,
-                'content': chapter.content,
+                'content': chapter_store.chapter_html(db_session, chapter),
                 'word_count': chapter.word_count,
             }
             chapters_data.append(chapter_data)
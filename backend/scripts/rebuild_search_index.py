@@ -0,0 +1,73 @@
+"""
+全文索引重建脚本
+从SQLite中的书籍与章节全量重建 books_fts / chapters_fts（升级前导入的书籍需要运行一次）
+
+用法:
+    python rebuild_search_index.py              # 重建全部书籍
+    python rebuild_search_index.py --book <id>  # 只重建指定书籍
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.database import SessionLocal, Book, Chapter  # noqa: E402
+from app.services import search_index  # noqa: E402
+from app.services.chapter_store import chapter_store  # noqa: E402
+from scripts.import_book import extract_text_from_html  # noqa: E402
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def rebuild(book_ids=None) -> int:
+    """逐本重建索引，每本书单独提交，返回处理的书籍数"""
+    if not search_index.ensure_search_index():
+        logger.error("❌ 当前SQLite不支持FTS5，无法建立全文索引")
+        return 0
+
+    db = SessionLocal()
+    try:
+        query = db.query(Book.id, Book.title, Book.author, Book.series)
+        if book_ids:
+            query = query.filter(Book.id.in_(book_ids))
+        books = query.all()
+
+        started = time.perf_counter()
+        for index, (book_id, title, author, series) in enumerate(books, 1):
+            chapters = (
+                db.query(Chapter.chapter_number, Chapter.title, Chapter.content, Chapter.content_gzip,
+                         Chapter.content_hash)
+                .filter(Chapter.book_id == book_id)
+                .order_by(Chapter.chapter_number)
+                .all()
+            )
+            search_index.index_book(
+                db.connection(), book_id, title, author, series,
+                [(chapter.chapter_number, chapter.title, extract_text_from_html(chapter_store.chapter_html(db, chapter)))
+                 for chapter in chapters],
+            )
+            db.commit()
+            if index % 50 == 0:
+                logger.info(f"已索引 {index}/{len(books)} 本")
+
+        logger.info(f"✅ 全文索引重建完成: {len(books)} 本书, 耗时 {time.perf_counter() - started:.1f}s")
+        return len(books)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the FTS5 search index from SQLite')
+    parser.add_argument('--book', action='append', default=[], help='Only rebuild this book id (repeatable)')
+    args = parser.parse_args()
+    rebuild(args.book or None)
+
+
+if __name__ == '__main__':
+    main()
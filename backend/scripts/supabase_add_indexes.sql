@@ -0,0 +1,20 @@
+-- Supabase数据库迁移脚本：与SQLite模型保持一致的索引
+-- 在Supabase控制台的SQL编辑器中运行此脚本
+
+-- 书籍列表：按 (created_at, id) 倒序做keyset分页
+CREATE INDEX IF NOT EXISTS ix_books_created_at_id ON books (created_at DESC, id DESC);
+
+-- 按难度等级筛选后分页
+CREATE INDEX IF NOT EXISTS ix_books_level_created_at_id ON books (level, created_at DESC, id DESC);
+
+-- 章节：按书籍取目录 / 按章节号取单章，同一本书章节号唯一
+CREATE UNIQUE INDEX IF NOT EXISTS uq_chapters_book_id_chapter_number ON chapters (book_id, chapter_number);
+
+-- 书籍高频词：按书籍过滤并按出现次数倒序
+CREATE INDEX IF NOT EXISTS ix_book_vocabulary_book_id_frequency ON book_vocabulary (book_id, frequency DESC);
+
+-- 检查是否存在重复章节号（唯一索引创建失败时先运行此查询清理数据）
+-- SELECT book_id, chapter_number, COUNT(*)
+-- FROM chapters
+-- GROUP BY book_id, chapter_number
+-- HAVING COUNT(*) > 1;
@@ -487,10 +487,12 @@ export default function ReaderPage() {
       try {
         setLoading(true);
         setError(null);
-        const chapterNumber = chapters[currentChapterIndex].chapter_number;
+        const summary = chapters[currentChapterIndex];
+        const chapterNumber = summary.chapter_number;
         console.log('Loading chapter:', chapterNumber, 'at index:', currentChapterIndex);
-        const response = await booksAPI.getChapter(currentBook.id, chapterNumber);
-        setCurrentChapter(response.data);
+        // 标题、字数等已在章节目录中，只需获取正文
+        const response = await booksAPI.getChapterContent(currentBook.id, chapterNumber);
+        setCurrentChapter({ ...summary, content: response.data });
 
         // 保存阅读进度
         const savedState = lastReadingStateRef.current;
@@ -2,8 +2,26 @@ import { useState, useRef, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Upload, FileText, CheckCircle, AlertCircle, ArrowLeft, Loader2 } from 'lucide-react';
 import { booksAPI } from '../services/api';
+import type { ImportJob, ImportStage } from '../services/api';
 import { useAuthStore } from '../stores/useAuthStore';
 
+// 导入阶段显示名称（顺序与后端一致）
+const IMPORT_STAGES: { key: ImportStage; label: string }[] = [
+  { key: 'images', label: '上传图片' },
+  { key: 'chapters', label: '解析章节' },
+  { key: 'vocabulary', label: '统计词汇' },
+  { key: 'saving', label: '写入数据库' },
+  { key: 'supabase', label: '同步到云端' },
+];
+
+// 导入进度轮询间隔（毫秒）
+const IMPORT_POLL_INTERVAL = 1000;
+// 轮询连续失败达到该次数才放弃（偶发的网络错误继续轮询，后台任务不受影响）
+const IMPORT_POLL_MAX_ERRORS = 5;
+
+const isImportFinished = (job: ImportJob) =>
+  job.status === 'completed' || job.status === 'failed' || job.status === 'cancelled';
+
 const extractTitleFromFileName = (fileName: string) => {
   return fileName
     .replace(/\.[^.]+$/, '') // 去掉扩展名
@@ -16,6 +34,14 @@ export default function UploadPage() {
   const { user } = useAuthStore();
   const fileInputRef = useRef<HTMLInputElement>(null);
   const duplicateCheckIdRef = useRef(0);
+  const unmountedRef = useRef(false);
+
+  useEffect(() => {
+    unmountedRef.current = false;
+    return () => {
+      unmountedRef.current = true;
+    };
+  }, []);
 
   // 检查登录状态
   useEffect(() => {
@@ -33,6 +59,7 @@ export default function UploadPage() {
   const [uploading, setUploading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [success, setSuccess] = useState(false);
+  const [importJob, setImportJob] = useState<ImportJob | null>(null);
   const [dragActive, setDragActive] = useState(false);
   const [checkingDuplicate, setCheckingDuplicate] = useState(false);
   const [duplicateDialogOpen, setDuplicateDialogOpen] = useState(false);
@@ -121,6 +148,46 @@ export default function UploadPage() {
     }
   };
 
+  // 轮询导入任务直到结束（离开页面后停止轮询，任务仍在后台继续）
+  const waitForImport = async (jobId: string): Promise<ImportJob | null> => {
+    let failures = 0;
+    while (!unmountedRef.current) {
+      await new Promise((resolve) => setTimeout(resolve, IMPORT_POLL_INTERVAL));
+      let data: ImportJob;
+      try {
+        ({ data } = await booksAPI.getImportJob(jobId));
+        failures = 0;
+      } catch (error: any) {
+        if (error.response?.status === 404) {
+          setError('导入任务不存在，请重新上传');
+          return null;
+        }
+        failures += 1;
+        console.warn(`Import job poll failed (${failures}/${IMPORT_POLL_MAX_ERRORS}):`, error);
+        if (failures >= IMPORT_POLL_MAX_ERRORS) {
+          setError('暂时无法获取导入进度，导入仍在后台进行，请稍后到书架查看');
+          return null;
+        }
+        continue;
+      }
+      if (unmountedRef.current) break;
+      setImportJob(data);
+      if (isImportFinished(data)) return data;
+    }
+    return null;
+  };
+
+  const handleCancelImport = async () => {
+    if (!importJob) return;
+    try {
+      const { data } = await booksAPI.cancelImportJob(importJob.id);
+      setImportJob(data);
+    } catch (error: any) {
+      console.error('Cancel import failed:', error);
+      setError(error.response?.data?.detail || '取消失败，请重试');
+    }
+  };
+
   const handleUpload = async () => {
     if (!file) {
       setError('请选择要上传的文件');
@@ -134,6 +201,7 @@ export default function UploadPage() {
 
     setUploading(true);
     setError(null);
+    setImportJob(null);
 
     try {
       const finalSeries = customSeries || series;
@@ -144,7 +212,17 @@ export default function UploadPage() {
       if (category) options.category = category;
 
       // Note: 后端仍需要level参数，这里传默认值"学前"
-      await booksAPI.uploadBook(file, '学前', options);
+      const { data: job } = await booksAPI.uploadBook(file, '学前', options);
+      setImportJob(job);
+
+      // 文件已上传，解析和入库在后台进行
+      const finished = await waitForImport(job.id);
+      if (!finished) return;
+      if (finished.status !== 'completed') {
+        setError(finished.status === 'cancelled' ? '已取消导入' : `导入失败：${finished.error || '请重试'}`);
+        return;
+      }
+
       setSuccess(true);
       setFile(null);
       setSeries('');
@@ -317,6 +395,43 @@ export default function UploadPage() {
           </div>
         )}
 
+        {/* 导入进度 */}
+        {importJob && !isImportFinished(importJob) && (
+          <div className="mt-6 p-4 bg-teal-50 border border-teal-200 rounded-lg">
+            <div className="flex items-center justify-between mb-3">
+              <p className="text-teal-800 font-medium flex items-center gap-2">
+                <Loader2 className="w-4 h-4 animate-spin" />
+                {importJob.status === 'queued' ? '排队等待导入...' : importJob.cancel_requested ? '正在取消...' : '正在导入...'}
+              </p>
+              {!importJob.cancel_requested && importJob.stage !== 'supabase' && (
+                <button
+                  onClick={handleCancelImport}
+                  className="text-sm text-gray-600 hover:text-red-600 transition-colors"
+                >
+                  取消导入
+                </button>
+              )}
+            </div>
+            <ul className="space-y-1 text-sm">
+              {IMPORT_STAGES.map(({ key, label }) => {
+                const { done, total } = importJob.progress[key] ?? { done: 0, total: null };
+                const finished = total !== null && done >= total;
+                return (
+                  <li
+                    key={key}
+                    className={`flex justify-between ${
+                      importJob.stage === key ? 'text-teal-800 font-medium' : finished ? 'text-gray-700' : 'text-gray-400'
+                    }`}
+                  >
+                    <span>{label}</span>
+                    <span>{total === null ? '—' : finished ? '完成' : `${done}/${total}`}</span>
+                  </li>
+                );
+              })}
+            </ul>
+          </div>
+        )}
+
         {/* 成功提示 */}
         {success && (
           <div className="mt-6 p-4 bg-green-50 border border-green-200 rounded-lg flex items-start gap-3">
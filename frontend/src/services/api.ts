@@ -17,11 +17,18 @@ const api = axios.create({
   timeout: 10000,
 });
 
-// 上传响应类型
-interface UploadResponse {
-  success: boolean;
-  message: string;
-  book: {
+// 导入任务阶段：图片、章节、词汇、写库、Supabase同步
+export type ImportStage = 'images' | 'chapters' | 'vocabulary' | 'saving' | 'supabase';
+
+// 导入任务（上传接口返回202，后台导入，轮询 /books/imports/{id} 获取进度）
+export interface ImportJob {
+  id: string;
+  status: 'queued' | 'running' | 'completed' | 'failed' | 'cancelled';
+  stage?: ImportStage | null;
+  progress: Record<ImportStage, { done: number; total: number | null }>;
+  filename?: string;
+  book_id?: string | null;
+  book?: {
     id: string;
     title: string;
     author: string;
@@ -31,7 +38,9 @@ interface UploadResponse {
     category?: string;
     word_count: number;
     chapter_count: number;
-  };
+  } | null;
+  error?: string | null;
+  cancel_requested: boolean;
 }
 
 interface DuplicateCheckResponse {
@@ -62,6 +71,10 @@ export const booksAPI = {
   getChapter: (bookId: string, chapterNumber: number) =>
     api.get<Chapter>(`/books/${bookId}/chapters/${chapterNumber}`),
 
+  // 获取章节正文HTML（服务端直接返回存储的gzip数据，不再逐次压缩JSON响应）
+  getChapterContent: (bookId: string, chapterNumber: number) =>
+    api.get<string>(`/books/${bookId}/chapters/${chapterNumber}/content`, { responseType: 'text' }),
+
   // 获取书籍高频词汇
   getVocabulary: (bookId: string, limit = 50) =>
     api.get<Vocabulary[]>(`/books/${bookId}/vocabulary`, { params: { limit } }),
@@ -84,12 +97,20 @@ export const booksAPI = {
     if (options?.category) {
       formData.append('category', options.category);
     }
-    return api.post<UploadResponse>('/books/upload', formData, {
+    return api.post<ImportJob>('/books/upload', formData, {
       headers: { 'Content-Type': 'multipart/form-data' },
       timeout: 60000, // 上传可能需要更长时间
     });
   },
 
+  // 查询导入任务进度
+  getImportJob: (jobId: string) =>
+    api.get<ImportJob>(`/books/imports/${jobId}`),
+
+  // 取消导入任务
+  cancelImportJob: (jobId: string) =>
+    api.post<ImportJob>(`/books/imports/${jobId}/cancel`),
+
   // 删除书籍
   deleteBook: (bookId: string) =>
     api.delete(`/books/${bookId}`),